@@ -52,6 +52,28 @@ class PointChargePotential():
                 one_body_integrals += rinv
         return one_body_integrals
 
+    def get_perturb_ip_ints(self, mol):
+        """Get one electron integrals sum_I < nabla | -Q_I/|r-r_I| | >
+        in atomic orbital basis, with the derivative acting on the bra
+        (electron coordinate). The derivative of get_perturb_ints wrt the
+        coordinates of atom A is -(ip[:, A] + ip[:, A].transpose), where
+        A selects the atomic orbitals centred on A.
+
+        Args:
+            mol: An instance of the OpenFermion MolecularData class.
+
+        Returns:
+            float: integrals of shape (3, M, M)
+
+        """
+        ip_integrals = 0
+        for point_id in range(len(self.q_p)):
+            with mol.with_rinv_origin(self.R_pv[point_id]):
+                iprinv = mol.intor("int1e_iprinv", comp=3)
+                iprinv *= -self.q_p[point_id]
+                ip_integrals += iprinv
+        return ip_integrals
+
     def get_drinv_integrals(self, mol, point_id):
         """Get one electron integrals d/dr_I < | -Q_I/|r-r_I| | >
         Note: must convert to MO basis 
@@ -152,21 +174,35 @@ class PointChargePotential():
         Returns:
             float: force acting on each point charge
 
+        """
+        grad_hams_jw = calc.cached(('pc_forces',) + calc.hamiltonian_cache_key(calc.molecule),
+                                   lambda: self.get_grad_hamiltonians(calc))
+        # measure pauli terms in operators using VQE circuit to obtain forces
+        forces = -calc.evaluate_VQE_forces(list(grad_hams_jw)).reshape(len(self.q_p), 3)
+
+        return forces
+
+    def get_grad_hamiltonians(self, calc):
+        """Derivatives of the QM hamiltonian wrt each point charge coordinate.
+
+        Args:
+            calc: An instance of ASE Calculator.
+
+        Returns:
+            tuple of 3*len(q_p) PauliTables
+
         """
         mol = calc.molecule._pyscf_data['mol']
         grad_nn = self.get_pgrad_nn(mol, calc)
         M = grad_nn.shape[0]
         two_body_integrals = np.zeros((M,M,M,M))
-        forces = np.zeros((len(self.q_p), 3))
+        grad_hams_jw = []
         for point_id in range(len(self.q_p)):
             one_body_integrals = self.get_drinv_integrals(mol, point_id)
             one_body_integrals = [calc.ao_to_mo(one_body_integrals[i]) for i in range(3)]
             for i in range(3):
-                # create and evaluate operator for each coordinate
-                grad_ham = calc.get_molecular_hamiltonian(calc.molecule, grad_nn[point_id][i], 
+                # create operator for each coordinate
+                grad_ham = calc.get_molecular_hamiltonian(calc.molecule, grad_nn[point_id][i],
                     one_body_integrals[i], two_body_integrals)
-                grad_ham_jw = calc.squant_to_pauli(grad_ham)
-                # measure pauli terms in operator using VQE circuit to obtain force
-                forces[point_id][i] = -calc.evaluate_VQE(grad_ham_jw)
-
-        return forces
+                grad_hams_jw.append(calc.squant_to_pauli_table(grad_ham))
+        return tuple(grad_hams_jw)
@@ -0,0 +1,177 @@
+"""
+Compact table representation of qubit operators (weighted sums of Pauli terms),
+with a vectorised Jordan-Wigner encoder for OpenFermion InteractionOperators
+and serialisation to the Pauli string format of Qristal's vqee.
+"""
+import re
+
+import numpy as np
+
+MAX_QUBITS = 64
+"""int: Largest number of qubits of a PauliTable, set by its 64-bit masks
+"""
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    # numpy < 2.0 fallback: per-byte lookup table
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        words = np.ascontiguousarray(words, dtype=np.uint64)
+        return _POPCOUNT_TABLE[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1)
+
+# (-i)^n for the n qubits of a term on which X^x Z^z = XZ = -iY
+_XZ_PHASES = np.array([1, -1j, -1, 1j])
+
+
+def _ladder_terms(indices: np.ndarray, dagger: bool) -> tuple:
+    """ Jordan-Wigner transform of a_p^dagger (or a_p) for every p in indices,
+    Z_0 ... Z_{p-1} (X_p -/+ i Y_p) / 2, as two terms X^x Z^z each.
+    Returns:
+        x masks, z masks and coefficients, of shape (len(indices), 2)
+    """
+    bit = np.left_shift(np.uint64(1), indices.astype(np.uint64))
+    below = bit - np.uint64(1)
+    x = np.stack([bit, bit], axis=-1)
+    z = np.stack([below, below | bit], axis=-1)
+    # -iY = XZ and iY = -XZ
+    coeffs = np.broadcast_to([0.5, 0.5 if dagger else -0.5], x.shape)
+    return x, z, coeffs
+
+
+def _multiply_terms(left: tuple, right: tuple) -> tuple:
+    """ Products of the terms (x, z, coeffs) of shape (M, k) and (M, l) of the
+    same row, as terms of shape (M, k*l). Moving Z^z1 past X^x2 contributes
+    (-1)^popcount(z1 & x2).
+    """
+    x1, z1, c1 = (a[:, :, None] for a in left)
+    x2, z2, c2 = (a[:, None, :] for a in right)
+    signs = 1 - 2 * (_popcount(z1 & x2) & 1).astype(np.int8)
+    rows = x1.shape[0]
+    return ((x1 ^ x2).reshape(rows, -1), (z1 ^ z2).reshape(rows, -1),
+            (c1 * c2 * signs).reshape(rows, -1))
+
+
+class PauliTable():
+    def __init__(self, x_masks, z_masks, coeffs):
+        """ Parameters
+        x_masks, z_masks: array-like of int
+            Bit q of x_masks[k] (z_masks[k]) is set if term k acts with X (Z)
+            on qubit q. Both bits are set for Y.
+        coeffs: array-like of float
+            Coefficient of each term.
+
+        The term with both masks 0 is the identity. Tables are immutable,
+        they hold read-only copies of the arrays.
+        """
+        self.x_masks = np.array(x_masks, dtype=np.uint64)
+        self.z_masks = np.array(z_masks, dtype=np.uint64)
+        self.coeffs = np.array(coeffs, dtype=float)
+        for array in (self.x_masks, self.z_masks, self.coeffs):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.coeffs)
+
+    @property
+    def n_qubits(self) -> int:
+        """ Number of qubits, given by the highest qubit index acted on """
+        support = np.bitwise_or.reduce(self.x_masks | self.z_masks, initial=np.uint64(0))
+        return int(support).bit_length()
+
+    def shift(self, val : int = 1) -> "PauliTable":
+        """ Increase the qubit indices of all terms by val (see change_index
+        in vqe_interface for Pauli strings)
+        """
+        if self.n_qubits + val > MAX_QUBITS:
+            raise ValueError(f'PauliTable supports up to {MAX_QUBITS} qubits')
+        val = np.uint64(val)
+        return PauliTable(self.x_masks << val, self.z_masks << val, self.coeffs)
+
+    def simplify(self, tol : float = 1e-12) -> "PauliTable":
+        """ Combine repeated terms and remove terms with coefficients of
+        magnitude up to tol. Terms are sorted by their masks, the identity first.
+        """
+        keys, inverse = np.unique(np.stack([self.x_masks, self.z_masks], axis=1), axis=0,
+                                  return_inverse=True)
+        coeffs = np.bincount(inverse.reshape(-1), weights=self.coeffs, minlength=len(keys))
+        keep = np.abs(coeffs) > tol
+        return PauliTable(keys[keep, 0], keys[keep, 1], coeffs[keep])
+
+    def to_string(self) -> str:
+        """ Serialise to the Pauli string format of vqee, e.g.
+        '-0.5  +0.25 X0 Y1 +0.1 Z0', as produced by squant_to_pauli in vqe_interface
+        """
+        if len(self) == 0:
+            return "0"
+        n_qubits = max(self.n_qubits, 1)
+        qubits = np.arange(n_qubits, dtype=np.uint64)
+        x = (self.x_masks[:, None] >> qubits) & np.uint64(1)
+        z = (self.z_masks[:, None] >> qubits) & np.uint64(1)
+        # 0: I, 1: X, 2: Z, 3: Y
+        codes = (x + 2 * z).astype(np.intp)
+        tokens = np.array([["", f"X{q}", f"Z{q}", f"Y{q}"] for q in range(n_qubits)])
+        labels = tokens[np.arange(n_qubits), codes].tolist()
+        return " +".join(f"{coeff!r} {' '.join(filter(None, label))}"
+                         for coeff, label in zip(self.coeffs.tolist(), labels))
+
+    @classmethod
+    def from_string(cls, ham : str) -> "PauliTable":
+        """ Parse a Pauli string in the format of to_string """
+        x_masks, z_masks, coeffs = [], [], []
+        if ham != "0":
+            for term in re.split(r'\s+\+', ham.strip()):
+                tokens = term.split()
+                if not tokens:
+                    continue
+                x = z = 0
+                for token in tokens[1:]:
+                    bit = 1 << int(token[1:])
+                    if token[0] in 'XY':
+                        x |= bit
+                    if token[0] in 'ZY':
+                        z |= bit
+                x_masks.append(x)
+                z_masks.append(z)
+                coeffs.append(float(tokens[0]))
+        return cls(x_masks, z_masks, coeffs)
+
+    @classmethod
+    def from_interaction_operator(cls, operator, tol : float = 1e-12) -> "PauliTable":
+        """ Jordan-Wigner transform of a second quantized operator, equivalent
+        to of.jordan_wigner(of.get_fermion_operator(operator)). All one and two
+        body terms are transformed together with array operations.
+
+        Args:
+            operator: an OpenFermion InteractionOperator, constant
+                + sum_pq h_pq a_p^dagger a_q + sum_pqrs h_pqrs a_p^dagger a_q^dagger a_r a_s
+            tol: terms whose combined coefficient has magnitude up to tol
+                are dropped, see simplify. All nonzero integrals are transformed.
+
+        Returns:
+            PauliTable: simplified table of the transformed operator
+        """
+        if operator.n_qubits > MAX_QUBITS:
+            raise ValueError(f'PauliTable supports up to {MAX_QUBITS} qubits')
+        x_masks = [np.zeros(1, dtype=np.uint64)]
+        z_masks = [np.zeros(1, dtype=np.uint64)]
+        coeffs = [np.array([complex(operator.constant)])]
+        for tensor in (operator.one_body_tensor, operator.two_body_tensor):
+            indices = np.nonzero(tensor)
+            if len(indices[0]) == 0:
+                continue
+            # creation operators first, then annihilation operators
+            daggers = [True] * (tensor.ndim // 2) + [False] * (tensor.ndim // 2)
+            terms = _ladder_terms(indices[0], daggers[0])
+            for index, dagger in zip(indices[1:], daggers[1:]):
+                terms = _multiply_terms(terms, _ladder_terms(index, dagger))
+            x, z, c = terms
+            x_masks.append(x.reshape(-1))
+            z_masks.append(z.reshape(-1))
+            coeffs.append((c * tensor[indices][:, None]).reshape(-1))
+        x = np.concatenate(x_masks)
+        z = np.concatenate(z_masks)
+        # X^x Z^z to Pauli labels: XZ = -iY on every qubit with both bits set
+        coeffs = np.concatenate(coeffs) * _XZ_PHASES[_popcount(x & z) % 4]
+        # coefficients of hermitian operators are real
+        return cls(x, z, coeffs.real).simplify(tol)
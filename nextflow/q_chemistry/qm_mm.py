@@ -17,12 +17,19 @@ parser.add_argument("-f", "--force", help = "Terminate QM/MM at this force thres
 parser.add_argument("-p", "--profile", help = "Nextflow profile list, default: 'standard'", nargs = '?', const = 'standard', type = str)
 parser.add_argument("-c", "--command", help = "Path and name of commandline executable, default: ../../cpp/vqeeCalculator/build/vqeeCalculator", nargs = '?', const = "../../cpp/vqeeCalculator/build/vqeeCalculator", default = "../../cpp/vqeeCalculator/build/vqeeCalculator", type = str)
 parser.add_argument("-q", "--qpun", help = "Number of QPUs to run in parallel, default: 2", nargs = '?', const = 2, default = 2, type = int)
+parser.add_argument("-a", "--analytic", help = "Compute forces from analytic instead of finite-difference integral derivatives", action = "store_true")
+parser.add_argument("-b", "--batch-forces", help = "Evaluate all force components in a single Nextflow launch", action = "store_true")
+parser.add_argument("-w", "--warm-start", help = "Start VQE from the optimised ansatz parameters of the previous geometry", action = "store_true")
+parser.add_argument("-e", "--extrapolate", help = "With --warm-start, extrapolate the ansatz parameters along the trajectory", action = "store_true")
 args = parser.parse_args()
 print("\nQM/MM H20-H2 geometry optimisation with Qristal + MPI + Nextflow\n")
 print("  Termination criterion : ", args.force)
 print("  Nextflow profile      : ", args.profile)
 print("  MPI executable        : ", args.command)
 print("  Number of QPUs        : ", args.qpun)
+print("  Analytic gradients    : ", args.analytic)
+print("  Batched forces        : ", args.batch_forces)
+print("  Warm start            : ", args.warm_start, "(extrapolated)" if args.extrapolate else "")
 
 thetaHOH = angleHOH / 180 * np.pi
 # Create system
@@ -59,7 +66,8 @@ vqe_params = {"acc":"qpp", "theta":[.08]*6+[.08,1.5,2.1], "ansatz":"aswap",
     "in_command":args.command,
     "in_qpus":args.qpun}
 vqecalc = VQE(basis='sto6g', n_active_electrons=None, n_active_orbitals=None, 
-    verbose=False, vqe_params=vqe_params)
+    verbose=False, analytic_gradients=args.analytic, batch_forces=args.batch_forces, warm_start=args.warm_start,
+    extrapolate_theta=args.extrapolate, vqe_params=vqe_params)
 
 dftcalc = Dftb(Hamiltonian_='DFTB',  # this line is included by default
             Hamiltonian_SCC='Yes',
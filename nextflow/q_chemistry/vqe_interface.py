@@ -12,8 +12,10 @@ Example:
 """
 from ase.calculators.calculator import Calculator
 from external_potential import PointChargePotential
+from pauli_table import PauliTable
 
-from typing import Any, Dict
+from typing import Any, Callable, Dict
+from collections import OrderedDict
 import re
 import subprocess
 import numpy as np
@@ -34,6 +36,12 @@ BOHR =  data.nist.BOHR
 """float: Bohr radius [in Angstroms]
 """
 
+CACHE_DECIMALS = 10
+"""int: Decimals [in Angstroms] to which coordinates are rounded in the keys of the
+VQE integral and Hamiltonian cache. Finer than the finite-difference step of
+fd_grad_integrals, so that displaced geometries get distinct entries.
+"""
+
 # Nextflow helper functions
 def get_energy_result(nf_ppl_run_in: nextflow.execution.Execution, result_json: str) -> float:
     """Average the energy across a batch of vqee executions via Nextflow.
@@ -99,11 +107,39 @@ def get_pauli_result(nf_ppl_run_in: nextflow.execution.Execution, result_json: s
                     pauli.append(vcdata["pauli"])
     return pauli
 
+def get_batch_energy_results(nf_ppl_run_in: nextflow.execution.Execution, result_json: str,
+                             json_inputs: list) -> list:
+    """Get the energy of every vqee execution of a batch via Nextflow.
+
+    Args:
+        nf_ppl_run_in: a completed execution of Nextflow.
+        result_json: filename (JSON format) containing VQE output.
+        json_inputs: filenames of the JSON inputs of the batch, one per execution.
+
+    Returns:
+        The min. energy of VQE for every input, in the order of json_inputs.
+
+    """
+    index = {name: i for i, name in enumerate(json_inputs)}
+    energy = [None] * len(json_inputs)
+    for x in nf_ppl_run_in.process_executions:
+        # match results to inputs, process executions may complete in any order
+        inputs = [index[name] for name in x.input_data(include_path=False) if name in index]
+        for q in x.all_output_data():
+            if result_json in q:
+                with open(q) as json_file:
+                    vcdata = json.load(json_file)
+                for i in inputs:
+                    energy[i] = vcdata["energy"]
+    if None in energy:
+        raise RuntimeError('Nextflow returned no vqee result for some of the inputs')
+    return energy
+
 # Future developers should add more helper functions below as needed.
 
 # End of Nextflow helper functions
 #
-def run_vqee(qn:int = 4, acc:str = "qpp", ham:str = "0",
+def run_vqee(qn:int = 4, acc:str = "qpp", ham = "0",
              theta:list = [.08,1.5,2.1], ansatz:str = "aswap",
              aswapn:int = 6, maxeval:int = 201, functol:float = 1e-5,
              method:str = "cobyla", toprint:bool = False, sn:int = 0,
@@ -117,7 +153,7 @@ def run_vqee(qn:int = 4, acc:str = "qpp", ham:str = "0",
     Args:
         qn: number of physical qubits
         acc: backend that will execute quantum circuits
-        ham: weighted sum of Pauli terms representing a qubit Hamiltonian
+        ham: weighted sum of Pauli terms representing a qubit Hamiltonian, as a string or PauliTable
         theta: initial value of ansatz parameters
         ansatz: ansatz (only 'ASWAP' is currently supported)
         aswapn: number of particles of the ASWAP ansatz
@@ -136,7 +172,7 @@ def run_vqee(qn:int = 4, acc:str = "qpp", ham:str = "0",
         tuple: (energy, [optimum theta values])
 
     """
-    ham = change_index(ham, addqubits)
+    ham = vqee_pauli_string(ham, addqubits)
     qn += addqubits
     if in_profile[0] is None :
         #
@@ -164,24 +200,7 @@ def run_vqee(qn:int = 4, acc:str = "qpp", ham:str = "0",
     elif len(in_profile) == 1 :
         #
         # Run vqee with a provided Nextflow profile
-        vqe = dict()
-        vqe['nQubits'] = qn
-        vqe['acceleratorName'] = acc
-        vqe['pauli'] = ham
-        if method != "cobyla" :
-            raise ValueError('coblya is the only optimiser method supported')
-        if ansatz=='aswap' :
-            vqe['ansatz'] = 'ASWAP'
-        else :
-            raise ValueError('aswap is the only ansatz supported')
-        vqe['nElectrons'] = aswapn
-        vqe['maxIters'] = maxeval
-        vqe['tolerance'] = functol
-        vqe['nShots'] = sn
-        if sn == 0 :
-            vqe['isDeterministic'] = True
-            vqe['nShots'] = 1
-        vqe['thetas'] = theta
+        vqe = vqee_json_input(qn, acc, ham, theta, ansatz, aswapn, maxeval, functol, method, sn)
         #
         # Save to a unique JSON file
         tmpfile = secrets.token_hex(16)
@@ -204,10 +223,101 @@ def run_vqee(qn:int = 4, acc:str = "qpp", ham:str = "0",
     else :
         raise ValueError('Nextflow profile must be a list containing one element, or be an empty list')
 
-def get_n_qubits(ham : str) -> int:
+def run_vqee_batch(hams:list, qn:int = 4, acc:str = "qpp",
+                   theta:list = [.08,1.5,2.1], ansatz:str = "aswap",
+                   aswapn:int = 6, maxeval:int = 201, functol:float = 1e-5,
+                   method:str = "cobyla", toprint:bool = False, sn:int = 0,
+                   addqubits:int = 0, vqee_output:str = "vqeecalc_output.json",
+                   in_profile:list = [],
+                   in_command:str = "./vqeeCalculator",
+                   in_qpus:int = 2) -> list:
+    """Run vqee for many Hamiltonians with the same ansatz and settings, see run_vqee.
+
+    Without Nextflow, the Hamiltonians are evaluated one after the other in
+    this process. With a Nextflow profile, every Hamiltonian is written to its
+    own JSON input file and all of them are executed by a single Nextflow
+    launch, one process execution per Hamiltonian.
+
+    Args:
+        hams: list of Hamiltonians, each as a string or PauliTable
+        other arguments: see run_vqee, shared by all Hamiltonians
+
+    Returns:
+        list: energy of every Hamiltonian
+
+    """
+    if in_profile[0] is None :
+        return [run_vqee(qn = qn, acc = acc, ham = ham, theta = theta, ansatz = ansatz,
+                         aswapn = aswapn, maxeval = maxeval, functol = functol,
+                         method = method, toprint = toprint, sn = sn, addqubits = addqubits,
+                         vqee_output = vqee_output, in_profile = in_profile,
+                         in_command = in_command, in_qpus = in_qpus)[0] for ham in hams]
+    elif len(in_profile) == 1 :
+        #
+        # Save every Hamiltonian to its own JSON file, with a unique common prefix
+        prefix = secrets.token_hex(16)
+        json_inputs = []
+        try:
+            for k, ham in enumerate(hams):
+                vqe = vqee_json_input(qn + addqubits, acc, vqee_pauli_string(ham, addqubits), theta,
+                                      ansatz, aswapn, maxeval, functol, method, sn)
+                json_inputs.append(prefix + "_" + str(k) + ".json")
+                with open(json_inputs[-1], 'w') as tf:
+                    tf.write(json.dumps([vqe],indent=4))
+            #
+            # Offload all of them to a single Nextflow launch
+            nf_ppl = nextflow.Pipeline("main.nf", config="nextflow.config")
+            nf_ppl_run = nf_ppl.run(profile=in_profile, params={
+                "bin" : in_command,
+                "json_input" : prefix + "_*.json",
+                "json_output" : vqee_output,
+                "qpu_n" : str(in_qpus)
+            })
+            return get_batch_energy_results(nf_ppl_run, vqee_output, json_inputs)
+        finally:
+            for tmpfile in json_inputs:
+                os.remove(tmpfile)
+    else :
+        raise ValueError('Nextflow profile must be a list containing one element, or be an empty list')
+
+def vqee_json_input(qn:int, acc:str, ham:str, theta:list, ansatz:str, aswapn:int,
+                    maxeval:int, functol:float, method:str, sn:int) -> dict:
+    ''' Input of vqeeCalculator (--fromJson) for one vqee execution, see run_vqee
+    '''
+    vqe = dict()
+    vqe['nQubits'] = qn
+    vqe['acceleratorName'] = acc
+    vqe['pauli'] = ham
+    if method != "cobyla" :
+        raise ValueError('coblya is the only optimiser method supported')
+    if ansatz=='aswap' :
+        vqe['ansatz'] = 'ASWAP'
+    else :
+        raise ValueError('aswap is the only ansatz supported')
+    vqe['nElectrons'] = aswapn
+    vqe['maxIters'] = maxeval
+    vqe['tolerance'] = functol
+    vqe['nShots'] = sn
+    if sn == 0 :
+        vqe['isDeterministic'] = True
+        vqe['nShots'] = 1
+    vqe['thetas'] = theta
+    return vqe
+
+def vqee_pauli_string(ham, addqubits:int = 0) -> str:
+    ''' Pauli string passed to vqee for a Hamiltonian (string or PauliTable),
+    with qubit indices increased by addqubits
+    '''
+    if isinstance(ham, PauliTable):
+        return ham.shift(addqubits).to_string()
+    return change_index(ham, addqubits)
+
+def get_n_qubits(ham) -> int:
     ''' Find the number of qubits required by Hamiltonian string
     by finding the highest label number in a pauli operator
     '''
+    if isinstance(ham, PauliTable):
+        return ham.n_qubits
     indexes = re.findall(r'(?<=[XYZ])[0-9]+|/g', ham)
     q = max(list(map(int, indexes)), default=-1)
     return q+1
@@ -216,6 +326,48 @@ def change_index(q_ham : str, val=1) -> str:
     # Increase the indices of Pauli operators by a set amount
     return re.sub(r'(?<=[XYZ])[0-9]+|/g', lambda x: str(int(x.group())+val), q_ham)
 
+def canonical_orth_grad(S : np.ndarray, dS : np.ndarray, thr : float = 1e-9) -> tuple:
+    """Canonical orthogonalisation of an overlap matrix, as used for the MO
+    coefficients in VQE.get_integrals, and its derivative.
+
+    Args:
+        S: overlap matrix of shape (M,M)
+        dS: derivatives of S wrt three coordinates, shape (3,M,M)
+        thr: eigenvalues of the normalised overlap matrix below thr are discarded (see pyscf.scf.canonical_orth_)
+
+    Returns:
+        tuple: (C, dC), MO coefficients of shape (M,N) and their derivatives of shape (3,M,N)
+
+    """
+    # follows pyscf.scf.canonical_orth_, with first order perturbation theory
+    # for the eigenvalues and eigenvectors of the normalised overlap matrix
+    normlz = np.power(np.diag(S), -0.5)
+    dnormlz = -0.5 * normlz**3 * np.einsum('xii->xi', dS)
+    Snorm = normlz[:, None] * S * normlz[None, :]
+    dSnorm = (dnormlz[:, :, None] * S * normlz[None, None, :]
+              + normlz[:, None] * dS * normlz[None, :]
+              + normlz[None, :, None] * S * dnormlz[:, None, :])
+    Sval, Svec = np.linalg.eigh(Snorm)
+    coupling = np.einsum('ji,xjk,kl->xil', Svec, dSnorm, Svec)
+    gap = Sval[None, :] - Sval[:, None]
+    # eigenvectors of (near) degenerate eigenvalues are not mixed
+    degenerate = np.abs(gap) < 1e-10
+    dSvec = Svec @ np.where(degenerate, 0, coupling / np.where(degenerate, 1, gap))
+    dSval = np.einsum('xii->xi', coupling)
+
+    keep = Sval >= thr
+    Sval, Svec, dSvec, dSval = Sval[keep], Svec[:, keep], dSvec[:, :, keep], dSval[:, keep]
+    X = Svec / np.sqrt(Sval)
+    dX = dSvec / np.sqrt(Sval) - 0.5 * Svec * (dSval / Sval**1.5)[:, None, :]
+    C = normlz[:, None] * X
+    dC = dnormlz[:, :, None] * X + normlz[None, :, None] * dX
+    return np.flip(C, axis=1), np.flip(dC, axis=2)
+
+def transform_eri(eri : np.ndarray, c1 : np.ndarray, c2 : np.ndarray,
+                  c3 : np.ndarray, c4 : np.ndarray) -> np.ndarray:
+    # Transform two electron integrals (mn|ls) with one coefficient matrix per index
+    return np.einsum('mnls,mp,nq,lr,st->pqrt', eri, c1, c2, c3, c4, optimize=True)
+
 class VQE(Calculator):
     """This is the ASE-calculator frontend for calculating molecular
     properties, implementing the Calculator interface
@@ -232,6 +384,11 @@ class VQE(Calculator):
         'n_active_electrons': None,  # electrons in active space
         'n_active_orbitals': None,  # spatial orbitals in active space
         'verbose': False,
+        'analytic_gradients': False,  # forces from analytic instead of finite-difference integral derivatives
+        'batch_forces': False,  # evaluate all force components in a single Nextflow launch, see evaluate_VQE_batch
+        'warm_start': False,  # start VQE from the optimized theta of the previous geometry
+        'extrapolate_theta': False,  # with warm_start, extrapolate theta along the trajectory
+        'cache_size': 64,  # LRU entries of the integral and Hamiltonian cache, 0 disables it
         'vqe_params': {}
     }
 
@@ -240,6 +397,10 @@ class VQE(Calculator):
         self.occupied_indices = None
         self.active_indices = None
         self.optimized_theta = None
+        # (positions, optimized theta) of the last geometries, for warm starts
+        self.theta_history = []
+        # geometry-keyed LRU cache of integrals and Hamiltonians, see cached
+        self._cache = OrderedDict()
         self.pc = None
         self.to_calculate = True
         # self.vqee_output_file : filename to save output from vqee
@@ -291,53 +452,104 @@ class VQE(Calculator):
             self.occupied_indices, self.active_indices = self.get_occupied_indices(self.molecule,
                     n_active_electrons, n_active_orbitals)
             one_body_integrals, two_body_integrals = self.get_integrals(self.molecule)
-            hamiltonian = self.get_molecular_hamiltonian(self.molecule,
-                    float(self.molecule._pyscf_data['mol'].energy_nuc()),
-                    one_body_integrals, two_body_integrals)
 
-            # perform JW transform on second quantized hamiltonian
-            hamiltonian_jw_str = self.squant_to_pauli(hamiltonian)
+            def build_hamiltonian():
+                hamiltonian = self.get_molecular_hamiltonian(self.molecule,
+                        float(self.molecule._pyscf_data['mol'].energy_nuc()),
+                        one_body_integrals, two_body_integrals)
+                # perform JW transform on second quantized hamiltonian
+                return self.squant_to_pauli_table(hamiltonian)
+            hamiltonian_jw = self.cached(('hamiltonian',) + self.hamiltonian_cache_key(self.molecule),
+                                         build_hamiltonian)
 
             # perform VQE to determine ground state
             if n_active_electrons is not None:
                 self.parameters['vqe_params']['aswapn'] = n_active_electrons
             else:
                 self.parameters['vqe_params']['aswapn'] = self.molecule.n_electrons
-            n_qubits = get_n_qubits(hamiltonian_jw_str)
-            energy, self.optimized_theta = run_vqee(qn = n_qubits, ham = hamiltonian_jw_str,
+            n_qubits = get_n_qubits(hamiltonian_jw)
+            vqe_params = dict(self.parameters['vqe_params'])
+            positions = atoms.get_positions()
+            if self.parameters['warm_start']:
+                theta = self.initial_theta(positions, vqe_params.get('theta'))
+                if theta is not None:
+                    vqe_params['theta'] = theta
+            energy, self.optimized_theta = run_vqee(qn = n_qubits, ham = hamiltonian_jw,
                                                     toprint = self.parameters['verbose'],
                                                     vqee_output = self.vqee_output_file,
                                                     # in_profile = ['standard'],
                                                     # in_profile = [self.parameters['vqe_params']['profile']],
-                                                    **self.parameters['vqe_params'])
+                                                    **vqe_params)
+            self.theta_history = (self.theta_history + [(positions.copy(), list(self.optimized_theta))])[-2:]
             self.results['energy'] = energy
             # print("Hartree-Fock energy:", self.molecule._pyscf_data['scf'].e_tot)
             # print("VQE energy:         ", energy)
 
         if 'forces' in properties:
-            # calculate derivative of hamiltonian wrt each nuclear coordinate
-            # return array of dimension (M, 3)
-            mol = self.molecule._pyscf_data['mol']
-            grad_nn = grad.rhf.grad_nuc(mol)  # derivatives of nuc-nuc repulsion shape=(M,3)
-            if self.pc is not None:
-                # get coulomb forces on nuclei due to external point charges
-                grad_nn += self.pc.get_ngrad_nn(mol, self)
-
-            forces = np.zeros((len(atoms), 3))
-            # grad.rhf.grad_elec(mf_grad) + grad.rhf.grad_nuc(mol) to get HF forces
-            for atm_id in range(len(atoms)):
-                # derivative of one and two electron integrals wrt to coordinates of atm_id
-                one_body_integrals, two_body_integrals = self.fd_grad_integrals(self.molecule, atm_id)
-                for i in range(3):
-                    # create operator for each component of nuclear coordinate
-                    grad_ham = self.get_molecular_hamiltonian(self.molecule, grad_nn[atm_id][i],
-                        one_body_integrals[i], two_body_integrals[i])
-                    grad_ham_jw = self.squant_to_pauli(grad_ham)
-                    # measure pauli terms in operator using VQE circuit to obtain force
-                    forces[atm_id][i] = -self.evaluate_VQE(grad_ham_jw)
+            # measure pauli terms in operators using VQE circuit to obtain forces
+            grad_hams_jw = self.cached(('forces', self.parameters['analytic_gradients'])
+                                       + self.hamiltonian_cache_key(self.molecule),
+                                       lambda: self.get_grad_hamiltonians(atoms))
+            forces = -self.evaluate_VQE_forces(list(grad_hams_jw)).reshape(len(atoms), 3)
 
             self.results['forces'] = forces
 
+    def get_grad_hamiltonians(self, atoms):
+        """ Derivatives of the Hamiltonian wrt each nuclear coordinate of the
+        current molecule, in the order of atoms and x, y, z
+        Args:
+            atoms: ASE Atoms object of the current geometry
+        Returns:
+            tuple of 3*len(atoms) PauliTables, see squant_to_pauli_table
+        """
+        mol = self.molecule._pyscf_data['mol']
+        grad_nn = grad.rhf.grad_nuc(mol)  # derivatives of nuc-nuc repulsion shape=(M,3)
+        if self.pc is not None:
+            # get coulomb forces on nuclei due to external point charges
+            grad_nn += self.pc.get_ngrad_nn(mol, self)
+
+        grad_hams_jw = []
+        if self.parameters['analytic_gradients']:
+            grad_integrals = self.analytic_grad_integrals(self.molecule)
+        # grad.rhf.grad_elec(mf_grad) + grad.rhf.grad_nuc(mol) to get HF forces
+        for atm_id in range(len(atoms)):
+            # derivative of one and two electron integrals wrt to coordinates of atm_id
+            if self.parameters['analytic_gradients']:
+                one_body_integrals, two_body_integrals = grad_integrals[atm_id]
+            else:
+                one_body_integrals, two_body_integrals = self.fd_grad_integrals(self.molecule, atm_id)
+            for i in range(3):
+                # create operator for each component of nuclear coordinate
+                grad_ham = self.get_molecular_hamiltonian(self.molecule, grad_nn[atm_id][i],
+                    one_body_integrals[i], two_body_integrals[i])
+                grad_hams_jw.append(self.squant_to_pauli_table(grad_ham))
+        return tuple(grad_hams_jw)
+
+
+    def initial_theta(self, positions, theta=None):
+        """ Initial ansatz parameters for a warm start at the given geometry:
+        the optimized theta of the previous geometry, linearly extrapolated
+        along the last step of the trajectory if extrapolate_theta is set.
+        Args:
+            positions: atomic positions of shape (N,3)
+            theta: the initial theta of a cold start, if any
+        Returns:
+            Initial theta as a list, or None if there is no previous geometry
+            with the same number of atoms and parameters
+        """
+        history = [(x, t) for x, t in self.theta_history if x.shape == positions.shape
+                   and (theta is None or len(t) == len(theta))]
+        if not history:
+            return None
+        x1, theta1 = history[-1]
+        if self.parameters['extrapolate_theta'] and len(history) == 2:
+            x0, theta0 = history[0]
+            step = (x1 - x0).ravel()
+            if len(theta0) == len(theta1) and np.dot(step, step) > 0:
+                # project the new displacement onto the last step of the trajectory
+                alpha = np.dot((positions - x1).ravel(), step) / np.dot(step, step)
+                return list(np.asarray(theta1) + alpha*(np.asarray(theta1) - np.asarray(theta0)))
+        return list(theta1)
 
     def fd_grad_integrals(self, molecule, atm_id : int):
         # gradient of AO integrals using central finite difference
@@ -353,9 +565,119 @@ class VQE(Calculator):
             two_body_integrals[i] = (ints1[1] - ints2[1])/(2*h)*BOHR
         return one_body_integrals, two_body_integrals
 
+    def analytic_grad_integrals(self, molecule):
+        """ compute the derivatives of the one and two electron integrals in MO
+        basis wrt the coordinates of every atom, using analytic derivatives of
+        the AO integrals and of the canonical orthogonalisation of the overlap
+        matrix. Equivalent to fd_grad_integrals for every atom, without
+        rebuilding the molecule at displaced geometries.
+        Args:
+            molecule: An instance of the OpenFermion MolecularData class,
+                for which get_integrals has been called.
+        Returns:
+            List of (one_body_integrals, two_body_integrals) of every atom,
+            each a list of the derivatives wrt the x, y and z coordinate
+        """
+        mol = molecule._pyscf_data['mol']
+        S = mol.intor('int1e_ovlp')
+        hcore = molecule._pyscf_data['scf'].get_hcore()
+        eri = mol.intor('int2e')
+        # AO derivative integrals < nabla | .. | >, derivative on the first function
+        ip_ovlp = mol.intor('int1e_ipovlp', comp=3)
+        ip_hcore = mol.intor('int1e_ipkin', comp=3) + mol.intor('int1e_ipnuc', comp=3)
+        ip_eri = mol.intor('int2e_ip1', comp=3)
+        if self.pc is not None:
+            # potential due to external point charges (which do not move with the atoms)
+            hcore = hcore + self.pc.get_perturb_ints(mol)
+            ip_hcore = ip_hcore + self.pc.get_perturb_ip_ints(mol)
+
+        grad_integrals = []
+        for atm_id, (_, _, p0, p1) in enumerate(mol.aoslice_by_atom()):
+            # derivatives of AO integrals wrt coordinates of atm_id
+            dS = np.zeros_like(ip_ovlp)
+            dS[:, p0:p1] = -ip_ovlp[:, p0:p1]
+            dS += dS.transpose(0, 2, 1)
+            # see pyscf.grad.rhf.hcore_generator
+            with mol.with_rinv_at_nucleus(atm_id):
+                dhcore = mol.intor('int1e_iprinv', comp=3) * -mol.atom_charge(atm_id)
+            dhcore[:, p0:p1] -= ip_hcore[:, p0:p1]
+            dhcore += dhcore.transpose(0, 2, 1)
+            deri = np.zeros_like(ip_eri)
+            deri[:, p0:p1] = -ip_eri[:, p0:p1]
+            deri = (deri + deri.transpose(0, 2, 1, 3, 4) + deri.transpose(0, 3, 4, 1, 2)
+                    + deri.transpose(0, 4, 3, 2, 1))
+
+            # MO coefficients depend on the geometry via the overlap matrix
+            C, dC = canonical_orth_grad(S, dS)
+            one_body_integrals = []
+            two_body_integrals = []
+            for i in range(3):
+                response = reduce(np.dot, (dC[i].T, hcore, C))
+                one_body_integrals.append(reduce(np.dot, (C.T, dhcore[i], C)) + response + response.T)
+                response = transform_eri(eri, dC[i], C, C, C)
+                two_body = (transform_eri(deri[i], C, C, C, C) + response + response.transpose(1, 0, 2, 3)
+                            + response.transpose(2, 3, 0, 1) + response.transpose(3, 2, 1, 0))
+                # See PQRS convention in OpenFermion.hamiltonians._molecular_data
+                two_body_integrals.append(np.asarray(two_body.transpose(0, 2, 3, 1), order='C'))
+            grad_integrals.append((one_body_integrals, two_body_integrals))
+        return grad_integrals
+
+    def cache_key(self, molecule, atm_id = 0, perturb = np.array([0,0,0])) -> tuple:
+        """ Key of a (perturbed) geometry in the integral and Hamiltonian cache:
+        the coordinates rounded to CACHE_DECIMALS, the basis, charge and
+        multiplicity of the molecule, and the charges and positions of the
+        embedding point charges
+        Args:
+            molecule: An instance of the OpenFermion MolecularData class.
+            atm_id: Index of atom in molecule which is perturbed
+            perturb: A numpy array representing displacement of coordinates of atom
+        Returns:
+            hashable tuple
+        """
+        coords = np.array([position for _, position in molecule.geometry], dtype=float)
+        coords[atm_id] += perturb
+        # adding 0.0 maps -0.0 to 0.0
+        coords = np.round(coords, CACHE_DECIMALS) + 0.0
+        pc_state = None
+        if self.pc is not None:
+            pc_positions = None if self.pc.R_pv is None else (np.round(self.pc.R_pv, CACHE_DECIMALS) + 0.0).tobytes()
+            pc_state = (self.pc.q_p.tobytes(), pc_positions)
+        return (tuple(symbol for symbol, _ in molecule.geometry), coords.tobytes(), repr(molecule.basis),
+                molecule.charge, molecule.multiplicity, pc_state)
+
+    def hamiltonian_cache_key(self, molecule) -> tuple:
+        """ cache_key of the molecule extended by the active space, which
+        determines the Hamiltonians built by get_molecular_hamiltonian
+        """
+        occupied = None if self.occupied_indices is None else tuple(self.occupied_indices)
+        active = None if self.active_indices is None else tuple(self.active_indices)
+        return self.cache_key(molecule) + (occupied, active)
+
+    def cached(self, key : tuple, compute : Callable[[], Any]) -> Any:
+        """ Return the value cached for key, or compute, cache and return it.
+        Least recently used entries are evicted beyond cache_size entries.
+        Cached values are shared, callers must copy mutable values before
+        modifying them.
+        """
+        value = self._cache.get(key)
+        if value is not None:
+            self._cache.move_to_end(key)
+            return value
+        value = compute()
+        if self.parameters['cache_size'] > 0:
+            self._cache[key] = value
+            while len(self._cache) > self.parameters['cache_size']:
+                self._cache.popitem(last=False)
+        return value
+
+    def clear_cache(self):
+        """ Remove all cached integrals and Hamiltonians """
+        self._cache.clear()
+
     def get_integrals(self, molecule, atm_id = 0, perturb = np.array([0,0,0])):
         """ compute one and two electron integrals for a given molecule
-        with a perturbation of chosen nuclei position
+        with a perturbation of chosen nuclei position. Integrals are cached
+        per geometry and point charges, see cached
         Args:
             molecule: An instance of the OpenFermion MolecularData class.
             atm_id: Index of atom in molecule which is to be perturbed
@@ -363,6 +685,21 @@ class VQE(Calculator):
         Returns:
             One and two body integrals of the molecule in MO basis
         """
+        mol, pyscf_scf, one_body_ints, two_body_ints = self.cached(
+            ('integrals',) + self.cache_key(molecule, atm_id, perturb),
+            lambda: self.compute_integrals(molecule, atm_id, perturb))
+        if not hasattr(molecule, '_pyscf_data') and np.linalg.norm(perturb) == 0:
+            molecule._pyscf_data = pyscf_data = {}
+            pyscf_data['mol'] = mol
+            pyscf_data['scf'] = pyscf_scf
+        # copies, so that callers can modify the integrals in place
+        return (one_body_ints.copy(), two_body_ints.copy())
+
+    def compute_integrals(self, molecule, atm_id = 0, perturb = np.array([0,0,0])):
+        """ Uncached get_integrals
+        Returns:
+            pyscf molecule, scf object, one and two body integrals of the molecule in MO basis
+        """
         # build pyscf molecule and run scf
         mol = self.prepare_pyscf_molecule(molecule)
         mol.atom[atm_id] = (mol.atom[atm_id][0], mol.atom[atm_id][1]+perturb)
@@ -373,10 +710,6 @@ class VQE(Calculator):
         ortho = scf.canonical_orth_(pyscf_scf.get_ovlp(), thr=1e-9)
         ortho = np.flip(ortho, axis=1)
         pyscf_scf.mo_coeff = ortho
-        if not hasattr(molecule, '_pyscf_data') and np.linalg.norm(perturb) == 0:
-            molecule._pyscf_data = pyscf_data = {}
-            pyscf_data['mol'] = mol
-            pyscf_data['scf'] = pyscf_scf
 
         one_body_ints, two_body_ints = ofpyscf._run_pyscf.compute_integrals(mol, pyscf_scf)
         if self.pc is not None:
@@ -384,7 +717,7 @@ class VQE(Calculator):
             perturb_ints = self.pc.get_perturb_ints(mol)
             perturb_ints = self.ao_to_mo(perturb_ints, pyscf_scf)
             one_body_ints += perturb_ints
-        return (one_body_ints, two_body_ints)
+        return (mol, pyscf_scf, one_body_ints, two_body_ints)
 
     def prepare_pyscf_molecule(self, molecule):
         """ Args:
@@ -429,13 +762,20 @@ class VQE(Calculator):
             hamiltonian_jw_str: a string which represents the operator
                 after the Jordan-Wigner transform
         '''
-        # Convert to a FermionOperator
-        hamiltonian_ferm_op = of.get_fermion_operator(hamiltonian)
-        # Map to QubitOperator using the JWT
-        hamiltonian_jw = of.jordan_wigner(hamiltonian_ferm_op)
-        # remove all line breaks and brackets for SDK
-        hamiltonian_jw_str = re.sub(r"\+0j|\r|\n|\[|\]|\(|\)|/g", "", str(hamiltonian_jw))
-        return hamiltonian_jw_str
+        return self.squant_to_pauli_table(hamiltonian).to_string()
+
+    def squant_to_pauli_table(self, hamiltonian):
+        '''
+        Args:
+            ham: a second quantized operator of type
+                of.ops.representations.InteractionOperator
+
+        Returns:
+            PauliTable of the operator after the Jordan-Wigner transform,
+                computed directly from the integral tensors without
+                building FermionOperator and QubitOperator objects
+        '''
+        return PauliTable.from_interaction_operator(hamiltonian)
 
     def get_molecular_hamiltonian(self, molecule, nuc_repulsion,
             one_body_integrals, two_body_integrals):
@@ -455,10 +795,10 @@ class VQE(Calculator):
         ofmolecule.two_body_integrals = two_body_integrals
         return ofmolecule.get_molecular_hamiltonian(self.occupied_indices, self.active_indices)
 
-    def evaluate_VQE(self, ham : str, theta=None):
+    def evaluate_VQE(self, ham, theta=None):
         '''
-        Evaluate expectation of qubit hamiltonian on the ansatz with given
-        optimized angles
+        Evaluate expectation of qubit hamiltonian (string or PauliTable) on the
+        ansatz with given optimized angles
         '''
         if theta is None:
             theta = self.optimized_theta
@@ -467,7 +807,7 @@ class VQE(Calculator):
         if 'theta' in kwargs: kwargs.pop('theta')
         if 'maxeval' in kwargs: kwargs.pop('maxeval')
         # evaluate hamiltonian at given set of angles using one evaluation
-        if ham == "0":
+        if (len(ham) == 0 if isinstance(ham, PauliTable) else ham == "0"):
             return 0
         else:
             ev, _ = run_vqee(qn = n_qubits, ham = ham,
@@ -477,6 +817,58 @@ class VQE(Calculator):
                              **kwargs)
             return ev
 
+    def evaluate_VQE_batch(self, hams : list, theta=None) -> np.ndarray:
+        '''
+        Evaluate expectations of many qubit hamiltonians (strings or
+        PauliTables) on the ansatz with given optimized angles, with all vqee
+        executions in a single run (see run_vqee_batch). vqee returns only the
+        total expectation of its hamiltonian, so every execution measures
+        either one hamiltonian, or one distinct Pauli term of all hamiltonians
+        if there are no more distinct terms than hamiltonians. In the latter
+        case, the expectation of each hamiltonian is summed from those of its
+        terms, and with shots (sn > 0) the statistical errors of the terms are
+        independent and add up as sum_k c_k^2 Var(P_k) / sn.
+        '''
+        if theta is None:
+            theta = self.optimized_theta
+        tables = [ham if isinstance(ham, PauliTable) else PauliTable.from_string(ham) for ham in hams]
+        n_qubits = max((get_n_qubits(table) for table in tables), default=0)
+        kwargs = dict(self.parameters['vqe_params'])
+        if 'theta' in kwargs: kwargs.pop('theta')
+        if 'maxeval' in kwargs: kwargs.pop('maxeval')
+        x_masks = np.concatenate([table.x_masks for table in tables])
+        z_masks = np.concatenate([table.z_masks for table in tables])
+        coeffs = np.concatenate([table.coeffs for table in tables])
+        # the identity terms contribute their coefficients, all other distinct terms are measured
+        measured = (x_masks != 0) | (z_masks != 0)
+        keys, inverse = np.unique(np.stack([x_masks[measured], z_masks[measured]], axis=1), axis=0,
+                                  return_inverse=True)
+        if len(keys) > len(tables):
+            # one execution per hamiltonian is fewer than one per distinct term
+            expectations = np.zeros(len(tables))
+            evaluated = [k for k, table in enumerate(tables) if len(table) > 0]
+            expectations[evaluated] = run_vqee_batch([tables[k] for k in evaluated], qn = n_qubits,
+                                                     toprint = False, theta = theta, maxeval = 1,
+                                                     vqee_output = self.vqee_output_file, **kwargs)
+            return expectations
+        values = coeffs.copy()
+        if len(keys) > 0:
+            term_values = run_vqee_batch([PauliTable([x], [z], [1.0]) for x, z in keys],
+                                         qn = n_qubits, toprint = False, theta = theta,
+                                         maxeval = 1, vqee_output = self.vqee_output_file, **kwargs)
+            values[measured] *= np.asarray(term_values, dtype=float)[inverse.reshape(-1)]
+        rows = np.repeat(np.arange(len(tables)), [len(table) for table in tables])
+        return np.bincount(rows, weights=values, minlength=len(tables))
+
+    def evaluate_VQE_forces(self, hams : list, theta=None) -> np.ndarray:
+        '''
+        Evaluate expectations of derivative hamiltonians, all together with
+        evaluate_VQE_batch if the batch_forces parameter is set
+        '''
+        if self.parameters['batch_forces']:
+            return self.evaluate_VQE_batch(hams, theta)
+        return np.array([self.evaluate_VQE(ham, theta) for ham in hams], dtype=float)
+
     def embed(self, q_p):
         """ Embed QM region in point-charges. Positions can be set with
         set_positions function in PointChargePotential
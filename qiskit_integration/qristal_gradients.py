@@ -0,0 +1,128 @@
+from qiskit import QuantumCircuit
+from qiskit.circuit import Parameter
+from qiskit.quantum_info import SparsePauliOp
+from qiskit_algorithms import AlgorithmError
+from qiskit_algorithms.gradients import ParamShiftEstimatorGradient, EstimatorGradientResult
+import numpy as np
+from typing import Sequence
+
+from qiskit_integration.qristal_primitives import QristalEstimator, _circuit_key
+
+def _shifted_parameter_values(circuit: QuantumCircuit, parameter_values: Sequence[float],
+                              parameters: Sequence[Parameter]) -> list:
+    """
+    Parameter values of the parameter shift rule.
+
+    Parameters
+    ----------
+    circuit : qiskit.QuantumCircuit
+        The parameterized circuit.
+    parameter_values : list[float]
+        The parameter values of the circuit, ordered as circuit.parameters.
+    parameters : list[qiskit.circuit.Parameter]
+        The parameters to shift.
+
+    Returns
+    -------
+    list[list[float]]
+        The values with each of the parameters shifted by +pi/2, followed by those shifted by -pi/2.
+    """
+    circuit_parameters = list(circuit.parameters)
+    offsets = np.zeros((len(parameters), len(circuit_parameters)))
+    offsets[np.arange(len(parameters)), [circuit_parameters.index(p) for p in parameters]] = np.pi / 2
+    values = np.asarray(parameter_values, dtype=float)
+    return (values + offsets).tolist() + (values - offsets).tolist()
+
+class QristalEstimatorGradient(ParamShiftEstimatorGradient):
+    """
+    Compute the gradients of expectation values evaluated with a QristalEstimator by the
+    parameter shift rule.
+
+    All parameter-shifted circuits of a batch are evaluated in a single estimator job, in which
+    every distinct combination of circuit, observable and shifted parameter values is executed
+    once. Shifted circuits share the transpiled template of their circuit.
+    """
+
+    def __init__(self, estimator: QristalEstimator, options=None):
+        """
+        Initialize the QristalEstimatorGradient.
+
+        Parameters
+        ----------
+        estimator : QristalEstimator
+            The estimator evaluating the parameter-shifted circuits.
+        options : dict, optional
+            Primitive backend runtime options used for circuit execution.
+        """
+        super().__init__(estimator, options=options)
+
+    def _run_unique(
+        self,
+        circuits: Sequence[QuantumCircuit],
+        observables: Sequence[SparsePauliOp],
+        parameter_values: Sequence[Sequence[float]],
+        parameters: Sequence[Sequence[Parameter]],
+        **options,
+    ) -> EstimatorGradientResult:
+        """
+        Compute the gradients of a batch of circuits, evaluating every distinct parameter-shifted
+        circuit once.
+
+        Parameters
+        ----------
+        circuits : list[qiskit.QuantumCircuit]
+            The (preprocessed) parameterized circuits.
+        observables : list[qiskit.quantum_info.SparsePauliOp]
+            The observable of every circuit.
+        parameter_values : list[list[float]]
+            The parameter values of every circuit.
+        parameters : list[list[qiskit.circuit.Parameter]]
+            The parameters of every circuit to differentiate with respect to.
+        **options : dict
+            Primitive backend runtime options.
+
+        Returns
+        -------
+        EstimatorGradientResult
+            The gradient of every circuit.
+        """
+        circuit_keys = {}
+        unique = {}
+        job_circuits, job_observables, job_param_values = [], [], []
+        indices, metadata = [], []
+        for circuit, observable, parameter_values_, parameters_ in zip(
+            circuits, observables, parameter_values, parameters
+        ):
+            metadata.append({"parameters": parameters_})
+            if id(circuit) not in circuit_keys:
+                circuit_keys[id(circuit)] = _circuit_key(circuit)
+            circuit_key = circuit_keys[id(circuit)]
+            observable_key = (tuple(observable.paulis.to_labels()), observable.coeffs.tobytes())
+            # Values shifted by +pi/2 for every parameter, followed by those shifted by -pi/2
+            shifted_values = _shifted_parameter_values(circuit, parameter_values_, parameters_)
+            circuit_indices = []
+            for values in shifted_values:
+                key = (circuit_key, observable_key, tuple(values))
+                if key not in unique:
+                    unique[key] = len(job_circuits)
+                    job_circuits.append(circuit)
+                    job_observables.append(observable)
+                    job_param_values.append(values)
+                circuit_indices.append(unique[key])
+            indices.append(circuit_indices)
+
+        # Run a single job with all distinct circuits
+        job = self._estimator.run(job_circuits, job_observables, job_param_values, **options)
+        try:
+            results = job.result()
+        except Exception as exc:
+            raise AlgorithmError("Estimator job failed.") from exc
+
+        gradients = []
+        for circuit_indices in indices:
+            values = results.values[circuit_indices]
+            n = len(values)
+            gradients.append((values[: n // 2] - values[n // 2 :]) / 2)
+
+        opt = self._get_local_options(options)
+        return EstimatorGradientResult(gradients=gradients, metadata=metadata, options=opt)
@@ -1,105 +1,1190 @@
 import qiskit
-from qiskit import QuantumCircuit, transpile
+from qiskit import QuantumCircuit, ClassicalRegister, transpile
 from qiskit.qasm2 import dumps
+from qiskit.circuit.library import get_standard_gate_name_mapping
 from qiskit.primitives import BaseEstimatorV1, BaseSamplerV1, PrimitiveJob, EstimatorResult, SamplerResult
-from qiskit.quantum_info import SparsePauliOp
+from qiskit.primitives import BaseEstimatorV2, BaseSamplerV2, BitArray, DataBin, PrimitiveResult, PubResult, SamplerPubResult
+from qiskit.primitives.containers.sampler_pub import SamplerPub
+from qiskit.primitives.containers.estimator_pub import EstimatorPub
+from qiskit.primitives.containers.bindings_array import BindingsArray
+from qiskit.providers import JobError, JobStatus
+from qiskit.quantum_info import Pauli, PauliList, SparsePauliOp, Statevector
 import numpy as np
-from typing import Union, Optional, List
+from typing import Union, Optional, List, Tuple, Iterable
+from collections import OrderedDict, deque
+from concurrent.futures import CancelledError, Executor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+import queue
+import os
+from itertools import chain
 import warnings
+import threading
+import sqlite3
+import hashlib
+import json
+import time
+import io
 
 #Warn user if running a different qiskit version
 required_qiskit_version = "1.2.0"
 if qiskit.__version__ != required_qiskit_version:
     warnings.warn(f"Expected qiskit version 1.2.0 but running {qiskit.__version__}!")
 
+_STANDARD_GATES = frozenset(get_standard_gate_name_mapping())
+_TRANSPILE_LOCK = threading.Lock()
+
+# Session settings that determine the results of a circuit. They are copied to the sessions of a
+# QristalSessionPool and are part of the keys of a QristalResultCache.
+_SESSION_ATTRIBUTES = ("acc", "qn", "sn", "noise", "noise_model", "seed", "noplacement", "nooptimise",
+                       "nosim", "max_bond_dimension", "svd_cutoff")
+
+def _session_setting(value) -> str:
+    """
+    Describe the value of a session setting by its content, e.g. a noise model by its JSON form.
+    """
+    to_json = getattr(value, "to_json", None)
+    return to_json() if callable(to_json) else str(value)
+
+def _transpile_native(circuit: QuantumCircuit) -> QuantumCircuit:
+    """
+    Transpile a circuit to the QB native gate set. Calls are serialized, as the qiskit 
+    transpiler is not safe to run from several threads at once.
+    """
+    with _TRANSPILE_LOCK:
+        return transpile(circuit, basis_gates=['rx', 'ry', 'cz'], optimization_level=3)
+
+def _circuit_key(circuit: QuantumCircuit) -> tuple:
+    """
+    Build a hashable key describing the structure of a (possibly parameterized) circuit.
+
+    Two circuits with equal keys consist of the same instructions acting on the same bits, with 
+    equal (symbolic) parameters. Custom gates are described by their definitions.
+
+    Parameters
+    ----------
+    circuit : qiskit.QuantumCircuit
+        The circuit to describe.
+
+    Returns
+    -------
+    tuple
+        The structural key of the circuit.
+    """
+    instructions = []
+    for instruction in circuit.data:
+        operation = instruction.operation
+        definition = None
+        if operation.name not in _STANDARD_GATES and getattr(operation, "definition", None) is not None:
+            definition = _circuit_key(operation.definition)
+        instructions.append((
+            operation.name,
+            tuple(str(param) for param in operation.params),
+            tuple(circuit.find_bit(qubit).index for qubit in instruction.qubits),
+            tuple(circuit.find_bit(clbit).index for clbit in instruction.clbits),
+            str(getattr(operation, "condition", None)),
+            definition,
+        ))
+    return (circuit.num_qubits, circuit.num_clbits, str(circuit.global_phase), tuple(instructions))
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:
+    # numpy < 2.0 fallback: per-byte lookup table
+    _POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    def _popcount(words: np.ndarray) -> np.ndarray:
+        words = np.ascontiguousarray(words, dtype=np.uint64)
+        return _POPCOUNT_TABLE[words.view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1)
+
+# Upper bound on the number of (outcome, term) pairs evaluated at once by PackedCounts
+_PARITY_CHUNK_SIZE = 1 << 22
+
+def _pack_bits(bits: np.ndarray) -> np.ndarray:
+    """
+    Pack rows of bits into rows of 64-bit words.
+
+    Parameters
+    ----------
+    bits : numpy.ndarray
+        Boolean array of shape (rows, num_bits).
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (rows, max(1, ceil(num_bits / 64))) and dtype uint64, in which bit i of a 
+        row is stored as bit i % 64 of word i // 64.
+    """
+    num_words = max(1, -(-bits.shape[1] // 64))
+    packed = np.packbits(bits, axis=1, bitorder="little")
+    padded = np.zeros((bits.shape[0], 8 * num_words), dtype=np.uint8)
+    padded[:, :packed.shape[1]] = packed
+    return padded.view("<u8").astype(np.uint64)
+
+def _pauli_masks(paulis: PauliList, num_bits: int) -> np.ndarray:
+    """
+    Build the parity bit masks of Pauli operators measured by a final measure_all register.
+
+    Parameters
+    ----------
+    paulis : qiskit.quantum_info.PauliList
+        Pauli operators, measured in their eigenbasis.
+    num_bits : int
+        Number of classical bits in each measured outcome. The measure_all register occupies the 
+        last paulis.num_qubits bits.
+
+    Returns
+    -------
+    numpy.ndarray
+        Packed masks (see _pack_bits) selecting the bits each Pauli operator acts on.
+    """
+    support = np.zeros((len(paulis), num_bits), dtype=bool)
+    support[:, num_bits - paulis.num_qubits:] = paulis.x | paulis.z
+    return _pack_bits(support)
+
+def _pack_register(bits: np.ndarray, clbits: List[int]) -> np.ndarray:
+    """
+    Pack the bits of a classical register in the format of qiskit's BitArray.
+
+    Parameters
+    ----------
+    bits : numpy.ndarray
+        Boolean array of shape (shots, num_bits), in which column i holds classical bit i.
+    clbits : list[int]
+        Indices of the classical bits of the register, in register order.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (shots, ceil(len(clbits) / 8)) and dtype uint8 holding the register bits in 
+        big-endian order.
+    """
+    register = bits[:, clbits[::-1]]
+    register = np.pad(register, ((0, 0), (-len(clbits) % 8, 0)))
+    return np.packbits(register, axis=1)
+
+def _unique_parameter_rows(parameter_values: BindingsArray, parameters) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Deduplicate the parameter bindings of a primitive unified bloc.
+
+    Parameters
+    ----------
+    parameter_values : qiskit.primitives.containers.BindingsArray
+        The (N-dimensional) parameter bindings.
+    parameters : iterable[qiskit.circuit.Parameter]
+        The circuit parameters, in the order of the returned values.
+
+    Returns
+    -------
+    tuple[numpy.ndarray, numpy.ndarray]
+        The distinct parameter value rows, and for every binding (in flattened order) the index of 
+        its row.
+    """
+    parameters = list(parameters)
+    num_rows = int(np.prod(parameter_values.shape, dtype=int))
+    values = parameter_values.as_array(parameters).reshape(num_rows, len(parameters))
+    unique, inverse = np.unique(values, axis=0, return_inverse=True)
+    return unique, inverse.reshape(-1)
+
+def _pauli_expectation_values(statevector: np.ndarray, paulis: PauliList) -> np.ndarray:
+    """
+    Evaluate the exact expectation values of Pauli operators in a pure state.
+
+    Parameters
+    ----------
+    statevector : numpy.ndarray
+        The amplitudes of the state, in qiskit's (little-endian) qubit order.
+    paulis : qiskit.quantum_info.PauliList
+        The Pauli operators to evaluate.
+
+    Returns
+    -------
+    numpy.ndarray
+        The (complex) expectation value of every Pauli operator.
+    """
+    # A Pauli operator is (-i)^q Z^z X^x, so that <psi|P|psi> = 
+    # (-i)^q sum_k conj(psi[k]) (-1)^popcount(k & z) psi[k ^ x]
+    weights = np.uint64(1) << np.arange(paulis.num_qubits, dtype=np.uint64)
+    x_masks = (paulis.x.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+    z_masks = (paulis.z.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+    phases = (-1j) ** ((paulis.phase + np.sum(paulis.x & paulis.z, axis=1)) % 4)
+    indices = np.arange(len(statevector), dtype=np.uint64)
+    conjugate = statevector.conj()
+
+    values = np.empty(len(paulis), dtype=complex)
+    step = max(1, _PARITY_CHUNK_SIZE // max(1, len(statevector)))
+    for start in range(0, len(paulis), step):
+        x, z = x_masks[start:start + step, None], z_masks[start:start + step, None]
+        signs = 1.0 - 2.0 * (_popcount(indices & z) & 1)
+        values[start:start + step] = np.sum(conjugate * signs * statevector[indices ^ x], axis=1)
+    return phases * values
+
+def _allocate_shots(budget: int, weights: np.ndarray, minimum: int = 0) -> np.ndarray:
+    """
+    Distribute a shot budget proportionally to weights, rounding by largest remainder.
+
+    Parameters
+    ----------
+    budget : int
+        The total number of shots.
+    weights : numpy.ndarray
+        Non-negative weight of every recipient. Equal weights are used if all are zero.
+    minimum : int, optional
+        Minimum number of shots of every recipient.
+
+    Returns
+    -------
+    numpy.ndarray
+        The number of shots of every recipient, summing to budget.
+    """
+    weights = np.asarray(weights, dtype=float)
+    if budget < minimum * len(weights):
+        raise ValueError(f"A shot budget of {budget} is too small for {len(weights)} measurement groups.")
+    if len(weights) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if not weights.sum() > 0:
+        weights = np.ones(len(weights))
+    remaining = budget - minimum * len(weights)
+    exact = remaining * weights / weights.sum()
+    shots = np.floor(exact).astype(np.int64)
+    shots[np.argsort(shots - exact)[:remaining - shots.sum()]] += 1
+    return shots + minimum
+
+class PackedCounts:
+    """
+    A compact NumPy representation of measurement counts, supporting vectorised conversion to 
+    probabilities and evaluation of Pauli parities.
+
+    Each distinct outcome is stored as a row of 64-bit words, in which classical bit i is held in 
+    bit i % 64 of word i // 64, alongside the number of times it was observed.
+    """
+
+    def __init__(self, bitstrings: np.ndarray, counts: np.ndarray, num_bits: int):
+        """
+        Initialize PackedCounts from packed outcomes.
+
+        Parameters
+        ----------
+        bitstrings : numpy.ndarray
+            Packed outcomes of shape (outcomes, words) and dtype uint64 (see _pack_bits).
+        counts : numpy.ndarray
+            Number of occurrences of each outcome.
+        num_bits : int
+            Number of classical bits in each outcome.
+        """
+        self.bitstrings = np.asarray(bitstrings, dtype=np.uint64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.num_bits = num_bits
+
+    @classmethod
+    def from_qristal(cls, results) -> "PackedCounts":
+        """
+        Pack the results of a Qristal session.
+
+        Parameters
+        ----------
+        results : qristal.core.MapVectorBoolInt
+            A dictionary of measured bitstring counts as returned by qristal.core.session.results.
+
+        Returns
+        -------
+        PackedCounts
+            The packed counts.
+        """
+        keys = list(results)
+        num_bits = len(keys[0]) if keys else 0
+        bits = np.fromiter(chain.from_iterable(keys), dtype=bool, count=len(keys) * num_bits)
+        counts = np.fromiter((results[key] for key in keys), dtype=np.int64, count=len(keys))
+        return cls(_pack_bits(bits.reshape(len(keys), num_bits)), counts, num_bits)
+
+    def total_counts(self) -> int:
+        """
+        Returns
+        -------
+        int
+            The total number of shots.
+        """
+        return int(self.counts.sum())
+
+    def probabilities(self) -> np.ndarray:
+        """
+        Returns
+        -------
+        numpy.ndarray
+            The probability of each distinct outcome.
+        """
+        return self.counts / self.total_counts()
+
+    def int_keys(self) -> List[int]:
+        """
+        Returns
+        -------
+        list[int]
+            Each distinct outcome as an integer, with classical bit i as bit i of the integer.
+        """
+        if self.bitstrings.shape[1] == 1:
+            return self.bitstrings[:, 0].tolist()
+        return [int.from_bytes(row.astype("<u8").tobytes(), "little") for row in self.bitstrings]
+
+    @classmethod
+    def merge(cls, counts: List["PackedCounts"]) -> "PackedCounts":
+        """
+        Combine the counts of several executions of the same circuit.
+
+        Parameters
+        ----------
+        counts : list[PackedCounts]
+            The counts to combine, with equal numbers of bits.
+
+        Returns
+        -------
+        PackedCounts
+            The combined counts.
+        """
+        bitstrings = np.concatenate([part.bitstrings for part in counts])
+        unique, inverse = np.unique(bitstrings, axis=0, return_inverse=True)
+        totals = np.zeros(len(unique), dtype=np.int64)
+        np.add.at(totals, inverse.reshape(-1), np.concatenate([part.counts for part in counts]))
+        return cls(unique, totals, counts[0].num_bits)
+
+    def to_bit_matrix(self) -> np.ndarray:
+        """
+        Expand the counts into one row of bits per shot, grouped by outcome.
+
+        Returns
+        -------
+        numpy.ndarray
+            Boolean array of shape (shots, num_bits), in which column i holds classical bit i.
+        """
+        words = self.bitstrings.astype("<u8").view(np.uint8).reshape(len(self.counts), -1)
+        bits = np.unpackbits(words, axis=1, count=self.num_bits, bitorder="little").astype(bool)
+        return np.repeat(bits, self.counts, axis=0)
+
+    def parities(self, masks: np.ndarray) -> np.ndarray:
+        """
+        Compute the parity of the masked bits of every outcome.
+
+        Parameters
+        ----------
+        masks : numpy.ndarray
+            Packed bit masks of shape (terms, words).
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (outcomes, terms) holding 1 where an odd number of masked bits is set 
+            and 0 otherwise.
+        """
+        overlap = np.bitwise_and(self.bitstrings[:, None, :], masks[None, :, :])
+        return _popcount(overlap).sum(axis=2, dtype=np.int64) & 1
+
+    def expectation_values(self, masks: np.ndarray) -> np.ndarray:
+        """
+        Compute the expectation values of parity observables, e.g. Pauli operators measured in 
+        their eigenbasis.
+
+        Parameters
+        ----------
+        masks : numpy.ndarray
+            Packed bit masks of shape (terms, words).
+
+        Returns
+        -------
+        numpy.ndarray
+            The expectation value of (-1)^parity for every mask.
+        """
+        probabilities = self.probabilities()
+        values = np.empty(len(masks))
+        step = max(1, _PARITY_CHUNK_SIZE // max(1, len(self.counts)))
+        for start in range(0, len(masks), step):
+            signs = 1.0 - 2.0 * self.parities(masks[start:start + step])
+            values[start:start + step] = probabilities @ signs
+        return values
+
+    def variance(self, masks: np.ndarray, coeffs: np.ndarray) -> float:
+        """
+        Compute the single-shot variance of a weighted sum of parity observables, e.g. of a group 
+        of Pauli operators measured in their common eigenbasis.
+
+        Parameters
+        ----------
+        masks : numpy.ndarray
+            Packed bit masks of shape (terms, words).
+        coeffs : numpy.ndarray
+            The real coefficient of every mask.
+
+        Returns
+        -------
+        float
+            The variance of sum_i coeffs[i] * (-1)^parity_i over the measured outcomes.
+        """
+        probabilities = self.probabilities()
+        mean = square = 0.0
+        step = max(1, _PARITY_CHUNK_SIZE // max(1, len(masks)))
+        for start in range(0, len(self.counts), step):
+            chunk = PackedCounts(self.bitstrings[start:start + step], self.counts[start:start + step], self.num_bits)
+            values = (1.0 - 2.0 * chunk.parities(masks)) @ coeffs
+            mean += probabilities[start:start + step] @ values
+            square += probabilities[start:start + step] @ values**2
+        return max(square - mean**2, 0.0)
+
+class QristalResultCache:
+    """
+    A persistent, content-addressed cache of measurement results stored in a SQLite database.
+
+    Results are keyed by a hash of the normalised OpenQASM2 circuit and the settings of the Qristal 
+    session executing it (see SESSION_ATTRIBUTES). Once the stored results exceed max_size_bytes, 
+    the least recently used results are evicted.
+    """
+
+    # Session settings that determine the results of a circuit
+    SESSION_ATTRIBUTES = _SESSION_ATTRIBUTES
+
+    def __init__(self, path: str = "qristal_result_cache.sqlite", max_size_bytes: int = 256 * 2**20,
+                 deterministic_only: bool = False):
+        """
+        Initialize the QristalResultCache, creating the database if it does not exist yet.
+
+        Parameters
+        ----------
+        path : str, optional
+            Path of the SQLite database file. Use ":memory:" for a cache that is not persisted.
+        max_size_bytes : int, optional
+            Maximum total size of the stored results.
+        deterministic_only : bool, optional
+            If True, only results of sessions with a fixed seed are cached, so that cached results 
+            are identical to those a new execution would return.
+        """
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self.deterministic_only = deterministic_only
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def normalise_qasm(qasm_str: str) -> str:
+        """
+        Normalise an OpenQASM2 string by removing comments, blank lines and redundant whitespace.
+
+        Parameters
+        ----------
+        qasm_str : str
+            An OpenQASM2 representation of a quantum circuit.
+
+        Returns
+        -------
+        str
+            The normalised OpenQASM2 string.
+        """
+        lines = (" ".join(line.split("//", 1)[0].split()) for line in qasm_str.splitlines())
+        return "\n".join(line for line in lines if line)
+
+    def key(self, qasm_str: str, qristal_session) -> Optional[str]:
+        """
+        Compute the cache key of a circuit executed by a Qristal session.
+
+        Parameters
+        ----------
+        qasm_str : str
+            An OpenQASM2 representation of a quantum circuit.
+        qristal_session : qristal.core.session
+            The Qristal session executing the circuit.
+
+        Returns
+        -------
+        str or None
+            The hexadecimal SHA-256 key, or None if the results of the session must not be cached 
+            (deterministic_only without a fixed seed).
+        """
+        settings = {name: _session_setting(getattr(qristal_session, name, None)) for name in self.SESSION_ATTRIBUTES}
+        if self.deterministic_only and getattr(qristal_session, "seed", None) is None:
+            return None
+        content = json.dumps({"qasm": self.normalise_qasm(qasm_str), "settings": settings}, sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[PackedCounts]:
+        """
+        Look up cached results.
+
+        Parameters
+        ----------
+        key : str
+            The cache key (see key()).
+
+        Returns
+        -------
+        PackedCounts or None
+            The cached counts, or None if the key is not cached.
+        """
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        with np.load(io.BytesIO(row[0]), allow_pickle=False) as data:
+            return PackedCounts(data["bitstrings"], data["counts"], int(data["num_bits"]))
+
+    def put(self, key: str, counts: PackedCounts):
+        """
+        Store results, evicting the least recently used results if the cache grows too large.
+
+        Parameters
+        ----------
+        key : str
+            The cache key (see key()).
+        counts : PackedCounts
+            The counts to store.
+        """
+        buffer = io.BytesIO()
+        np.savez(buffer, bitstrings=counts.bitstrings, counts=counts.counts, num_bits=counts.num_bits)
+        value = buffer.getvalue()
+        if len(value) > self.max_size_bytes:
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time())
+            )
+            total = 0
+            evicted = []
+            for stored_key, size in self._connection.execute(
+                    "SELECT key, size FROM results ORDER BY last_access DESC"):
+                total += size
+                if total > self.max_size_bytes:
+                    evicted.append((stored_key,))
+            self._connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def clear(self):
+        """Remove all cached results."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+class QristalSessionPool:
+    """
+    A pool of identically configured Qristal sessions, used to execute circuits in parallel.
+
+    Every session is used by one circuit execution at a time. Pass the pool in place of a single 
+    session to QristalSampler to fan circuits out over all sessions.
+    """
+
+    # Session settings copied by clone()
+    SESSION_ATTRIBUTES = _SESSION_ATTRIBUTES
+
+    def __init__(self, sessions: List):
+        """
+        Initialize the QristalSessionPool from configured sessions.
+
+        Parameters
+        ----------
+        sessions : list[qristal.core.session]
+            The sessions of the pool.
+        """
+        if not sessions:
+            raise ValueError("A QristalSessionPool requires at least one session.")
+        self.sessions = list(sessions)
+        self._available = queue.Queue()
+        for session in self.sessions:
+            self._available.put(session)
+        self._executor = ThreadPoolExecutor(max_workers=len(self.sessions))
+
+    @classmethod
+    def clone(cls, qristal_session, size: Optional[int] = None,
+              attributes: Iterable[str] = SESSION_ATTRIBUTES) -> "QristalSessionPool":
+        """
+        Create a pool of copies of a configured session.
+
+        Clones share the seed of the session, so the results of a circuit do not depend on the 
+        session executing it.
+
+        Parameters
+        ----------
+        qristal_session : qristal.core.session
+            The configured session. It becomes the first session of the pool.
+        size : int, optional
+            Number of sessions. Defaults to the number of CPU cores.
+        attributes : iterable[str], optional
+            Session settings copied to the clones. Settings that are not set (None) are skipped.
+
+        Returns
+        -------
+        QristalSessionPool
+            The pool of sessions.
+        """
+        size = size if size is not None else (os.cpu_count() or 1)
+        sessions = [qristal_session]
+        for _ in range(size - 1):
+            session = type(qristal_session)()
+            for name in attributes:
+                value = getattr(qristal_session, name, None)
+                if value is not None:
+                    setattr(session, name, value)
+            sessions.append(session)
+        return cls(sessions)
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    @contextmanager
+    def session(self):
+        """
+        Context manager handing out a session for exclusive use, waiting until one is available.
+        """
+        session = self._available.get()
+        try:
+            yield session
+        finally:
+            self._available.put(session)
+
+    def map(self, function, items: Iterable) -> list:
+        """
+        Apply a function to every item in parallel, with up to one call per session at a time.
+
+        Parameters
+        ----------
+        function : callable
+            The function to apply. It should acquire a session through session().
+        items : iterable
+            The items to process.
+
+        Returns
+        -------
+        list
+            The return values of the function, in the order of the items.
+        """
+        return list(self._executor.map(function, items))
+
+    def close(self):
+        """Shut down the threads of the pool."""
+        self._executor.shutdown()
+
+class QristalJob(PrimitiveJob):
+    """
+    A PrimitiveJob executed by a configurable executor.
+
+    The job function is called with the job as its first argument, and should call 
+    check_cancelled() between circuit executions. Jobs are thereby cancelled cooperatively once 
+    they have started running.
+    """
+
+    def __init__(self, function, *args, executor: Optional[Executor] = None, **kwargs):
+        """
+        Initialize the QristalJob.
+
+        Parameters
+        ----------
+        function : callable
+            The function executing the job, called as function(job, *args, **kwargs).
+        *args : tuple
+            Positional arguments of the function.
+        executor : concurrent.futures.Executor, optional
+            The executor running the job. By default, every job runs in a thread of its own.
+        **kwargs : dict
+            Keyword arguments of the function.
+        """
+        super().__init__(function, *args, **kwargs)
+        self._executor = executor
+        self._cancel_requested = threading.Event()
+
+    def _submit(self):
+        if self._future is not None:
+            raise JobError("Primitive job has been submitted already.")
+        if self._executor is None:
+            executor = ThreadPoolExecutor(max_workers=1)
+            self._future = executor.submit(self._function, self, *self._args, **self._kwargs)
+            executor.shutdown(wait=False)
+        else:
+            self._future = self._executor.submit(self._function, self, *self._args, **self._kwargs)
+
+    def check_cancelled(self):
+        """
+        Raise concurrent.futures.CancelledError if cancellation of the job was requested.
+        """
+        if self._cancel_requested.is_set():
+            raise CancelledError(f"Job {self.job_id()} was cancelled.")
+
+    def cancel(self) -> bool:
+        """
+        Cancel the job. Jobs that are already running stop before their next circuit execution.
+
+        Returns
+        -------
+        bool
+            False if the job has already finished, True otherwise.
+        """
+        self._check_submitted()
+        if self._future.cancel():
+            return True
+        if self._future.done():
+            return False
+        self._cancel_requested.set()
+        return True
+
+    def status(self) -> JobStatus:
+        self._check_submitted()
+        if (self._cancel_requested.is_set() and self._future.done() and not self._future.cancelled()
+                and isinstance(self._future.exception(), CancelledError)):
+            return JobStatus.CANCELLED
+        return super().status()
+
+class QristalProfiler:
+    """
+    A registry of timings of the stages of circuit execution in the Qristal primitives.
+
+    Every timed stage is recorded as a span, a dict with the stage name, its start (Unix time) and 
+    duration in seconds, and attributes such as circuit sizes and shot counts. Stages recorded by 
+    the primitives are "transpile" (transpile cache misses only), "bind", "qasm_export", 
+    "cache_lookup", "backend", "counts_conversion", "statevector" and "post_processing". Spans are 
+    passed to every registered callback, e.g. to forward them to a metrics or tracing system, and 
+    can be exported together with per-stage statistics.
+    """
+
+    def __init__(self, max_spans: Optional[int] = 100000):
+        """
+        Initialize the QristalProfiler.
+
+        Parameters
+        ----------
+        max_spans : int, optional
+            Maximum number of spans kept for export (the oldest spans are discarded first). 
+            Per-stage statistics cover all spans. Set to None to keep every span.
+        """
+        self._spans = deque(maxlen=max_spans)
+        self._stats = {}
+        self._callbacks = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def add_callback(self, callback):
+        """
+        Register a function called as callback(span) for every recorded span.
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    @contextmanager
+    def span(self, stage: str, **attributes):
+        """
+        Time the enclosed block as a stage. The attributes dict is yielded, so that attributes 
+        known only inside the block can be added to it.
+        """
+        start = time.perf_counter()
+        try:
+            yield attributes
+        finally:
+            self.record(stage, time.perf_counter() - start, **attributes)
+
+    def record(self, stage: str, duration: float, **attributes):
+        """
+        Record a span of the given stage and duration (in seconds).
+        """
+        span = {"stage": stage, "start": time.time() - duration, "duration": duration, **attributes}
+        with self._lock:
+            self._spans.append(span)
+            stats = self._stats.setdefault(stage, {"count": 0, "total": 0.0, "max": 0.0})
+            stats["count"] += 1
+            stats["total"] += duration
+            stats["max"] = max(stats["max"], duration)
+            for timings in getattr(self._local, "collectors", ()):
+                timings[stage] = timings.get(stage, 0.0) + duration
+            callbacks = list(self._callbacks)
+        for callback in callbacks:
+            callback(span)
+
+    @contextmanager
+    def collect(self, timings: Optional[dict] = None):
+        """
+        Accumulate the durations of all spans recorded by the current thread within the enclosed 
+        block into a dict of stage names to total seconds, which is yielded.
+
+        Parameters
+        ----------
+        timings : dict, optional
+            The dict to accumulate into, possibly shared between threads. Defaults to a new dict.
+        """
+        timings = {} if timings is None else timings
+        collectors = getattr(self._local, "collectors", ())
+        self._local.collectors = collectors + (timings,)
+        try:
+            yield timings
+        finally:
+            self._local.collectors = collectors
+
+    def summary(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            For every stage, the number of spans ("count") and their total ("total"), mean 
+            ("mean") and maximum ("max") duration in seconds.
+        """
+        with self._lock:
+            return {stage: dict(stats, mean=stats["total"] / stats["count"])
+                    for stage, stats in self._stats.items()}
+
+    def export(self, path: Optional[str] = None) -> dict:
+        """
+        Export the recorded profile.
+
+        Parameters
+        ----------
+        path : str, optional
+            If given, the profile is also written to this file as JSON.
+
+        Returns
+        -------
+        dict
+            The per-stage statistics ("summary", see summary()) and the kept spans ("spans").
+        """
+        with self._lock:
+            spans = list(self._spans)
+        profile = {"summary": self.summary(), "spans": spans}
+        if path is not None:
+            with open(path, "w") as file:
+                json.dump(profile, file, default=float)
+        return profile
+
+    def clear(self):
+        """
+        Discard all recorded spans and statistics.
+        """
+        with self._lock:
+            self._spans.clear()
+            self._stats.clear()
+
 class QristalSampler(BaseSamplerV1):
     """
     A custom implementation of a quantum circuit sampler based on qiskit's BaseSamplerV1 
     for arbitrary Qristal backends. 
     """
 
-    def __init__(self, qristal_session):
+    def __init__(self, qristal_session, transpile_cache_size: int = 128,
+                 result_cache: Optional[QristalResultCache] = None, executor: Optional[Executor] = None,
+                 profiler: Optional[QristalProfiler] = None):
+        """
+        Initialize the QristalSampler from an arbitrary Qristal session.
+
+        Parameters
+        ----------
+        qristal_session : qristal.core.session or QristalSessionPool
+            An instance of a Qristal session object, or a pool of sessions executing circuits in 
+            parallel.
+        transpile_cache_size : int, optional
+            Maximum number of transpiled circuit templates kept for reuse (least recently used 
+            templates are evicted first). Set to 0 to disable caching.
+        result_cache : QristalResultCache, optional
+            A cache of measurement results. Circuits found in the cache are not executed again.
+        executor : concurrent.futures.Executor, optional
+            The executor running jobs, e.g. a ThreadPoolExecutor shared between primitives. By 
+            default, every job runs in a thread of its own.
+        profiler : QristalProfiler, optional
+            A profiler recording the durations of the stages of circuit execution. If given, the 
+            metadata of results also holds the total duration of every stage ("timings").
+        """
+        super().__init__()
+        self.session_pool = None
+        if isinstance(qristal_session, QristalSessionPool):
+            self.session_pool = qristal_session
+            qristal_session = qristal_session.sessions[0]
+        self.qristal_session = qristal_session
+        self.transpile_cache_size = transpile_cache_size
+        self._transpile_cache = OrderedDict()
+        self._transpile_lock = threading.Lock()
+        self.result_cache = result_cache
+        self.executor = executor
+        self.profiler = profiler
+        # Serializes executions on the (stateful) Qristal session across concurrent jobs
+        self._session_lock = threading.RLock()
+
+    def _run(self, circuits, parameter_values=None, **kwargs):
+        """
+        Execute and collect samples from a batch of quantum circuits using the Qristal session.
+
+        Parameters
+        ----------
+        circuits : list[qiskit.QuantumCircuit]
+            A list of Qiskit QuantumCircuit objects.
+        parameter_values : list[list[float]], optional
+            Parameter bindings for each circuit, if applicable.
+        **kwargs : dict
+            Additional keyword arguments (currently unused).
+
+        Returns
+        -------
+        QristalJob
+            A job object wrapping the execution and returning a SamplerResult upon completion.
+        """
+        def _execute(job, i):
+            job.check_cancelled()
+            with self._collect() as timings:
+                # Transpile once to QB native gate set, then bind parameters
+                values = parameter_values[i] if parameter_values else []
+                bound_circuit = self._bind_transpiled(circuits[i], values)
+
+                # Convert to QASM2
+                qasm = self._dumps(bound_circuit)
+                return self._sample(qasm), timings
+
+        def _job_fn(job):
+            prob_dists = []
+            metadata = []
+
+            for counts, timings in self._map(lambda i: _execute(job, i), range(len(circuits))):
+                # Convert counts to probability distribution
+                probs = dict(zip(counts.int_keys(), counts.probabilities().tolist()))
+                prob_dists.append(probs)
+                metadata.append({"shots": counts.total_counts()})
+                if timings is not None:
+                    metadata[-1]["timings"] = timings
+
+            return SamplerResult(prob_dists, metadata)
+
+        job = QristalJob(_job_fn, executor=self.executor)
+        job._submit()
+        return job
+
+    def _span(self, stage: str, **attributes):
+        """
+        Time a stage with the profiler, if any (see QristalProfiler.span).
+        """
+        if self.profiler is None:
+            return nullcontext(attributes)
+        return self.profiler.span(stage, **attributes)
+
+    def _collect(self, timings: Optional[dict] = None):
+        """
+        Accumulate stage durations with the profiler, if any (see QristalProfiler.collect). Yields 
+        None without a profiler.
+        """
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.collect(timings)
+
+    def _dumps(self, circuit: QuantumCircuit) -> str:
+        """
+        Export a bound circuit to OpenQASM2.
+        """
+        if self.profiler is None:
+            return dumps(circuit)
+        with self._span("qasm_export", num_qubits=circuit.num_qubits, num_gates=circuit.size(),
+                        depth=circuit.depth()):
+            return dumps(circuit)
+
+    def _map(self, function, items) -> list:
+        """
+        Apply a function executing circuits to every item, in parallel over the session pool if any.
+
+        Parameters
+        ----------
+        function : callable
+            The function to apply.
+        items : iterable
+            The items to process.
+
+        Returns
+        -------
+        list
+            The return values of the function, in the order of the items.
+        """
+        items = list(items)
+        if self.session_pool is None or len(items) < 2:
+            return [function(item) for item in items]
+        return self.session_pool.map(function, items)
+
+    def _transpile(self, circuit: QuantumCircuit) -> Tuple[QuantumCircuit, tuple]:
+        """
+        Transpile a (possibly parameterized) circuit to the QB native gate set, reusing the result 
+        of an earlier call for structurally identical circuits.
+
+        Parameters
+        ----------
+        circuit : qiskit.QuantumCircuit
+            The circuit template to transpile.
+
+        Returns
+        -------
+        tuple[qiskit.QuantumCircuit, tuple[qiskit.circuit.Parameter, ...]]
+            The transpiled template and the parameters of the circuit it was transpiled from, in 
+            the order expected for parameter bindings.
+        """
+        key = _circuit_key(circuit)
+        with self._transpile_lock:
+            cached = self._transpile_cache.get(key)
+            if cached is not None:
+                self._transpile_cache.move_to_end(key)
+                return cached
+
+        with self._span("transpile", num_qubits=circuit.num_qubits, num_gates=circuit.size()):
+            transpiled = _transpile_native(circuit)
+        cached = (transpiled, tuple(circuit.parameters))
+        if self.transpile_cache_size > 0:
+            with self._transpile_lock:
+                self._transpile_cache[key] = cached
+                while len(self._transpile_cache) > self.transpile_cache_size:
+                    self._transpile_cache.popitem(last=False)
+        return cached
+
+    def _bind_transpiled(self, circuit: QuantumCircuit, parameter_values) -> QuantumCircuit:
+        """
+        Bind parameter values into the transpiled template of a circuit.
+
+        Parameters
+        ----------
+        circuit : qiskit.QuantumCircuit
+            The (possibly parameterized) circuit to execute.
+        parameter_values : list[float]
+            Parameter bindings for the circuit, ordered as circuit.parameters.
+
+        Returns
+        -------
+        qiskit.QuantumCircuit
+            The transpiled circuit with all parameters bound.
+        """
+        transpiled, parameters = self._transpile(circuit)
+        if not parameters:
+            return transpiled
+        # Transpilation may optimize parameters away, so bind non-strictly
+        with self._span("bind", num_parameters=len(parameters)):
+            return transpiled.assign_parameters(dict(zip(parameters, parameter_values)), strict=False)
+
+    def _send_to_backend(self, qasm_str: str, qristal_session=None) -> dict:
         """
-        Initialize the QristalSampler from an arbitrary Qristal session.
+        Send a OpenQASM2-formatted circuit to the Qristal backend and retrieve results.
 
         Parameters
         ----------
-        qristal_session : qristal.core.session 
-            An instance of a Qristal session object.
+        qasm_str : str
+            An OpenQASM2 representation of a quantum circuit.
+        qristal_session : qristal.core.session, optional
+            The session executing the circuit. Defaults to the session of the sampler.
+
+        Returns
+        -------
+        qristal.core.MapVectorBoolInt
+            A dictionary of measured bitstring counts as returned by qristal.core.session.results.
         """
-        super().__init__()
-        self.qristal_session = qristal_session
+        if qristal_session is None:
+            qristal_session = self.qristal_session
+        qristal_session.instring = qasm_str
+        qristal_session.run()
+        return qristal_session.results
 
-    def _run(self, circuits, parameter_values=None, **kwargs):
+    def _sample(self, qasm_str: str, shots: Optional[int] = None) -> PackedCounts:
         """
-        Execute and collect samples from a batch of quantum circuits using the Qristal session.
+        Execute an OpenQASM2-formatted circuit on the Qristal backend (on an available session of the 
+        session pool, if any) and pack the measured counts. Results are looked up in and stored to 
+        the result cache, if any.
 
         Parameters
         ----------
-        circuits : list[qiskit.QuantumCircuit]
-            A list of Qiskit QuantumCircuit objects.
-        parameter_values : list[list[float]], optional
-            Parameter bindings for each circuit, if applicable.
-        **kwargs : dict
-            Additional keyword arguments (currently unused).
+        qasm_str : str
+            An OpenQASM2 representation of a quantum circuit.
+        shots : int, optional
+            Number of shots. Defaults to the number of shots of the Qristal session.
 
         Returns
         -------
-        PrimitiveJob
-            A job object wrapping the execution and returning a SamplerResult upon completion.
+        PackedCounts
+            The measured bitstring counts.
         """
-        def _job_fn():
-            prob_dists = []
-            metadata = []
+        if self.session_pool is not None:
+            with self.session_pool.session() as session:
+                return self._sample_on(session, qasm_str, shots)
+        with self._session_lock:
+            return self._sample_on(self.qristal_session, qasm_str, shots)
 
-            for i, circuit in enumerate(circuits):
-                # Handle parameters
-                if parameter_values:
-                    values = parameter_values[i]
-                    bound_circuit = circuit.assign_parameters(values)
-                else:
-                    bound_circuit = circuit
-                #optional transpile circuit to QB native gate set
-                bound_circuit = transpile(bound_circuit, basis_gates=['rx', 'ry', 'cz'], optimization_level=3)
+    def _sample_on(self, qristal_session, qasm_str: str, shots: Optional[int] = None) -> PackedCounts:
+        """
+        Execute an OpenQASM2-formatted circuit on a given session (see _sample).
 
-                # Convert to QASM2
-                qasm = dumps(bound_circuit)
-                counts = self._send_to_backend(qasm)
+        Parameters
+        ----------
+        qristal_session : qristal.core.session
+            The session executing the circuit, reserved for exclusive use by the caller.
+        qasm_str : str
+            An OpenQASM2 representation of a quantum circuit.
+        shots : int, optional
+            Number of shots. Defaults to the number of shots of the session.
 
-                # Convert counts to probability distribution
-                total = counts.total_counts()
-                probs = {}
-                for bitvec in counts:
-                    bit_value = 0
-                    for bit in reversed(bitvec):
-                        bit_value = (bit_value << 1) | int(bit)  
-                    probs[bit_value] = counts[bitvec] / total
-                prob_dists.append(probs)
-                metadata.append({"shots": total})
+        Returns
+        -------
+        PackedCounts
+            The measured bitstring counts.
+        """
+        if shots is not None and shots != qristal_session.sn:
+            previous_shots = qristal_session.sn
+            qristal_session.sn = shots
+            try:
+                return self._sample_on(qristal_session, qasm_str)
+            finally:
+                qristal_session.sn = previous_shots
 
-            return SamplerResult(prob_dists, metadata)
+        key = None
+        if self.result_cache is not None:
+            with self._span("cache_lookup") as attributes:
+                key = self.result_cache.key(qasm_str, qristal_session)
+                counts = None if key is None else self.result_cache.get(key)
+                attributes["hit"] = counts is not None
+            if counts is not None:
+                return counts
+        with self._span("backend", shots=qristal_session.sn, num_qubits=qristal_session.qn):
+            results = self._send_to_backend(qasm_str, qristal_session)
+        with self._span("counts_conversion", num_outcomes=len(results)):
+            counts = PackedCounts.from_qristal(results)
+        if key is not None:
+            self.result_cache.put(key, counts)
+        return counts
 
-        job = PrimitiveJob(_job_fn)
-        job._submit()
-        return job
+class _MeasurementGroup:
+    """
+    A group of qubit-wise commuting Pauli operators of an observable, measured with a single 
+    circuit, together with the precomputed data needed to measure and evaluate them.
+    """
 
-    def _send_to_backend(self, qasm_str: str) -> dict:
+    def __init__(self, indices: np.ndarray, paulis: PauliList, basis: Pauli, suffix: Optional[QuantumCircuit]):
         """
-        Send a OpenQASM2-formatted circuit to the Qristal backend and retrieve results.
+        Initialize the _MeasurementGroup.
 
         Parameters
         ----------
-        qasm_str : str
-            An OpenQASM2 representation of a quantum circuit.
+        indices : numpy.ndarray
+            The positions of the Pauli operators in the observable.
+        paulis : qiskit.quantum_info.PauliList
+            The Pauli operators.
+        basis : qiskit.quantum_info.Pauli
+            The common measurement basis of the operators.
+        suffix : qiskit.QuantumCircuit or None
+            The transpiled basis-change and measurement circuit, or None for groups of identity 
+            operators only, which need no measurement.
+        """
+        self.indices = indices
+        self.paulis = paulis
+        self.basis = basis
+        self.suffix = suffix
+        self._masks = {}
 
+    def masks(self, num_bits: int) -> np.ndarray:
+        """
         Returns
         -------
-        qristal.core.MapVectorBoolInt
-            A dictionary of measured bitstring counts as returned by qristal.core.session.results.
+        numpy.ndarray
+            The packed parity masks of the operators for outcomes of num_bits bits (see _pauli_masks).
         """
-        self.qristal_session.instring = qasm_str
-        self.qristal_session.run()
-        return self.qristal_session.results
+        masks = self._masks.get(num_bits)
+        if masks is None:
+            masks = self._masks[num_bits] = _pauli_masks(self.paulis, num_bits)
+        return masks
 
 class QristalEstimator(BaseEstimatorV1):
     """
@@ -107,7 +1192,10 @@ class QristalEstimator(BaseEstimatorV1):
     for arbitrary Qristal backends.
     """
 
-    def __init__(self, qristal_sampler):
+    def __init__(self, qristal_sampler, grouping: Optional[str] = "qubit_wise",
+                 executor: Optional[Executor] = None, shot_budget: Optional[int] = None,
+                 pilot_shots: Optional[int] = None, deterministic: bool = False,
+                 plan_cache_size: int = 128):
         """
         Initialize the QristalEstimator from an arbitrary QristalSampler.
 
@@ -115,9 +1203,44 @@ class QristalEstimator(BaseEstimatorV1):
         ----------
         qristal_sampler : QristalSampler 
             An instance of a QristalSampler object.
+        grouping : str, optional
+            Strategy used to partition each observable into measurement bases. With "qubit_wise" 
+            (default), all qubit-wise commuting Pauli terms share a single measurement circuit. 
+            With None, every Pauli term is measured with its own circuit.
+        executor : concurrent.futures.Executor, optional
+            The executor running jobs. Defaults to the executor of the QristalSampler.
+        shot_budget : int, optional
+            Total number of shots per expectation value, distributed across its measurement groups 
+            proportionally to |coeff| * sigma (the summed coefficient magnitudes of each group, or 
+            the standard deviations estimated in a pilot round). By default, every measurement 
+            group is executed with the shots of the Qristal session.
+        pilot_shots : int, optional
+            Number of shots per measurement group of a pilot round, from which the standard 
+            deviations of the groups are estimated before the remaining shot budget is allocated. 
+            Requires shot_budget.
+        deterministic : bool, optional
+            If True, expectation values are evaluated exactly from the statevector of every bound 
+            circuit (computed with qiskit's Statevector), without executing circuits on the Qristal 
+            backend. This corresponds to a noiseless simulator with infinitely many shots, like the 
+            isDeterministic option of vqee.
+        plan_cache_size : int, optional
+            Maximum number of observables whose measurement plan (grouping, parity masks and 
+            transpiled measurement suffix circuits) is kept for reuse. Set to 0 to disable caching.
         """
         super().__init__()
+        if grouping not in ("qubit_wise", None):
+            raise ValueError(f"Unsupported grouping strategy '{grouping}'. Expected 'qubit_wise' or None.")
+        if pilot_shots and shot_budget is None:
+            raise ValueError("pilot_shots requires a shot_budget.")
         self.qristal_sampler = qristal_sampler
+        self.grouping = grouping
+        self.executor = executor if executor is not None else qristal_sampler.executor
+        self.shot_budget = shot_budget
+        self.pilot_shots = pilot_shots
+        self.deterministic = deterministic
+        self.plan_cache_size = plan_cache_size
+        self._plan_cache = OrderedDict()
+        self._plan_lock = threading.Lock()
 
     def _run(
         self,
@@ -125,7 +1248,7 @@ class QristalEstimator(BaseEstimatorV1):
         observables: List[Union[SparsePauliOp, str]],
         parameter_values: Optional[List[List[float]]] = None,
         **kwargs
-    ) -> PrimitiveJob:
+    ) -> QristalJob:
         """
         Evaluate expectation values of observables over a batch of parameterized circuits.
 
@@ -143,46 +1266,418 @@ class QristalEstimator(BaseEstimatorV1):
 
         Returns
         -------
-        PrimitiveJob
-            A job that will return an EstimatorResult containing the evaluated expectation values.
+        QristalJob
+            A job that will return an EstimatorResult containing the evaluated expectation values. 
+            The metadata of every value holds the total number of shots ("shots"), the shots of 
+            every measurement group ("group_shots"), and the estimated variance ("variance") and 
+            standard error ("std_error") of the value. If the QristalSampler has a profiler, it 
+            also holds the total duration of every stage of its evaluation ("timings").
         """
-        results = []
-
-        for i in range(len(circuits)):
-            circuit = circuits[i]
-            observable = observables[i]
+        sampler = self.qristal_sampler
+        def _run_job(job):
+            tasks = []
+            operators = []
+            for i in range(len(circuits)):
+                observable = observables[i]
+                values = parameter_values[i] if parameter_values else []
 
-            # Bind parameters if needed
-            if parameter_values:
-                circuit = circuit.assign_parameters(parameter_values[i])
+                # Convert string observable to SparsePauliOp
+                if isinstance(observable, str):
+                    observable = SparsePauliOp.from_list([(observable, 1.0)])
+                operators.append(observable)
+                # The statevector path evaluates Pauli terms directly, without measurement groups
+                groups = None if self.deterministic else self._measurement_groups(observable.paulis)
+                tasks.append((circuits[i], groups, values))
+            timings = [{} for _ in tasks] if sampler.profiler is not None else None
 
-            # Convert string observable to SparsePauliOp
-            if isinstance(observable, str):
-                observable = SparsePauliOp.from_list([(observable, 1.0)])
+            if self.deterministic:
+                results = []
+                metadata = []
+                for i, ((circuit, _, values), operator) in enumerate(zip(tasks, operators)):
+                    job.check_cancelled()
+                    with self._collect(timings, i):
+                        exp_vals = self._exact_term_values(circuit, operator.paulis, values)
+                    results.append(np.dot(operator.coeffs, exp_vals).real)
+                    metadata.append({"shots": 0, "variance": 0.0, "std_error": 0.0})
+                    if timings is not None:
+                        metadata[-1]["timings"] = timings[i]
+                return EstimatorResult(values=np.array(results), metadata=metadata)
 
-            # Evaluate expectation value
-            expectation = 0.0
-            for pauli, coeff in zip(observable.paulis, observable.coeffs):
-                meas_circuit = self._prepare_measurement_circuit(circuit, pauli)
-                #optional: transpile circuit 
-                meas_circuit = transpile(meas_circuit, basis_gates=['rx', 'ry', 'cz'], optimization_level=3)
-                qasm_str = dumps(meas_circuit)
-                counts = self.qristal_sampler._send_to_backend(qasm_str)
-                exp_val = self._compute_expectation(counts, pauli)
-                expectation += coeff * exp_val
+            # Execute one circuit per measurement group
+            coeffs = [operator.coeffs.real for operator in operators]
+            if self.shot_budget is None:
+                counts = self._run_measurements([task + (None,) for task in tasks], job, timings)
+            else:
+                counts = self._run_budgeted_measurements(tasks, coeffs, job, timings)
 
-            results.append(expectation.real)
+            results = []
+            metadata = []
+            for i, ((_, groups, _), operator, operator_coeffs, group_counts) in enumerate(
+                    zip(tasks, operators, coeffs, counts)):
+                with self._collect(timings, i), sampler._span("post_processing", num_terms=len(operator)):
+                    exp_vals = self._term_values(groups, group_counts, len(operator))
+                    results.append(np.dot(operator.coeffs, exp_vals).real)
+                    group_shots = [0 if part is None else part.total_counts() for part in group_counts]
+                    variance = self._variance(groups, group_counts, operator_coeffs)
+                metadata.append({"shots": sum(group_shots), "group_shots": group_shots,
+                                 "variance": variance, "std_error": np.sqrt(variance)})
+                if timings is not None:
+                    metadata[-1]["timings"] = timings[i]
 
-        def _run_job():
-            return EstimatorResult(
-                values=np.array(results), 
-                metadata=[{"shots": self.qristal_sampler.qristal_session.sn}] * len(results)
-            )
-        job = PrimitiveJob(_run_job)
+            return EstimatorResult(values=np.array(results), metadata=metadata)
+        job = QristalJob(_run_job, executor=self.executor)
         job._submit()
         return job
 
-    def _prepare_measurement_circuit(self, circuit: QuantumCircuit, pauli: SparsePauliOp) -> QuantumCircuit:
+    def _term_expectations(self, circuit: QuantumCircuit, paulis: PauliList, parameter_values=(),
+                           shots: Optional[int] = None) -> np.ndarray:
+        """
+        Estimate the expectation values of Pauli operators, executing one circuit per measurement 
+        group.
+
+        Parameters
+        ----------
+        circuit : qiskit.QuantumCircuit
+            The (possibly parameterized) quantum circuit preparing the state.
+        paulis : qiskit.quantum_info.PauliList
+            The Pauli operators to evaluate.
+        parameter_values : list[float], optional
+            Parameter bindings for the circuit, ordered as circuit.parameters.
+        shots : int, optional
+            Number of shots per measurement circuit. Defaults to the number of shots of the 
+            Qristal session.
+
+        Returns
+        -------
+        numpy.ndarray
+            The expectation value of every Pauli operator.
+        """
+        groups = self._measurement_groups(paulis)
+        counts = self._run_measurements([(circuit, groups, parameter_values, shots)])[0]
+        return self._term_values(groups, counts, len(paulis))
+
+    def _exact_term_values(self, circuit: QuantumCircuit, paulis: PauliList, parameter_values=()) -> np.ndarray:
+        """
+        Evaluate the exact expectation values of Pauli operators from the statevector of a circuit.
+
+        Parameters
+        ----------
+        circuit : qiskit.QuantumCircuit
+            The (possibly parameterized) quantum circuit preparing the state.
+        paulis : qiskit.quantum_info.PauliList
+            The Pauli operators to evaluate.
+        parameter_values : list[float], optional
+            Parameter bindings for the circuit, ordered as circuit.parameters.
+
+        Returns
+        -------
+        numpy.ndarray
+            The expectation value of every Pauli operator.
+        """
+        with self.qristal_sampler._span("statevector", num_qubits=circuit.num_qubits, num_terms=len(paulis)):
+            bound_circuit = circuit.remove_final_measurements(inplace=False)
+            if bound_circuit.num_parameters:
+                bound_circuit = bound_circuit.assign_parameters(parameter_values)
+            statevector = Statevector(bound_circuit).data
+            return _pauli_expectation_values(statevector, paulis).real
+
+    def _collect(self, timings: Optional[List[dict]], index: int):
+        """
+        Accumulate stage durations into timings[index] with the profiler of the QristalSampler, if 
+        timings are collected (see QristalProfiler.collect).
+        """
+        if timings is None:
+            return nullcontext()
+        return self.qristal_sampler._collect(timings[index])
+
+    def _measurement_groups(self, paulis: PauliList) -> List[_MeasurementGroup]:
+        """
+        Partition Pauli operators into groups measured with a single circuit, reusing the plan of 
+        an earlier call for the same operators.
+
+        Parameters
+        ----------
+        paulis : qiskit.quantum_info.PauliList
+            The Pauli operators to partition.
+
+        Returns
+        -------
+        list[_MeasurementGroup]
+            The measurement groups, together covering every operator exactly once.
+        """
+        key = (tuple(paulis.to_labels()), self.grouping)
+        with self._plan_lock:
+            groups = self._plan_cache.get(key)
+            if groups is not None:
+                self._plan_cache.move_to_end(key)
+                return groups
+
+        groups = []
+        # Track the position of every term through the grouping in its coefficient
+        indexed = SparsePauliOp(paulis, np.arange(len(paulis)))
+        for group in self._group_observable(indexed):
+            basis = self._measurement_basis(group.paulis)
+            suffix = self._measurement_suffix(basis) if np.any(basis.x | basis.z) else None
+            groups.append(_MeasurementGroup(group.coeffs.real.astype(int), group.paulis, basis, suffix))
+        if self.plan_cache_size > 0:
+            with self._plan_lock:
+                self._plan_cache[key] = groups
+                while len(self._plan_cache) > self.plan_cache_size:
+                    self._plan_cache.popitem(last=False)
+        return groups
+
+    def _run_measurements(self, tasks: List[tuple], job: Optional[QristalJob] = None,
+                          timings: Optional[List[dict]] = None) -> List[list]:
+        """
+        Execute the measurement circuits of several circuits. Every circuit is transpiled once, 
+        independently of its measurement groups, and the pre-transpiled measurement suffix of each 
+        group is appended to it. Measurement circuits are executed in parallel if the 
+        QristalSampler has a session pool.
+
+        Parameters
+        ----------
+        tasks : list[tuple]
+            Tuples (circuit, groups, parameter_values, shots), with groups as returned by 
+            _measurement_groups and shots either None (the shots of the Qristal session), a number 
+            of shots for all groups, or one number of shots per group.
+        job : QristalJob, optional
+            The job executing the tasks, checked for cancellation before every circuit execution.
+        timings : list[dict], optional
+            One dict per task, into which the stage durations of its execution are accumulated 
+            (see QristalProfiler.collect).
+
+        Returns
+        -------
+        list[list[PackedCounts or None]]
+            The counts of every group of every task, or None for groups executed with zero shots 
+            and groups of identity operators only, which need no measurement.
+        """
+        measurements = []
+        bodies = []
+        for task_index, (circuit, groups, parameter_values, shots) in enumerate(tasks):
+            group_shots = shots if np.ndim(shots) else [shots] * len(groups)
+            for group_index, (group, num_shots) in enumerate(zip(groups, group_shots)):
+                if group.suffix is None or num_shots == 0:
+                    continue
+                num_shots = None if num_shots is None else int(num_shots)
+                measurements.append((task_index, group_index, group, num_shots))
+            # Transpile the circuit once, then append the transpiled suffix of every group
+            measured = len(measurements) > 0 and measurements[-1][0] == task_index
+            with self._collect(timings, task_index):
+                bodies.append(self.qristal_sampler._bind_transpiled(circuit, parameter_values) if measured else None)
+
+        def _measure(measurement):
+            if job is not None:
+                job.check_cancelled()
+            task_index, _, group, num_shots = measurement
+            with self._collect(timings, task_index):
+                meas_circuit = self._prepare_measurement_circuit(bodies[task_index], group.basis, group.suffix)
+                return self.qristal_sampler._sample(self.qristal_sampler._dumps(meas_circuit), num_shots)
+
+        counts = [[None] * len(groups) for _, groups, _, _ in tasks]
+        for measurement, group_counts in zip(measurements, self.qristal_sampler._map(_measure, measurements)):
+            counts[measurement[0]][measurement[1]] = group_counts
+        return counts
+
+    def _run_budgeted_measurements(self, tasks: List[tuple], coeffs: List[np.ndarray],
+                                   job: Optional[QristalJob] = None,
+                                   timings: Optional[List[dict]] = None) -> List[list]:
+        """
+        Execute the measurement circuits of several circuits, distributing shot_budget across the 
+        measurement groups of every circuit (see _run_measurements).
+
+        Parameters
+        ----------
+        tasks : list[tuple]
+            Tuples (circuit, groups, parameter_values), with groups as returned by 
+            _measurement_groups.
+        coeffs : list[numpy.ndarray]
+            The real coefficients of the operators of every task.
+        job : QristalJob, optional
+            The job executing the tasks, checked for cancellation before every circuit execution.
+        timings : list[dict], optional
+            One dict per task, into which the stage durations of its execution are accumulated 
+            (see QristalProfiler.collect).
+
+        Returns
+        -------
+        list[list[PackedCounts or None]]
+            The counts of every group of every task.
+        """
+        measured = [np.array([group.suffix is not None for group in groups], dtype=bool)
+                    for _, groups, _ in tasks]
+        weights = [np.array([np.abs(task_coeffs[group.indices]).sum() for group in groups])
+                   for (_, groups, _), task_coeffs in zip(tasks, coeffs)]
+        budgets = [self.shot_budget] * len(tasks)
+        minimum = 1
+        pilot_counts = None
+        if self.pilot_shots:
+            # Estimate the standard deviation of every group from a pilot round
+            pilot_shots = [np.where(mask, self.pilot_shots, 0) for mask in measured]
+            pilot_counts = self._run_measurements(
+                [task + (shots,) for task, shots in zip(tasks, pilot_shots)], job, timings
+            )
+            weights = [np.sqrt(self._group_variances(groups, group_counts, task_coeffs))
+                       for (_, groups, _), group_counts, task_coeffs in zip(tasks, pilot_counts, coeffs)]
+            budgets = [self.shot_budget - int(shots.sum()) for shots in pilot_shots]
+            minimum = 0
+
+        shots = []
+        for mask, task_weights, budget in zip(measured, weights, budgets):
+            task_shots = np.zeros(len(mask), dtype=np.int64)
+            task_shots[mask] = _allocate_shots(budget, task_weights[mask], minimum)
+            shots.append(task_shots)
+        counts = self._run_measurements([task + (task_shots,) for task, task_shots in zip(tasks, shots)],
+                                        job, timings)
+
+        if pilot_counts is not None:
+            counts = [[PackedCounts.merge([part for part in parts if part is not None]) if any(parts) else None
+                       for parts in zip(task_pilot, task_counts)]
+                      for task_pilot, task_counts in zip(pilot_counts, counts)]
+        return counts
+
+    def _term_values(self, groups: List[_MeasurementGroup], counts: List[Optional[PackedCounts]], num_terms: int) -> np.ndarray:
+        """
+        Compute the expectation values of Pauli operators from the counts of their measurement groups.
+
+        Parameters
+        ----------
+        groups : list[_MeasurementGroup]
+            The measurement groups, as returned by _measurement_groups.
+        counts : list[PackedCounts or None]
+            The counts of every group, as returned by _run_measurements.
+        num_terms : int
+            The number of Pauli operators.
+
+        Returns
+        -------
+        numpy.ndarray
+            The expectation value of every Pauli operator.
+        """
+        exp_vals = np.ones(num_terms)
+        for group, group_counts in zip(groups, counts):
+            if group_counts is not None:
+                # Reconstruct every term of the group from the shared counts
+                exp_vals[group.indices] = self._compute_expectations(group_counts, group.paulis,
+                                                                     group.masks(group_counts.num_bits))
+        return exp_vals
+
+    def _group_variances(self, groups: List[_MeasurementGroup], counts: List[Optional[PackedCounts]],
+                         coeffs: np.ndarray) -> np.ndarray:
+        """
+        Compute the single-shot variance of the part of an observable measured by every group.
+
+        Parameters
+        ----------
+        groups : list[_MeasurementGroup]
+            The measurement groups, as returned by _measurement_groups.
+        counts : list[PackedCounts or None]
+            The counts of every group, as returned by _run_measurements.
+        coeffs : numpy.ndarray
+            The real coefficients of the Pauli operators of the observable.
+
+        Returns
+        -------
+        numpy.ndarray
+            The variance of every group, zero for groups without counts.
+        """
+        variances = np.zeros(len(groups))
+        for i, (group, group_counts) in enumerate(zip(groups, counts)):
+            if group_counts is not None and np.any(coeffs[group.indices]):
+                variances[i] = group_counts.variance(group.masks(group_counts.num_bits), coeffs[group.indices])
+        return variances
+
+    def _variance(self, groups: List[_MeasurementGroup], counts: List[Optional[PackedCounts]], coeffs: np.ndarray) -> float:
+        """
+        Estimate the variance of the expectation value of an observable.
+
+        Parameters
+        ----------
+        groups : list[_MeasurementGroup]
+            The measurement groups, as returned by _measurement_groups.
+        counts : list[PackedCounts or None]
+            The counts of every group, as returned by _run_measurements.
+        coeffs : numpy.ndarray
+            The real coefficients of the Pauli operators of the observable.
+
+        Returns
+        -------
+        float
+            The sum over all groups of their single-shot variance divided by their number of shots.
+        """
+        shots = np.array([1 if part is None else part.total_counts() for part in counts])
+        return float(np.sum(self._group_variances(groups, counts, coeffs) / shots))
+
+    def _group_observable(self, observable: SparsePauliOp) -> List[SparsePauliOp]:
+        """
+        Partition an observable into groups of Pauli terms that can be measured with a single circuit.
+
+        Parameters
+        ----------
+        observable : qiskit.quantum_info.SparsePauliOp
+            The observable to partition.
+
+        Returns
+        -------
+        list[qiskit.quantum_info.SparsePauliOp]
+            The measurement groups, together covering every term of the observable exactly once.
+        """
+        if self.grouping == "qubit_wise":
+            return observable.group_commuting(qubit_wise=True)
+        return [observable[i] for i in range(len(observable))]
+
+    def _measurement_basis(self, paulis: PauliList) -> Pauli:
+        """
+        Determine the common measurement basis of a set of qubit-wise commuting Pauli operators.
+
+        Parameters
+        ----------
+        paulis : qiskit.quantum_info.PauliList
+            Qubit-wise commuting Pauli operators.
+
+        Returns
+        -------
+        qiskit.quantum_info.Pauli
+            A Pauli operator acting on every qubit that any of the given operators acts on, whose 
+            eigenbasis diagonalizes all of them simultaneously.
+        """
+        return Pauli((np.any(paulis.z, axis=0), np.any(paulis.x, axis=0)))
+
+    def _measurement_suffix(self, pauli: Pauli) -> QuantumCircuit:
+        """
+        Build the circuit measuring in the eigenbasis of the given Pauli operator, transpiled to 
+        the gate set of the QristalSampler.
+
+        Parameters
+        ----------
+        pauli : qiskit.quantum_info.Pauli
+            The Pauli operator to measure against.
+
+        Returns
+        -------
+        qiskit.QuantumCircuit
+            The basis-change gates followed by a barrier and the measurement of every qubit into a 
+            "meas" register, as added by measure_all.
+        """
+        suffix = QuantumCircuit(pauli.num_qubits)
+
+        # Apply basis change gates based on Pauli terms (indexed by qubit)
+        for idx in range(pauli.num_qubits):
+            if pauli.x[idx] and pauli.z[idx]:
+                # 'Y'
+                suffix.rx(np.pi/2.0, idx)
+            elif pauli.x[idx]:
+                # 'X'
+                suffix.ry(-1.0*np.pi/2.0, idx)
+            # 'Z' and 'I' require no change
+        suffix = _transpile_native(suffix)
+
+        # Add measurements
+        suffix.measure_all()
+        return suffix
+
+    def _prepare_measurement_circuit(self, circuit: QuantumCircuit, pauli: Pauli,
+                                     suffix: Optional[QuantumCircuit] = None) -> QuantumCircuit:
         """
         Prepare a circuit for measuring in the eigenbasis of the given Pauli operator.
 
@@ -190,52 +1685,289 @@ class QristalEstimator(BaseEstimatorV1):
         ----------
         circuit : qiskit.QuantumCircuit
             The base quantum circuit.
-        pauli : qiskit.quantum_info.SparsePauliOp
+        pauli : qiskit.quantum_info.Pauli
             The Pauli operator to measure against.
+        suffix : qiskit.QuantumCircuit, optional
+            The measurement circuit of pauli, as returned by _measurement_suffix. Built if not given.
 
         Returns
         -------
         qiskit.QuantumCircuit
             A modified circuit with basis-change gates and measurements added.
         """
-        # Clone the circuit
-        meas_circuit = circuit.copy()
+        if suffix is None:
+            suffix = self._measurement_suffix(pauli)
 
-        # Apply basis change gates based on Pauli terms
-        for idx, pauli_char in enumerate(pauli.to_label()):
-            if pauli_char == 'X':
-                meas_circuit.ry(-1.0*np.pi/2.0, idx)
-            elif pauli_char == 'Y':
-                meas_circuit.rx(np.pi/2.0, idx)
-            # 'Z' and 'I' require no change
+        # Transpilation may permute the qubits, e.g. by eliding SWAP gates, so qubit i of the 
+        # original circuit is measured on its position in the final layout
+        qubits = range(pauli.num_qubits)
+        if circuit.layout is not None:
+            qubits = circuit.layout.final_index_layout()[:pauli.num_qubits]
 
-        # Add measurements
-        meas_circuit.measure_all()
+        # Clone the circuit and append the measurement register of measure_all
+        meas_circuit = circuit.copy()
+        meas_circuit.add_register(ClassicalRegister(pauli.num_qubits, "meas"))
+        meas_circuit.compose(suffix, qubits=qubits,
+                             clbits=meas_circuit.clbits[-pauli.num_qubits:], inplace=True)
         return meas_circuit
 
-    def _compute_expectation(self, counts, pauli: SparsePauliOp) -> float:
+    def _compute_expectations(self, counts: PackedCounts, paulis: PauliList,
+                              masks: Optional[np.ndarray] = None) -> np.ndarray:
         """
-        Compute the expectation value of a Pauli observable from measurement results.
+        Compute the expectation values of Pauli observables from measurement results.
 
         Parameters
         ----------
-        counts : qristal.core.MapVectorBoolInt
-            A dictionary mapping measured bitstrings to counts as returned by qristal.core.session.results.
-        pauli : qiskit.quantum_info.SparsePauliOp
-            The Pauli observable for which to compute the expectation value.
+        counts : PackedCounts
+            Counts measured in a basis that diagonalizes all of the given Pauli observables.
+        paulis : qiskit.quantum_info.PauliList
+            The Pauli observables for which to compute the expectation values.
+        masks : numpy.ndarray, optional
+            The parity masks of paulis (see _pauli_masks). Built if not given.
 
         Returns
         -------
-        float
-            The computed expectation value.
-        """
-        # Compute expectation value from counts
-        total_shots = counts.total_counts()
-        expectation = 0.0
-        for bitvec in counts:
-            parity = 1
-            for idx, bit in enumerate(reversed(bitvec)):
-                if pauli.to_label()[idx] in ['X', 'Y', 'Z'] and bit == 1:
-                    parity *= -1
-            expectation += parity * counts[bitvec] / total_shots
-        return expectation
\ No newline at end of file
+        numpy.ndarray
+            The computed expectation values.
+        """
+        if masks is None:
+            masks = _pauli_masks(paulis, counts.num_bits)
+        return counts.expectation_values(masks)
+
+
+class QristalSamplerV2(BaseSamplerV2):
+    """
+    A custom implementation of a quantum circuit sampler based on qiskit's BaseSamplerV2 
+    for arbitrary Qristal backends. 
+
+    Each primitive unified bloc (PUB) is executed with one transpilation of its circuit. Identical 
+    parameter bindings within a PUB are executed once and share their samples.
+    """
+
+    def __init__(self, qristal_sampler: QristalSampler, default_shots: Optional[int] = None):
+        """
+        Initialize the QristalSamplerV2 from an arbitrary QristalSampler, sharing its caches.
+
+        Parameters
+        ----------
+        qristal_sampler : QristalSampler 
+            An instance of a QristalSampler object.
+        default_shots : int, optional
+            Number of shots used for PUBs that do not specify them. Defaults to the number of shots 
+            of the Qristal session.
+        """
+        self.qristal_sampler = qristal_sampler
+        self._default_shots = default_shots
+
+    @property
+    def default_shots(self) -> Optional[int]:
+        """The number of shots used for PUBs that do not specify them."""
+        return self._default_shots
+
+    def run(self, pubs: Iterable, *, shots: Optional[int] = None) -> QristalJob:
+        """
+        Sample a batch of primitive unified blocs.
+
+        Parameters
+        ----------
+        pubs : iterable[SamplerPubLike]
+            Circuits, optionally with N-dimensional parameter values and a number of shots.
+        shots : int, optional
+            Number of shots for PUBs that do not specify them.
+
+        Returns
+        -------
+        QristalJob
+            A job object returning a PrimitiveResult with one SamplerPubResult per PUB.
+        """
+        if shots is None:
+            shots = self._default_shots
+        coerced_pubs = [SamplerPub.coerce(pub, shots) for pub in pubs]
+        job = QristalJob(self._run, coerced_pubs, executor=self.qristal_sampler.executor)
+        job._submit()
+        return job
+
+    def _run(self, job: QristalJob, pubs: List[SamplerPub]) -> PrimitiveResult:
+        return PrimitiveResult([self._run_pub(job, pub) for pub in pubs], metadata={"version": 2})
+
+    def _run_pub(self, job: QristalJob, pub: SamplerPub) -> SamplerPubResult:
+        """
+        Sample a single PUB.
+
+        Parameters
+        ----------
+        job : QristalJob
+            The job executing the PUB.
+        pub : qiskit.primitives.containers.sampler_pub.SamplerPub
+            The PUB to sample.
+
+        Returns
+        -------
+        qiskit.primitives.SamplerPubResult
+            One BitArray of shape pub.shape per classical register. If the QristalSampler has a 
+            profiler, the metadata holds the total duration of every stage ("timings").
+        """
+        circuit = pub.circuit
+        shots = pub.shots if pub.shots is not None else self.qristal_sampler.qristal_session.sn
+        registers = {creg.name: [circuit.find_bit(clbit).index for clbit in creg] for creg in circuit.cregs}
+        rows, inverse = _unique_parameter_rows(pub.parameter_values, circuit.parameters)
+
+        sampler = self.qristal_sampler
+        timings = {} if sampler.profiler is not None else None
+
+        # Execute every distinct binding once
+        def _execute(row):
+            job.check_cancelled()
+            with sampler._collect(timings):
+                bound_circuit = sampler._bind_transpiled(circuit, row)
+                bits = sampler._sample(sampler._dumps(bound_circuit), shots).to_bit_matrix()
+            return {name: _pack_register(bits, clbits) for name, clbits in registers.items()}
+        samples = sampler._map(_execute, rows)
+
+        meas = {}
+        for name, clbits in registers.items():
+            array = np.stack([samples[i][name] for i in inverse])
+            meas[name] = BitArray(array.reshape(pub.shape + array.shape[1:]), len(clbits))
+        metadata = {"shots": shots, "circuit_metadata": circuit.metadata}
+        if timings is not None:
+            metadata["timings"] = timings
+        return SamplerPubResult(DataBin(**meas, shape=pub.shape), metadata=metadata)
+
+class QristalEstimatorV2(BaseEstimatorV2):
+    """
+    A custom implementation of a quantum circuit estimator based on qiskit's BaseEstimatorV2 
+    for arbitrary Qristal backends.
+
+    Parameter bindings and observables of each primitive unified bloc (PUB) are broadcast against 
+    each other. Every distinct binding is executed once, measuring the union of the Pauli terms of 
+    all observables it is paired with.
+    """
+
+    def __init__(self, qristal_sampler: QristalSampler, grouping: Optional[str] = "qubit_wise",
+                 default_precision: float = 0.0, executor: Optional[Executor] = None,
+                 deterministic: bool = False):
+        """
+        Initialize the QristalEstimatorV2 from an arbitrary QristalSampler.
+
+        Parameters
+        ----------
+        qristal_sampler : QristalSampler 
+            An instance of a QristalSampler object.
+        grouping : str, optional
+            Strategy used to partition observables into measurement bases (see QristalEstimator).
+        default_precision : float, optional
+            Target precision for PUBs that do not specify one. Each measurement circuit is executed 
+            with ceil(1 / precision**2) shots, or with the shots of the Qristal session if the 
+            precision is 0.
+        executor : concurrent.futures.Executor, optional
+            The executor running jobs. Defaults to the executor of the QristalSampler.
+        deterministic : bool, optional
+            If True, expectation values are evaluated exactly from statevectors (see 
+            QristalEstimator) and the precision is ignored.
+        """
+        self.qristal_estimator = QristalEstimator(qristal_sampler, grouping=grouping, executor=executor,
+                                                  deterministic=deterministic)
+        self._default_precision = default_precision
+
+    @property
+    def default_precision(self) -> float:
+        """The target precision used for PUBs that do not specify one."""
+        return self._default_precision
+
+    def run(self, pubs: Iterable, *, precision: Optional[float] = None) -> QristalJob:
+        """
+        Estimate expectation values for a batch of primitive unified blocs.
+
+        Parameters
+        ----------
+        pubs : iterable[EstimatorPubLike]
+            Circuits with N-dimensional observable arrays, optionally with N-dimensional parameter 
+            values and a target precision.
+        precision : float, optional
+            Target precision for PUBs that do not specify one.
+
+        Returns
+        -------
+        QristalJob
+            A job object returning a PrimitiveResult with one PubResult per PUB.
+        """
+        if precision is None:
+            precision = self._default_precision
+        coerced_pubs = [EstimatorPub.coerce(pub, precision) for pub in pubs]
+        job = QristalJob(self._run, coerced_pubs, executor=self.qristal_estimator.executor)
+        job._submit()
+        return job
+
+    def _run(self, job: QristalJob, pubs: List[EstimatorPub]) -> PrimitiveResult:
+        return PrimitiveResult([self._run_pub(job, pub) for pub in pubs], metadata={"version": 2})
+
+    def _run_pub(self, job: QristalJob, pub: EstimatorPub) -> PubResult:
+        """
+        Estimate the expectation values of a single PUB.
+
+        Parameters
+        ----------
+        job : QristalJob
+            The job executing the PUB.
+        pub : qiskit.primitives.containers.estimator_pub.EstimatorPub
+            The PUB to evaluate.
+
+        Returns
+        -------
+        qiskit.primitives.PubResult
+            Expectation values (evs) and their standard errors (stds) of shape pub.shape. If the 
+            QristalSampler has a profiler, the metadata holds the total duration of every stage 
+            ("timings").
+        """
+        circuit = pub.circuit
+        shots = None if not pub.precision else int(np.ceil(1.0 / pub.precision**2))
+        rows, inverse = _unique_parameter_rows(pub.parameter_values, circuit.parameters)
+        row_index, observables = np.broadcast_arrays(inverse.reshape(pub.parameter_values.shape),
+                                                     np.asarray(pub.observables, dtype=object))
+
+        # Collect the Pauli terms required for every distinct binding
+        terms = [{} for _ in rows]
+        for index in np.ndindex(*pub.shape):
+            row_terms = terms[row_index[index]]
+            for label in observables[index]:
+                row_terms.setdefault(label, len(row_terms))
+
+        # Execute every distinct binding once, then combine terms into observables
+        estimator = self.qristal_estimator
+        sampler = estimator.qristal_sampler
+        timings = {} if sampler.profiler is not None else None
+        paulis = [PauliList(list(row_terms) or ["I" * circuit.num_qubits]) for row_terms in terms]
+        if estimator.deterministic:
+            term_values = []
+            for row, row_paulis in zip(rows, paulis):
+                job.check_cancelled()
+                with sampler._collect(timings):
+                    term_values.append(estimator._exact_term_values(circuit, row_paulis, row))
+        else:
+            groups = [estimator._measurement_groups(row_paulis) for row_paulis in paulis]
+            counts = estimator._run_measurements(
+                [(circuit, row_groups, row, shots) for row, row_groups in zip(rows, groups)], job,
+                None if timings is None else [timings] * len(rows)
+            )
+            with sampler._collect(timings), sampler._span("post_processing", num_terms=sum(map(len, paulis))):
+                term_values = [estimator._term_values(row_groups, row_counts, len(row_paulis))
+                               for row_groups, row_counts, row_paulis in zip(groups, counts, paulis)]
+        evs = np.zeros(pub.shape)
+        stds = np.zeros(pub.shape)
+        for index in np.ndindex(*pub.shape):
+            row = row_index[index]
+            coeffs = np.zeros(len(paulis[row]))
+            for label, coeff in observables[index].items():
+                coeffs[terms[row][label]] += coeff
+            evs[index] = np.dot(coeffs, term_values[row])
+            if not estimator.deterministic:
+                stds[index] = np.sqrt(estimator._variance(groups[row], counts[row], coeffs))
+        if estimator.deterministic:
+            shots = 0
+        elif shots is None:
+            shots = estimator.qristal_sampler.qristal_session.sn
+
+        metadata = {"target_precision": pub.precision, "shots": shots, "circuit_metadata": circuit.metadata}
+        if timings is not None:
+            metadata["timings"] = timings
+        return PubResult(DataBin(evs=evs, stds=stds, shape=pub.shape), metadata=metadata)
@@ -0,0 +1,87 @@
+# Unit tests of PauliTable in nextflow/q_chemistry
+import os
+import sys
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "nextflow", "q_chemistry"))
+
+def table_terms(table):
+    return {(int(x), int(z)): coeff for x, z, coeff in zip(table.x_masks, table.z_masks, table.coeffs)}
+
+def qubit_operator_terms(operator, tol=1e-12):
+    """ Terms of an OpenFermion QubitOperator with coefficients above tol, keyed by their X and Z masks """
+    terms = {}
+    for term, coeff in operator.terms.items():
+        if abs(coeff) > tol:
+            assert abs(coeff.imag) < 1e-12
+            x = sum(1 << q for q, pauli in term if pauli in "XY")
+            z = sum(1 << q for q, pauli in term if pauli in "ZY")
+            terms[(x, z)] = coeff.real
+    return terms
+
+def assert_jordan_wigner(operator):
+    import openfermion as of
+    from pauli_table import PauliTable
+
+    table = PauliTable.from_interaction_operator(operator)
+    expected = qubit_operator_terms(of.jordan_wigner(of.get_fermion_operator(operator)))
+    terms = table_terms(table)
+    assert terms.keys() == expected.keys()
+    for key, coeff in expected.items():
+        assert terms[key] == pytest.approx(coeff, abs=1e-12)
+
+def test_from_interaction_operator_h2():
+    import openfermionpyscf as ofpyscf
+
+    geometry = [("H", (0.0, 0.0, 0.0)), ("H", (0.1, 0.05, 0.74))]
+    assert_jordan_wigner(ofpyscf.generate_molecular_hamiltonian(geometry, 'sto-3g', 1, 0))
+
+def test_from_interaction_operator_random():
+    import openfermion as of
+
+    operator = of.random_interaction_operator(3, expand_spin=True, real=False, seed=11)
+    assert_jordan_wigner(operator)
+
+def test_from_interaction_operator_tolerance():
+    import openfermion as of
+    from pauli_table import PauliTable
+
+    # every integral is below tol, their sum in the identity term is not
+    n_qubits = 8
+    operator = of.InteractionOperator(0.0, np.diag(np.full(n_qubits, 8e-13)),
+                                      np.zeros((n_qubits,) * 4))
+    table = PauliTable.from_interaction_operator(operator)
+    assert table_terms(table) == pytest.approx({(0, 0): 3.2e-12}, abs=1e-20)
+
+def test_string_round_trip():
+    from pauli_table import PauliTable
+
+    ham = "-0.5  +0.25 X0 Y1 +0.1 Z0 +-0.75 Y2 Z3"
+    table = PauliTable.from_string(ham)
+    assert len(table) == 4
+    assert table.n_qubits == 4
+    assert table_terms(table) == {(0, 0): -0.5, (0b11, 0b10): 0.25, (0, 1): 0.1, (0b100, 0b1100): -0.75}
+    assert PauliTable.from_string(table.to_string()).to_string() == table.to_string()
+    assert table_terms(PauliTable.from_string(table.to_string())) == table_terms(table)
+
+    shifted = table.shift(2)
+    assert shifted.n_qubits == 6
+    assert shifted.to_string() == "-0.5  +0.25 X2 Y3 +0.1 Z2 +-0.75 Y4 Z5"
+
+    empty = PauliTable.from_string("0")
+    assert len(empty) == 0 and empty.n_qubits == 0
+    assert empty.to_string() == "0"
+    with pytest.raises(ValueError):
+        table.shift(61)
+
+def test_simplify():
+    from pauli_table import PauliTable
+
+    table = PauliTable([1, 0, 1, 2], [0, 0, 0, 2], [0.5, 1.0, 0.25, 1e-13]).simplify()
+    assert table_terms(table) == {(0, 0): 1.0, (1, 0): 0.75}
+    # the identity first
+    assert table.x_masks[0] == 0 and table.z_masks[0] == 0
+    # tables are immutable
+    with pytest.raises(ValueError):
+        table.coeffs[0] = 2.0
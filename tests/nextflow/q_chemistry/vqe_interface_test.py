@@ -0,0 +1,235 @@
+# Unit tests of the VQE ASE calculator of the QM/MM example in nextflow/q_chemistry
+import os
+import sys
+import json
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "nextflow", "q_chemistry"))
+
+# H2 and two point charges, positions in Angstrom
+H2_POSITIONS = [[0.0, 0.0, 0.0], [0.1, 0.05, 0.74]]
+CHARGES = [0.8, -0.4]
+CHARGE_POSITIONS = [[2.0, 1.0, 0.0], [-1.5, 0.3, 1.0]]
+
+@pytest.fixture
+def exact_vqee(monkeypatch):
+    """Replace vqee by exact expectations in a fixed 4-qubit state. Returns the list of evaluated Hamiltonians."""
+    import openfermion as of
+    import vqe_interface
+
+    rng = np.random.default_rng(7)
+    state = rng.normal(size=16) + 1j * rng.normal(size=16)
+    state /= np.linalg.norm(state)
+    calls = []
+
+    def run_vqee(ham = "0", **kwargs):
+        ham = vqe_interface.vqee_pauli_string(ham)
+        calls.append(ham)
+        operator = of.QubitOperator()
+        for term in ham.split(" +"):
+            tokens = term.split()
+            operator += of.QubitOperator(" ".join(tokens[1:]), float(tokens[0]))
+        matrix = of.get_sparse_operator(operator, n_qubits=4).toarray()
+        return (state.conj() @ matrix @ state).real, [0.0]
+
+    monkeypatch.setattr(vqe_interface, "run_vqee", run_vqee)
+    return calls
+
+def h2_calculator(**kwargs):
+    from ase import Atoms
+    from vqe_interface import VQE
+
+    calc = VQE(basis='sto3g', vqe_params={'in_profile': [None]}, **kwargs)
+    pc = calc.embed(CHARGES)
+    pc.set_positions(CHARGE_POSITIONS)
+    atoms = Atoms('HH', positions=H2_POSITIONS)
+    atoms.calc = calc
+    return atoms, pc
+
+def test_batch_forces(exact_vqee):
+    atoms, pc = h2_calculator()
+    forces = atoms.get_forces()
+    pc_forces = pc.get_forces(atoms.calc)
+    exact_vqee.clear()
+
+    atoms, pc = h2_calculator(batch_forces=True)
+    atoms.get_potential_energy()
+    exact_vqee.clear()
+    # the derivative hamiltonians have more distinct terms than there are hamiltonians
+    assert atoms.get_forces() == pytest.approx(forces, abs=1e-10)
+    assert len(exact_vqee) == 6
+    exact_vqee.clear()
+    assert pc.get_forces(atoms.calc) == pytest.approx(pc_forces, abs=1e-10)
+    assert len(exact_vqee) == 6
+
+def test_batch_terms(exact_vqee):
+    from vqe_interface import VQE
+
+    calc = VQE(vqe_params={'in_profile': [None]})
+    calc.optimized_theta = [0.0]
+    hams = ["0.5 Z0 +0.25 X1 Y2", "-0.75  +1.5 Z0", "0.3 X1 Y2 +-0.2 Z0 +0.1 ", "0", "2.0 "]
+    expected = [calc.evaluate_VQE(ham) for ham in hams]
+    exact_vqee.clear()
+    # every distinct Pauli term is evaluated once, on its own
+    assert calc.evaluate_VQE_batch(hams) == pytest.approx(expected, abs=1e-12)
+    assert sorted(exact_vqee) == ["1.0 X1 Y2", "1.0 Z0"]
+
+def test_batch_energy_results(tmp_path):
+    from vqe_interface import get_batch_energy_results
+
+    class ProcessExecution:
+        def __init__(self, name, energy):
+            self.name = name
+            self.output = tmp_path / name.replace(".json", "") / "vqeecalc_output.json"
+            self.output.parent.mkdir()
+            self.output.write_text(json.dumps({"energy": energy, "theta": [0.0]}))
+        def input_data(self, include_path=True):
+            return [self.name]
+        def all_output_data(self, include_path=True):
+            return [str(self.output)]
+
+    class Execution:
+        # process executions complete in any order
+        process_executions = [ProcessExecution("b_1.json", -0.5), ProcessExecution("b_0.json", 0.25)]
+
+    inputs = ["b_0.json", "b_1.json"]
+    assert get_batch_energy_results(Execution(), "vqeecalc_output.json", inputs) == [0.25, -0.5]
+    with pytest.raises(RuntimeError):
+        get_batch_energy_results(Execution(), "vqeecalc_output.json", inputs + ["b_2.json"])
+
+@pytest.mark.parametrize("point_charges", [False, True])
+def test_analytic_grad_integrals(point_charges):
+    import openfermion as of
+    from pyscf import grad
+    from vqe_interface import VQE
+
+    calc = VQE(basis='sto6g')
+    if point_charges:
+        pc = calc.embed(CHARGES)
+        pc.set_positions(CHARGE_POSITIONS)
+    calc.molecule = of.MolecularData(list(zip("HH", H2_POSITIONS)), 'sto6g', 1, 0)
+    calc.get_integrals(calc.molecule)
+    grad_integrals = calc.analytic_grad_integrals(calc.molecule)
+    for atm_id, (one_body_integrals, two_body_integrals) in enumerate(grad_integrals):
+        fd_one_body, fd_two_body = calc.fd_grad_integrals(calc.molecule, atm_id)
+        for i in range(3):
+            assert one_body_integrals[i] == pytest.approx(fd_one_body[i], abs=1e-6)
+            assert two_body_integrals[i] == pytest.approx(fd_two_body[i], abs=1e-6)
+
+    # nuclear repulsion, including the point charges, as in get_grad_hamiltonians
+    mol = calc.molecule._pyscf_data['mol']
+    grad_nn = grad.rhf.grad_nuc(mol)
+    if point_charges:
+        grad_nn += pc.get_ngrad_nn(mol, calc)
+
+    def energy_nn(coords):
+        displaced = mol.copy()
+        displaced.set_geom_(coords, unit='Bohr')
+        energy = displaced.energy_nuc()
+        if point_charges:
+            for charge, position in zip(pc.q_p, pc.R_pv):
+                energy += np.sum(charge * displaced.atom_charges() / np.linalg.norm(coords - position, axis=1))
+        return energy
+
+    h = 1e-5
+    coords = mol.atom_coords()
+    for atm_id in range(mol.natm):
+        for i in range(3):
+            step = np.zeros_like(coords)
+            step[atm_id, i] = h
+            fd = (energy_nn(coords + step) - energy_nn(coords - step)) / (2*h)
+            assert grad_nn[atm_id, i] == pytest.approx(fd, abs=1e-7)
+
+def test_cache():
+    import openfermion as of
+    from vqe_interface import VQE, CACHE_DECIMALS
+
+    calc = VQE(basis='sto3g', cache_size=2)
+    pc = calc.embed(CHARGES)
+    pc.set_positions(CHARGE_POSITIONS)
+    molecule = of.MolecularData(list(zip("HH", H2_POSITIONS)), 'sto3g', 1, 0)
+    key = calc.cache_key(molecule)
+    # coordinates are rounded, -0.0 and 0.0 are the same
+    assert calc.cache_key(of.MolecularData([("H", [-0.0, 0.0, 0.1**(CACHE_DECIMALS + 2)]), ("H", H2_POSITIONS[1])],
+                                           'sto3g', 1, 0)) == key
+    assert calc.cache_key(molecule, 1, np.array([0., 0., 0.])) == key
+    # changed geometry, basis or point charges
+    assert calc.cache_key(molecule, 1, np.array([0., 0., 1e-3])) != key
+    assert calc.cache_key(of.MolecularData(molecule.geometry, 'sto6g', 1, 0)) != key
+    pc.set_positions(np.array(CHARGE_POSITIONS) + 1e-3)
+    assert calc.cache_key(molecule) != key
+    pc.set_positions(CHARGE_POSITIONS)
+    pc.q_p[0] += 0.1
+    assert calc.cache_key(molecule) != key
+    pc.q_p[0] -= 0.1
+    assert calc.cache_key(molecule) == key
+
+    calls = []
+    def compute(value):
+        calls.append(value)
+        return value
+    assert calc.cached(("a",), lambda: compute(1)) == 1
+    assert calc.cached(("a",), lambda: compute(2)) == 1
+    assert calls == [1]
+    # least recently used entries are evicted beyond cache_size
+    calc.cached(("b",), lambda: compute(3))
+    calc.cached(("a",), lambda: compute(4))
+    calc.cached(("c",), lambda: compute(5))
+    assert list(calc._cache) == [("a",), ("c",)]
+    assert calc.cached(("b",), lambda: compute(6)) == 6
+    assert calls == [1, 3, 5, 6]
+    calc.clear_cache()
+    assert len(calc._cache) == 0
+
+    # cached integrals are returned as copies
+    one_body, _ = calc.get_integrals(molecule)
+    one_body += 1.0
+    assert calc.get_integrals(molecule)[0] == pytest.approx(one_body - 1.0)
+    # without cache
+    calc = VQE(basis='sto3g', cache_size=0)
+    calc.cached(("a",), lambda: compute(7))
+    assert len(calc._cache) == 0
+
+def test_initial_theta():
+    from vqe_interface import VQE
+
+    positions = np.array(H2_POSITIONS)
+    step = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.02]])
+    calc = VQE()
+    # no history
+    assert calc.initial_theta(positions, [0.5, 0.5]) is None
+
+    # reuse of the previous theta at a nearby geometry
+    calc.theta_history = [(positions, [0.1, 0.2])]
+    assert calc.initial_theta(positions + 0.01, [0.5, 0.5]) == [0.1, 0.2]
+    # not for a different number of atoms or parameters
+    assert calc.initial_theta(np.zeros((3, 3)), [0.5, 0.5]) is None
+    assert calc.initial_theta(positions + 0.01, [0.5, 0.5, 0.5]) is None
+
+    # linear extrapolation from the two previous geometries, along the last step
+    calc.theta_history = [(positions, [0.1, 0.2]), (positions + step, [0.2, 0.1])]
+    assert calc.initial_theta(positions + 1.5*step, [0.5, 0.5]) == [0.2, 0.1]
+    calc.set(extrapolate_theta=True)
+    assert calc.initial_theta(positions + 1.5*step, [0.5, 0.5]) == pytest.approx([0.25, 0.05])
+    assert calc.initial_theta(positions + 3*step, [0.5, 0.5]) == pytest.approx([0.4, -0.1])
+    # displacements orthogonal to the last step are not extrapolated
+    orthogonal = np.array([[0.0, 0.0, 0.0], [0.03, 0.0, 0.0]])
+    assert calc.initial_theta(positions + step + orthogonal, [0.5, 0.5]) == pytest.approx([0.2, 0.1])
+
+def test_warm_start(monkeypatch):
+    import vqe_interface
+
+    thetas = []
+    def run_vqee(theta = None, **kwargs):
+        thetas.append(list(theta))
+        return 0.0, [value + 1.0 for value in theta]
+    monkeypatch.setattr(vqe_interface, "run_vqee", run_vqee)
+
+    atoms, _ = h2_calculator(warm_start=True)
+    atoms.calc.parameters['vqe_params']['theta'] = [0.1, 0.2]
+    atoms.get_potential_energy()
+    atoms.positions[1, 2] += 0.01
+    atoms.get_potential_energy()
+    # the default theta without history, then the optimized theta of the previous geometry
+    assert thetas == [[0.1, 0.2], pytest.approx([1.1, 1.2])]
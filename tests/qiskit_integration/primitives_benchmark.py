@@ -0,0 +1,130 @@
+"""
+Throughput benchmarks of the Qristal qiskit primitives, run against the local aer simulator.
+
+The file is not collected by the default test run. Run it explicitly with pytest-benchmark:
+
+    python3 -m pytest primitives_benchmark.py --benchmark-only
+    python3 -m pytest primitives_benchmark.py --benchmark-only --benchmark-save=baseline
+    python3 -m pytest primitives_benchmark.py --benchmark-only --benchmark-compare=0001
+
+End-to-end benchmarks of QristalSampler and QristalEstimator report the number of executed circuits
+per second in their extra_info. The transpile, QASM export, backend and post-processing stages are
+benchmarked separately, grouped by stage.
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import numpy as np
+import qristal.core
+from qiskit.circuit.library import RealAmplitudes
+from qiskit.qasm2 import dumps
+from qiskit.quantum_info import SparsePauliOp
+from qiskit_integration.qristal_primitives import (QristalSampler, QristalEstimator, PackedCounts,
+                                                   _transpile_native)
+
+QUBITS = [2, 4, 8]
+TERMS = [4, 16, 64]
+BATCHES = [1, 8]
+SHOTS = [100, 1000]
+
+def _session(num_qubits, shots):
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = num_qubits
+    sim.sn = shots
+    return sim
+
+def _circuit(num_qubits, measure=False):
+    circuit = RealAmplitudes(num_qubits, reps=2)
+    if measure:
+        circuit.measure_all()
+    return circuit
+
+def _values(circuit, batch):
+    rng = np.random.default_rng(1234)
+    return rng.uniform(-np.pi, np.pi, (batch, circuit.num_parameters))
+
+def _observable(num_qubits, num_terms):
+    rng = np.random.default_rng(num_qubits * num_terms)
+    labels = ["".join(rng.choice(list("IXYZ"), num_qubits)) for _ in range(num_terms)]
+    return SparsePauliOp(labels, rng.normal(size=num_terms)).simplify()
+
+def _record_throughput(benchmark, num_circuits):
+    benchmark.extra_info["circuits"] = num_circuits
+    # No statistics are collected with --benchmark-disable
+    if benchmark.stats is not None:
+        benchmark.extra_info["circuits_per_second"] = num_circuits / benchmark.stats.stats.mean
+
+@pytest.mark.benchmark(group="sampler")
+@pytest.mark.parametrize("shots", SHOTS)
+@pytest.mark.parametrize("batch", BATCHES)
+@pytest.mark.parametrize("num_qubits", QUBITS)
+def test_sampler(benchmark, num_qubits, batch, shots):
+    circuit = _circuit(num_qubits, measure=True)
+    values = _values(circuit, batch)
+    sampler = QristalSampler(_session(num_qubits, shots))
+    benchmark(lambda: sampler.run([circuit] * batch, values).result())
+    _record_throughput(benchmark, batch)
+
+@pytest.mark.benchmark(group="estimator")
+@pytest.mark.parametrize("shots", SHOTS)
+@pytest.mark.parametrize("batch", BATCHES)
+@pytest.mark.parametrize("num_terms", TERMS)
+@pytest.mark.parametrize("num_qubits", QUBITS)
+def test_estimator(benchmark, num_qubits, num_terms, batch, shots):
+    circuit = _circuit(num_qubits)
+    values = _values(circuit, batch)
+    observable = _observable(num_qubits, num_terms)
+    estimator = QristalEstimator(QristalSampler(_session(num_qubits, shots)))
+    num_groups = len(estimator._measurement_groups(observable.paulis))
+    benchmark(lambda: estimator.run([circuit] * batch, [observable] * batch, values).result())
+    _record_throughput(benchmark, batch * num_groups)
+
+@pytest.mark.benchmark(group="transpile")
+@pytest.mark.parametrize("num_qubits", QUBITS)
+def test_transpile(benchmark, num_qubits):
+    circuit = _circuit(num_qubits, measure=True)
+    benchmark(_transpile_native, circuit)
+
+@pytest.mark.benchmark(group="qasm_export")
+@pytest.mark.parametrize("num_qubits", QUBITS)
+def test_qasm_export(benchmark, num_qubits):
+    circuit = _circuit(num_qubits, measure=True)
+    sampler = QristalSampler(_session(num_qubits, 100))
+    bound = sampler._bind_transpiled(circuit, _values(circuit, 1)[0])
+    benchmark(dumps, bound)
+
+@pytest.mark.benchmark(group="backend")
+@pytest.mark.parametrize("shots", SHOTS)
+@pytest.mark.parametrize("num_qubits", QUBITS)
+def test_backend(benchmark, num_qubits, shots):
+    circuit = _circuit(num_qubits, measure=True)
+    sampler = QristalSampler(_session(num_qubits, shots))
+    qasm_str = dumps(sampler._bind_transpiled(circuit, _values(circuit, 1)[0]))
+    benchmark(sampler._send_to_backend, qasm_str)
+    _record_throughput(benchmark, 1)
+
+@pytest.mark.benchmark(group="post_processing")
+@pytest.mark.parametrize("shots", SHOTS)
+@pytest.mark.parametrize("num_terms", TERMS)
+@pytest.mark.parametrize("num_qubits", QUBITS)
+def test_post_processing(benchmark, num_qubits, num_terms, shots):
+    circuit = _circuit(num_qubits)
+    observable = _observable(num_qubits, num_terms)
+    estimator = QristalEstimator(QristalSampler(_session(num_qubits, shots)))
+    groups = estimator._measurement_groups(observable.paulis)
+    bound = estimator.qristal_sampler._bind_transpiled(circuit, _values(circuit, 1)[0])
+    results = []
+    for group in groups:
+        if group.suffix is not None:
+            meas_circuit = estimator._prepare_measurement_circuit(bound, group.basis, group.suffix)
+            results.append(estimator.qristal_sampler._send_to_backend(dumps(meas_circuit)))
+
+    def _post_process():
+        counts = [PackedCounts.from_qristal(group_results) for group_results in results]
+        counts_iter = iter(counts)
+        group_counts = [next(counts_iter) if group.suffix is not None else None for group in groups]
+        return estimator._term_values(groups, group_counts, len(observable)) @ observable.coeffs.real
+
+    benchmark(_post_process)
@@ -9,4 +9,381 @@ def test_QAOA():
 def test_VQE(): 
     from qiskit_integration.vqe_example import main 
     result = main() 
-    assert result.total_energies[0] == pytest.approx(-1.137306, abs=7.5e-3)
\ No newline at end of file
+    assert result.total_energies[0] == pytest.approx(-1.137306, abs=7.5e-3)
+
+def test_estimator_grouping():
+    import qristal.core
+    from qiskit import QuantumCircuit
+    from qiskit.quantum_info import SparsePauliOp
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalEstimator
+
+    # |+>|1> is an eigenstate of every term below
+    circuit = QuantumCircuit(2)
+    circuit.x(0)
+    circuit.h(1)
+    observable = SparsePauliOp.from_list([("IZ", 0.5), ("XI", -1.5), ("XZ", 2.0), ("II", 0.25)])
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    sampler = QristalSampler(sim)
+    grouped = QristalEstimator(sampler).run([circuit], [observable]).result()
+    ungrouped = QristalEstimator(sampler, grouping=None).run([circuit], [observable]).result()
+    assert grouped.values[0] == pytest.approx(-3.75)
+    assert ungrouped.values[0] == pytest.approx(-3.75)
+
+
+def test_packed_counts():
+    import numpy as np
+    from qiskit.quantum_info import PauliList
+    from qiskit_integration.qristal_primitives import PackedCounts, _pauli_masks
+
+    class Results(dict):
+        def total_counts(self):
+            return sum(self.values())
+
+    # Bit i of each key is classical bit i; 70 bits span two packed words
+    results = Results({(True,) + (False,) * 67 + (True, False): 30, (False,) * 69 + (True,): 10})
+    counts = PackedCounts.from_qristal(results)
+    assert counts.int_keys() == [1 + (1 << 68), 1 << 69]
+    assert counts.probabilities().tolist() == [0.75, 0.25]
+
+    # Two-qubit Paulis act on the last two classical bits, with qubit 0 on bit 68
+    masks = _pauli_masks(PauliList(["IZ", "ZI", "ZZ", "II"]), counts.num_bits)
+    assert np.allclose(counts.expectation_values(masks), [-0.5, 0.5, -1.0, 1.0])
+
+def test_result_cache():
+    import numpy as np
+    import qristal.core
+    from types import SimpleNamespace
+    from qiskit import QuantumCircuit
+    from qiskit_integration.qristal_primitives import (QristalSampler, QristalResultCache, QristalSessionPool,
+                                                       PackedCounts)
+
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    circuit.measure_all()
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    cache = QristalResultCache(":memory:")
+    sampler = QristalSampler(sim, result_cache=cache)
+    first = sampler.run([circuit]).result().quasi_dists[0]
+    second = sampler.run([circuit]).result().quasi_dists[0]
+    assert first == second
+    assert len(cache) == 1
+
+    # Results of unseeded sessions are not cached in deterministic-only mode
+    assert QristalResultCache(":memory:", deterministic_only=True).key("", sim) is None
+
+    # Least recently used results are evicted first
+    counts = PackedCounts(np.zeros((1, 1), dtype=np.uint64), np.array([1]), 1)
+    cache.put("a", counts)
+    size = cache._connection.execute("SELECT size FROM results WHERE key = 'a'").fetchone()[0]
+    cache.max_size_bytes = 2 * size
+    cache.put("b", counts)
+    cache.get("a")
+    cache.put("c", counts)
+    assert cache.get("a") is not None and cache.get("b") is None and cache.get("c") is not None
+
+    # Keys cover every setting copied to pooled sessions, including the noise model
+    assert QristalResultCache.SESSION_ATTRIBUTES == QristalSessionPool.SESSION_ATTRIBUTES
+
+    class NoiseModel:
+        def __init__(self, name):
+            self.name = name
+        def to_json(self):
+            return self.name
+
+    noisy = SimpleNamespace(acc="aer", qn=2, sn=100, noise=True, noise_model=NoiseModel("default"))
+    key = cache.key("qasm", noisy)
+    assert cache.key("qasm", SimpleNamespace(**vars(noisy))) == key
+    noisy.noise_model = NoiseModel("qb-nm1")
+    assert cache.key("qasm", noisy) != key
+
+def test_primitives_v2():
+    import numpy as np
+    import qristal.core
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import Parameter
+    from qiskit.quantum_info import SparsePauliOp
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalSamplerV2, QristalEstimatorV2
+
+    theta = Parameter("theta")
+    circuit = QuantumCircuit(2)
+    circuit.x(0)
+    circuit.ry(theta, 1)
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    sampler = QristalSampler(sim)
+
+    # Parameter values of shape (3, 1) broadcast against observables of shape (2,)
+    observables = [SparsePauliOp("ZI"), SparsePauliOp.from_list([("IZ", 2.0), ("II", 0.5)])]
+    values = np.array([[0.0], [np.pi], [0.0]]).reshape(3, 1, 1)
+    result = QristalEstimatorV2(sampler).run([(circuit, observables, values)]).result()[0]
+    assert result.data.evs.shape == (3, 2)
+    assert np.allclose(result.data.evs, [[1.0, -1.5], [-1.0, -1.5], [1.0, -1.5]])
+
+    measured = circuit.copy()
+    measured.measure_all()
+    result = QristalSamplerV2(sampler).run([(measured, [[0.0], [np.pi]])], shots=50).result()[0]
+    assert result.data.meas.shape == (2,)
+    assert result.data.meas.num_shots == 50
+    assert result.data.meas[0].get_counts() == {"01": 50}
+    assert result.data.meas[1].get_counts() == {"11": 50}
+
+def test_job_executor():
+    import threading
+    import qristal.core
+    from concurrent.futures import ThreadPoolExecutor
+    from qiskit import QuantumCircuit
+    from qiskit.providers import JobStatus
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalEstimator
+
+    circuit = QuantumCircuit(2)
+    circuit.x(0)
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    executor = ThreadPoolExecutor(max_workers=1)
+    estimator = QristalEstimator(QristalSampler(sim, executor=executor))
+
+    # Jobs queue on the shared executor while it is busy
+    release = threading.Event()
+    executor.submit(release.wait)
+    cancelled = estimator.run([circuit], ["IZ"])
+    queued = estimator.run([circuit], ["IZ"])
+    assert cancelled.cancel()
+    assert cancelled.status() == JobStatus.CANCELLED
+    release.set()
+    assert queued.result().values[0] == pytest.approx(-1.0)
+    assert queued.status() == JobStatus.DONE
+    executor.shutdown()
+
+def test_session_pool():
+    import qristal.core
+    from qiskit import QuantumCircuit
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalSessionPool
+
+    circuits = []
+    for qubit in range(2):
+        circuit = QuantumCircuit(2)
+        circuit.x(qubit)
+        circuit.measure_all()
+        circuits.append(circuit)
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    pool = QristalSessionPool.clone(sim, 4)
+    assert len(pool) == 4
+    assert all(session.sn == 100 and session.acc == "aer" for session in pool.sessions)
+
+    # Results are returned in the order of the circuits
+    result = QristalSampler(pool).run(circuits * 3).result()
+    assert result.quasi_dists == [{1: 1.0}, {2: 1.0}] * 3
+    pool.close()
+
+def test_shot_budget():
+    import qristal.core
+    from qiskit import QuantumCircuit
+    from qiskit.quantum_info import SparsePauliOp
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalEstimator
+
+    # |+>|1> is an eigenstate of every term below
+    circuit = QuantumCircuit(2)
+    circuit.x(0)
+    circuit.h(1)
+    observable = SparsePauliOp.from_list([("IZ", 3.0), ("XI", -1.0), ("II", 0.25)])
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    sampler = QristalSampler(sim)
+
+    # Shots are distributed proportionally to the coefficient magnitudes of the groups
+    result = QristalEstimator(sampler, grouping=None, shot_budget=400).run([circuit], [observable]).result()
+    assert result.values[0] == pytest.approx(-3.75)
+    assert result.metadata[0]["shots"] == 400
+    assert result.metadata[0]["group_shots"] == [300, 100, 0]
+    assert result.metadata[0]["std_error"] == pytest.approx(0.0)
+
+    # The remaining budget is allocated after the pilot round
+    estimator = QristalEstimator(sampler, grouping=None, shot_budget=400, pilot_shots=50)
+    result = estimator.run([circuit], [observable]).result()
+    assert result.values[0] == pytest.approx(-3.75)
+    assert result.metadata[0]["shots"] == 400
+
+def test_deterministic_estimator():
+    import numpy as np
+    import qristal.core
+    from qiskit.circuit.library import RealAmplitudes
+    from qiskit.quantum_info import SparsePauliOp, Statevector
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalEstimator
+
+    circuit = RealAmplitudes(3, reps=1)
+    values = np.linspace(0.1, 1.2, circuit.num_parameters)
+    observable = SparsePauliOp.from_list([("XYZ", 0.5), ("ZZI", 1.2), ("YYI", -0.7), ("III", 0.3)])
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 3
+    sim.sn = 100
+    estimator = QristalEstimator(QristalSampler(sim), deterministic=True)
+    result = estimator.run([circuit], [observable], [values]).result()
+    expected = Statevector(circuit.assign_parameters(values)).expectation_value(observable).real
+    assert result.values[0] == pytest.approx(expected, abs=1e-12)
+    assert result.metadata[0]["std_error"] == 0.0
+    # No measurement plans are built for the statevector path
+    assert len(estimator._plan_cache) == 0
+
+def test_estimator_gradient():
+    import numpy as np
+    import qristal.core
+    from qiskit.circuit.library import RealAmplitudes
+    from qiskit.quantum_info import SparsePauliOp, Statevector
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalEstimator
+    from qiskit_integration.qristal_gradients import QristalEstimatorGradient
+
+    circuit = RealAmplitudes(2, reps=1)
+    values = np.linspace(0.1, 1.2, circuit.num_parameters)
+    observable = SparsePauliOp.from_list([("XZ", 0.5), ("ZZ", 1.2), ("YI", -0.7)])
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    estimator = QristalEstimator(QristalSampler(sim), deterministic=True)
+    result = QristalEstimatorGradient(estimator).run([circuit] * 2, [observable] * 2, [values] * 2).result()
+
+    def energy(x):
+        return Statevector(circuit.assign_parameters(x)).expectation_value(observable).real
+    step = 1e-6
+    expected = [(energy(values + step * e) - energy(values - step * e)) / (2 * step)
+                for e in np.identity(len(values))]
+    for gradient in result.gradients:
+        assert np.allclose(gradient, expected, atol=1e-6)
+
+def test_measurement_plan():
+    import qristal.core
+    from qiskit import QuantumCircuit
+    from qiskit.quantum_info import SparsePauliOp
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalEstimator
+
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+    observable = SparsePauliOp.from_list([("XX", 1.0), ("YY", 2.0), ("ZZ", 3.0), ("II", 0.5)])
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    estimator = QristalEstimator(QristalSampler(sim))
+    groups = estimator._measurement_groups(observable.paulis)
+    assert estimator._measurement_groups(observable.paulis) is groups
+    for group in groups:
+        if group.suffix is not None:
+            assert set(group.suffix.count_ops()) <= {"rx", "ry", "cz", "barrier", "measure"}
+    # The Bell state is an eigenstate of every term
+    result = estimator.run([circuit] * 2, [observable] * 2).result()
+    assert list(result.values) == pytest.approx([2.5, 2.5])
+
+def test_profiler(tmp_path):
+    import json
+    import qristal.core
+    from qiskit import QuantumCircuit
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalEstimator, QristalProfiler
+
+    circuit = QuantumCircuit(2)
+    circuit.h(0)
+    circuit.cx(0, 1)
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    profiler = QristalProfiler()
+    spans = []
+    profiler.add_callback(spans.append)
+    sampler = QristalSampler(sim, profiler=profiler)
+    result = sampler.run([circuit.measure_all(inplace=False)]).result()
+    assert {"transpile", "qasm_export", "backend", "counts_conversion"} <= set(result.metadata[0]["timings"])
+    result = QristalEstimator(sampler).run([circuit], ["ZZ"]).result()
+    assert result.metadata[0]["timings"]["post_processing"] >= 0.0
+
+    summary = profiler.summary()
+    assert summary["backend"]["count"] == 2
+    assert summary["backend"]["total"] >= summary["backend"]["max"]
+    assert all(span["shots"] == 100 for span in spans if span["stage"] == "backend")
+    profiler.export(tmp_path / "profile.json")
+    with open(tmp_path / "profile.json") as file:
+        assert len(json.load(file)["spans"]) == len(spans)
+
+def test_transpile_cache():
+    import qristal.core
+    from qiskit import QuantumCircuit
+    from qiskit.circuit import Parameter
+    from qiskit_integration.qristal_primitives import QristalSampler, _circuit_key
+
+    theta = Parameter("theta")
+    circuit = QuantumCircuit(2)
+    circuit.ry(theta, 0)
+    circuit.cx(0, 1)
+    circuit.measure_all()
+    other = QuantumCircuit(2)
+    other.ry(theta, 1)
+    other.cx(1, 0)
+    other.measure_all()
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    sampler = QristalSampler(sim)
+    transpiled = sampler._transpile(circuit)
+    # A structurally identical copy is a hit, a different circuit is a miss
+    assert sampler._transpile(circuit.copy()) is transpiled
+    assert sampler._transpile(other) is not transpiled
+    assert len(sampler._transpile_cache) == 2
+
+    # Binding other parameter values reuses the cached template
+    key = _circuit_key(circuit)
+    sampler.run([circuit, circuit], [[0.1], [2.5]]).result()
+    assert _circuit_key(circuit) == key
+    assert len(sampler._transpile_cache) == 2
+    assert sampler._transpile(circuit) is transpiled
+
+def test_estimator_permutation():
+    import qristal.core
+    from qiskit import QuantumCircuit
+    from qiskit.quantum_info import SparsePauliOp
+    from qiskit_integration.qristal_primitives import QristalSampler, QristalEstimator, QristalEstimatorV2
+
+    # Transpilation elides the SWAP into the final layout of the circuit
+    circuit = QuantumCircuit(2)
+    circuit.x(0)
+    circuit.swap(0, 1)
+    observable = SparsePauliOp.from_list([("ZI", 1.0), ("IZ", 0.5)])
+
+    sim = qristal.core.session()
+    sim.acc = "aer"
+    sim.qn = 2
+    sim.sn = 100
+    sampler = QristalSampler(sim)
+    for estimator in [QristalEstimator(sampler), QristalEstimator(sampler, grouping=None),
+                      QristalEstimator(sampler, deterministic=True)]:
+        assert estimator.run([circuit], [observable]).result().values[0] == pytest.approx(-0.5)
+    result = QristalEstimatorV2(sampler).run([(circuit, observable)]).result()[0]
+    assert result.data.evs == pytest.approx(-0.5)
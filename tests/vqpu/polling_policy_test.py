@@ -0,0 +1,54 @@
+# Tests of the PollingPolicy of vqpu-qasm/qbqpu.py and its copy in vqpu-qiskit/qbbackend.py
+import os
+import sys
+import time
+import pytest
+from types import SimpleNamespace
+from email.utils import formatdate
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path[:0] = [os.path.join(_ROOT, "vqpu-qasm"), os.path.join(_ROOT, "vqpu-qiskit")]
+
+def response(retry_after=None):
+    return SimpleNamespace(headers={} if retry_after is None else {"Retry-After": retry_after})
+
+@pytest.fixture(params=["qbqpu", "qbbackend"])
+def policy_module(request):
+    import importlib
+    return importlib.import_module(request.param)
+
+def retry_after(module, response):
+    if module.__name__ == "qbqpu":
+        return module.get_retry_after(response)
+    return module.PollingPolicy._retry_after(response)
+
+def test_backoff(policy_module):
+    policy = policy_module.PollingPolicy(initial_delay=0.1, factor=2.0, max_delay=1.0, jitter=0.0)
+    # Exponential growth from initial_delay, capped at max_delay
+    assert [policy.delay(attempt) for attempt in range(1, 7)] == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+    assert policy.delay(3, response()) == pytest.approx(0.4)
+
+    constant = policy_module.PollingPolicy.constant(0.5)
+    assert [constant.delay(attempt) for attempt in (1, 10, 100)] == [0.5, 0.5, 0.5]
+
+def test_jitter(policy_module):
+    policy = policy_module.PollingPolicy(initial_delay=1.0, factor=2.0, max_delay=4.0, jitter=0.25)
+    for attempt, delay in [(1, 1.0), (2, 2.0), (5, 4.0)]:
+        delays = [policy.delay(attempt) for _ in range(200)]
+        assert all(0.75 * delay <= value <= 1.25 * delay for value in delays)
+        # The jitter is random
+        assert len(set(delays)) > 1
+
+def test_retry_after(policy_module):
+    policy = policy_module.PollingPolicy(initial_delay=0.1, max_delay=1.0, jitter=0.0)
+    # Retry-After takes precedence over the backoff, including its cap
+    assert policy.delay(1, response("3")) == 3.0
+    assert policy.delay(1, response("2.5")) == 2.5
+    assert policy.delay(1, response("-1")) == 0.0
+    assert policy.delay(1, response("")) == pytest.approx(0.1)
+    assert policy.delay(1, response("soon")) == pytest.approx(0.1)
+
+    # HTTP dates, in the future or in the past
+    assert retry_after(policy_module, response(formatdate(time.time() + 30, usegmt=True))) == pytest.approx(30, abs=2)
+    assert retry_after(policy_module, response(formatdate(time.time() - 30, usegmt=True))) == 0.0
+    assert retry_after(policy_module, None) is None
@@ -0,0 +1,229 @@
+# Tests of vqpu-qiskit/qbbackend.py against the local qcstack mock server in vqpu-mock
+import os
+import sys
+import pytest
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path[:0] = [os.path.join(_ROOT, "vqpu-qiskit"), os.path.join(_ROOT, "vqpu-mock")]
+
+BATCH_ENDPOINT = "/api/v2/circuits/openqasm2/batch"
+
+def bell_qasm(flip=False):
+    lines = ['OPENQASM 2.0;', 'include "qelib1.inc";', "qreg q[2];", "creg c[2];"]
+    lines += ["x q[0];"] if flip else ["h q[0];", "cx q[0],q[1];"]
+    lines += ["measure q[0] -> c[0];", "measure q[1] -> c[1];"]
+    return "\n".join(lines)
+
+@pytest.mark.parametrize("batch", [True, False])
+def test_run_batch(batch):
+    from qbbackend import QuantumBackend
+    from qcstack_mock import MockQcstack
+
+    with MockQcstack(port=0, latency=0.05, workers=4, batch=batch, seed=1) as server:
+        backend = QuantumBackend(qpu_url=server.url, batch_endpoint=BATCH_ENDPOINT)
+        futures = backend.run_batch([bell_qasm(), bell_qasm(flip=True)] * 2, 100, polling_time=0.01)
+        results = [future.result(timeout=30) for future in futures]
+        backend.close()
+        stats = server.stats()
+    assert set(results[0].get_counts()) <= {"00", "11"}
+    assert sum(results[0].get_counts().values()) == 100
+    assert results[1].get_counts() == {"01": 100}
+    assert results[3].get_counts() == {"01": 100}
+    if batch:
+        assert stats["POST /api/v2/circuits/openqasm2/batch 200"] == 1
+    else:
+        assert stats["POST /api/v2/circuits/openqasm2 200"] == 4
+
+class StreamedResponse:
+    """ The body of a requests.Response, returned in chunks by iter_content """
+    def __init__(self, body):
+        self.body = body.encode("utf-8")
+        self.encoding = "utf-8"
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+@pytest.mark.parametrize("body, fields, counts", [
+    ('{"id": 1, "data": [[0, 1], [1, 1], [0,1]]}', {"id": 1}, {"01": 2, "11": 1}),
+    # whitespace, and escaped strings and nested keys named "data" before the data array
+    ('{\n "note" : "say \\"data\\": [1] \u00e9",\t"meta": {"data": [[1]], "x": ["data"]},\r\n'
+     ' "data" :\n[ [0 ,0]\n, [1,\t0] ] ,"status": "done"}',
+     {"note": 'say "data": [1] \u00e9', "meta": {"data": [[1]], "x": ["data"]}, "status": "done"},
+     {"00": 1, "10": 1}),
+    # a "data" string value is not the data array
+    ('{"name": "data", "data": [[1]], "extra": {"data": []}}', {"name": "data", "extra": {"data": []}}, {"1": 1}),
+    ('{"data": [], "id": 2}', {"id": 2}, {}),
+    ('{"id": 3}', {"id": 3}, {}),
+])
+def test_stream_counts(body, fields, counts, chunk_size):
+    from qbbackend import _stream_counts
+
+    assert _stream_counts(StreamedResponse(body), chunk_size=chunk_size) == (fields, counts)
+
+@pytest.mark.parametrize("chunk_size", [1, 1 << 16])
+@pytest.mark.parametrize("body", [
+    '{"id": 1, "data": [[0, 1], [1',
+    '{"id": 1, "data": [[0, 1], [1, 1]',
+    '{"id": 1, "data": [[0, 1]], "status"',
+    '{"id": 1, "data": [[0, 1], "x"]}',
+    '{"id": 1, "data": [[0, a]]}',
+    '{"id": 1, "da',
+])
+def test_stream_counts_malformed(body, chunk_size):
+    from qbbackend import _stream_counts
+
+    with pytest.raises(ValueError):
+        _stream_counts(StreamedResponse(body), chunk_size=chunk_size)
+
+def test_run_batch_failed_experiment():
+    from qbbackend import QuantumBackend
+    from qcstack_mock import MockQcstack
+
+    with MockQcstack(port=0, latency=0.01, failure_rate=1.0, simulator="random") as server:
+        backend = QuantumBackend(qpu_url=server.url, batch_endpoint=BATCH_ENDPOINT)
+        futures = backend.run_batch([bell_qasm()] * 2, 10, polling_time=0.01)
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(timeout=30)
+        backend.close()
+
+def test_run_batch_poller_error():
+    from qbbackend import QuantumBackend
+    from qcstack_mock import MockQcstack
+
+    def fail(*args, **kwargs):
+        raise ValueError("malformed response")
+
+    with MockQcstack(port=0, latency=0.01, simulator="random") as server:
+        backend = QuantumBackend(qpu_url=server.url, batch_endpoint=BATCH_ENDPOINT)
+        backend.get_experiments_status = fail
+        futures = backend.run_batch([bell_qasm()] * 3, 10, polling_time=0.01)
+        # The poller thread fails, but every future still completes
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result(timeout=30)
+        backend.close()
+
+@pytest.mark.parametrize("failures, max_status_errors", [(2, 3), (3, 3)])
+def test_run_batch_status_errors(failures, max_status_errors):
+    import requests
+    from qbbackend import QuantumBackend
+    from qcstack_mock import MockQcstack
+
+    with MockQcstack(port=0, latency=0.01, simulator="random") as server:
+        backend = QuantumBackend(qpu_url=server.url, batch_endpoint=BATCH_ENDPOINT)
+        get_experiments_status = backend.get_experiments_status
+        calls = []
+        def flaky(ids, *args):
+            # The status request of the first experiment fails on the first polls
+            calls.append(ids)
+            responses = get_experiments_status(ids, *args)
+            if len(calls) <= failures:
+                responses[0] = requests.exceptions.ConnectionError("connection reset")
+            return responses
+        backend.get_experiments_status = flaky
+        futures = backend.run_batch([bell_qasm()] * 2, 10, polling_time=0.01,
+                                    max_status_errors=max_status_errors)
+        if failures < max_status_errors:
+            assert sum(futures[0].result(timeout=30).get_counts().values()) == 10
+        else:
+            with pytest.raises(requests.exceptions.ConnectionError):
+                futures[0].result(timeout=30)
+        assert sum(futures[1].result(timeout=30).get_counts().values()) == 10
+        backend.close()
+
+def test_run_batch_id_mismatch():
+    from qbbackend import QuantumBackend
+    from qcstack_mock import MockQcstack
+
+    with MockQcstack(port=0, latency=0.01, simulator="random") as server:
+        backend = QuantumBackend(qpu_url=server.url, batch_endpoint=BATCH_ENDPOINT)
+        send_experiments = backend.send_experiments
+        backend.send_experiments = lambda *args: send_experiments(*args)[:-1]
+        with pytest.raises(RuntimeError):
+            backend.run_batch([bell_qasm()] * 3, 10, polling_time=0.01)
+        backend.close()
+
+def test_session(monkeypatch):
+    import requests
+    from qbbackend import QuantumBackend
+    from qcstack_mock import MockQcstack
+
+    def unpooled(*args, **kwargs):
+        raise AssertionError("request sent without the pooled session")
+    monkeypatch.setattr(requests, "get", unpooled)
+    monkeypatch.setattr(requests, "post", unpooled)
+
+    with MockQcstack(port=0, latency=0.01) as server:
+        backend = QuantumBackend(qpu_url=server.url, pool_size=4, timeout=7, retries=5, backoff_factor=0.25)
+        # Retry and connection pool settings
+        adapter = backend.session.get_adapter(server.url)
+        assert adapter._pool_maxsize == 4
+        assert adapter.max_retries.total == 5
+        assert adapter.max_retries.backoff_factor == 0.25
+        assert set(adapter.max_retries.status_forcelist) == {502, 503, 504}
+        assert adapter.max_retries.allowed_methods == {"GET"}
+
+        # Every request goes through the session of the backend, with the configured timeout
+        calls = []
+        for method in ("get", "post"):
+            def request(url, _send=getattr(backend.session, method), _method=method.upper(), **kwargs):
+                calls.append((_method, kwargs))
+                return _send(url, **kwargs)
+            monkeypatch.setattr(backend.session, method, request)
+        backend.run(bell_qasm(flip=True), 10, polling_time=0.01).result()
+        futures = backend.run_batch([bell_qasm()] * 2, 10, polling_time=0.01)
+        for future in futures:
+            future.result(timeout=30)
+        backend.close()
+    assert [method for method, _ in calls].count("POST") == 3
+    assert "GET" in [method for method, _ in calls]
+    assert all(kwargs["timeout"] == 7 and kwargs["verify"] is False for _, kwargs in calls)
+
+def test_result_cache(tmp_path):
+    import numpy as np
+    from qbbackend import QuantumBackend, ResultCache, MyResult
+    from qcstack_mock import MockQcstack
+
+    path = str(tmp_path / "results.sqlite")
+    cache = ResultCache(path)
+    # Keys ignore comments and whitespace, but not shots or the QPU
+    key = cache.key(bell_qasm(), 100, "http://qpu")
+    assert cache.key(bell_qasm() + "\n\n// comment", 100, "http://qpu") == key
+    assert cache.key(bell_qasm(), 10, "http://qpu") != key
+    assert cache.key(bell_qasm(), 100, "http://other") != key
+
+    with MockQcstack(port=0, latency=0.01, workers=2) as server:
+        backend = QuantumBackend(qpu_url=server.url, result_cache=cache)
+        first = backend.run(bell_qasm(flip=True), 100, polling_time=0.01).result()
+        job = backend.run(bell_qasm(flip=True), 100, polling_time=0.01)
+        assert job.status() == "COMPLETED"
+        assert job.result().get_counts() == first.get_counts() == {"01": 100}
+        futures = backend.run_batch([bell_qasm(flip=True), bell_qasm()], 100, polling_time=0.01)
+        assert futures[0].done() and futures[0].result().get_counts() == {"01": 100}
+        futures[1].result(timeout=30)
+        backend.close()
+        stats = server.stats()
+    assert stats["POST /api/v2/circuits/openqasm2 200"] == 2
+    assert len(cache) == 2
+    cache.close()
+
+    # Results persist, including per-shot memory
+    cache = ResultCache(path)
+    result = cache.get(cache.key(bell_qasm(flip=True), 100, server.url))
+    assert result.get_memory() == ["01"] * 100
+
+    # Least recently used results are evicted first
+    result = MyResult({"data": np.zeros((10, 2), dtype=int).tolist()})
+    cache.put("a", result)
+    size = cache._connection.execute("SELECT size FROM results WHERE key = 'a'").fetchone()[0]
+    cache.clear()
+    cache.max_size_bytes = 2 * size
+    cache.put("a", result)
+    cache.put("b", result)
+    cache.get("a")
+    cache.put("c", result)
+    assert cache.get("a") is not None and cache.get("b") is None and cache.get("c") is not None
+    cache.close()
@@ -0,0 +1,81 @@
+# Tests of vqpu-qasm/qbqpu.py against the local qcstack mock server in vqpu-mock
+import os
+import sys
+import pytest
+import requests
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path[:0] = [os.path.join(_ROOT, "vqpu-qasm"), os.path.join(_ROOT, "vqpu-mock")]
+
+CIRCUIT = ['OPENQASM 2.0;', 'include "qelib1.inc";', "qreg q[2];", "creg c[2];", "x q[0];",
+           "measure q[0] -> c[0];", "measure q[1] -> c[1];"]
+
+def flaky(get_experiment_status, failures):
+    # Fail the first `failures` status requests with a connection error
+    calls = []
+    def get(id, qpu_url):
+        calls.append(id)
+        if len(calls) <= failures:
+            raise requests.exceptions.ConnectionError("connection reset")
+        return get_experiment_status(id, qpu_url)
+    return get
+
+def test_run_experiments_status_retry(monkeypatch):
+    import qbqpu
+    from qcstack_mock import MockQcstack
+
+    with MockQcstack(port=0, latency=0.01) as server:
+        monkeypatch.setattr(qbqpu, "get_experiment_status", flaky(qbqpu.get_experiment_status, 2))
+        results = qbqpu.run_experiments([CIRCUIT], 10, server.url, polling_time=0.01, max_workers=1)
+    # The mock returns bits in qiskit order, classical bit 0 last
+    assert qbqpu.get_bitstring_counts(results[0]) == {"01": 10}
+
+def test_run_experiments_status_errors_exhausted(monkeypatch):
+    import qbqpu
+    from qcstack_mock import MockQcstack
+
+    with MockQcstack(port=0, latency=0.01) as server:
+        monkeypatch.setattr(qbqpu, "get_experiment_status", flaky(qbqpu.get_experiment_status, 100))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            qbqpu.run_experiments([CIRCUIT], 10, server.url, polling_time=0.01, max_status_errors=3)
+
+class RecordingSession:
+    # Wraps an HTTP session, recording the keyword arguments of every request
+    def __init__(self, session):
+        self.session = session
+        self.calls = []
+    def get(self, url, **kwargs):
+        self.calls.append(("GET", kwargs))
+        return self.session.get(url, **kwargs)
+    def post(self, url, **kwargs):
+        self.calls.append(("POST", kwargs))
+        return self.session.post(url, **kwargs)
+
+def test_session(monkeypatch):
+    import qbqpu
+    from qcstack_mock import MockQcstack
+
+    # Retry and connection pool settings
+    session = qbqpu.create_session(pool_size=4, retries=5, backoff_factor=0.25)
+    adapter = session.get_adapter("http://localhost")
+    assert adapter._pool_maxsize == 4
+    assert adapter.max_retries.total == 5
+    assert adapter.max_retries.backoff_factor == 0.25
+    assert set(adapter.max_retries.status_forcelist) == {502, 503, 504}
+    assert adapter.max_retries.allowed_methods == {"GET"}
+    assert session.get_adapter("https://localhost") is adapter
+
+    # Every request goes through the shared session, with the configured timeout
+    def unpooled(*args, **kwargs):
+        raise AssertionError("request sent without the pooled session")
+    monkeypatch.setattr(requests, "get", unpooled)
+    monkeypatch.setattr(requests, "post", unpooled)
+    recording = RecordingSession(session)
+    monkeypatch.setattr(qbqpu, "session", recording)
+    monkeypatch.setattr(qbqpu, "timeout", 7)
+    with MockQcstack(port=0, latency=0.01) as server:
+        results = qbqpu.run_experiments([CIRCUIT] * 2, 10, server.url, polling_time=0.01)
+    assert all(result is not None for result in results)
+    assert [method for method, _ in recording.calls].count("POST") == 2
+    assert "GET" in [method for method, _ in recording.calls]
+    assert all(kwargs["timeout"] == 7 and kwargs["verify"] == qbqpu.verify_ssl for _, kwargs in recording.calls)
@@ -0,0 +1,26 @@
+# Tests of the local qcstack mock server in vqpu-mock
+import os
+import sys
+import random
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path[:0] = [os.path.join(_ROOT, "vqpu-mock")]
+
+QASM = "\n".join(['OPENQASM 2.0;', 'include "qelib1.inc";', "qreg q[2];", "creg c[2];", "h q[0];", "h q[1];",
+                  "measure q[0] -> c[0];", "measure q[1] -> c[1];"])
+
+def test_seed():
+    from qcstack_mock import MockQcstack, simulate_qiskit, simulate_random
+
+    # Seeding the mock does not reseed the global random module
+    state = random.getstate()
+    server = MockQcstack(port=0, seed=1)
+    server._server.server_close()
+    assert random.getstate() == state
+
+    # Simulated shots are reproducible from the seed of the generator
+    for simulate in (simulate_random, simulate_qiskit):
+        shots = simulate(QASM, 20, random.Random(5))
+        assert len(shots) == 20 and all(len(shot) == 2 for shot in shots)
+        assert simulate(QASM, 20, random.Random(5)) == shots
+    assert random.getstate() == state
@@ -0,0 +1,168 @@
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import requests
+
+from qcstack_mock import MockQcstack, SIMULATORS
+
+#Drive concurrent experiment submissions from qbbackend.py or qbqpu.py against a qcstack server (by
+#default a MockQcstack started in-process) and report client throughput, latency and polling behaviour.
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [os.path.join(_HERE, "..", "vqpu-qiskit"), os.path.join(_HERE, "..", "vqpu-qasm")]
+
+
+def ghz_qasm(num_qubits: int) -> str:
+    """OpenQASM2 string of a num_qubits GHZ circuit measuring all qubits."""
+    lines = ['OPENQASM 2.0;', 'include "qelib1.inc";', f"qreg q[{num_qubits}];", f"creg c[{num_qubits}];",
+             "h q[0];"]
+    lines += [f"cx q[{i}],q[{i + 1}];" for i in range(num_qubits - 1)]
+    lines += [f"measure q[{i}] -> c[{i}];" for i in range(num_qubits)]
+    return "\n".join(lines)
+
+
+def run_qbbackend(url: str, circuits: list, shots: int, concurrency: int, mode: str, polling_time):
+    """Run circuits with QuantumBackend. Return the latency (secs) of every completed circuit and the number of failures."""
+    from qbbackend import QuantumBackend
+
+    backend = QuantumBackend(qpu_url=url, pool_size=concurrency,
+                             batch_endpoint="/api/v2/circuits/openqasm2/batch" if mode == "batch" else None)
+    start = time.perf_counter()
+    latencies, failures = [], 0
+    lock = threading.Lock()
+    try:
+        if mode == "jobs":
+            def execute(circuit):
+                job = backend.run(circuit, shots, polling_time=polling_time)
+                job.result()
+                return time.perf_counter() - start
+
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(execute, circuit) for circuit in circuits]
+            for future in futures:
+                if future.exception() is None:
+                    latencies.append(future.result())
+                else:
+                    failures += 1
+        else:
+            def record(future):
+                nonlocal failures
+                with lock:
+                    if future.exception() is None:
+                        latencies.append(time.perf_counter() - start)
+                    else:
+                        failures += 1
+
+            futures = backend.run_batch(circuits, shots, polling_time=polling_time, max_workers=concurrency)
+            for future in futures:
+                future.add_done_callback(record)
+            for future in futures:
+                future.exception()
+    finally:
+        backend.close()
+    return latencies, failures
+
+
+def run_qbqpu(url: str, circuits: list, shots: int, concurrency: int, mode: str, polling_time):
+    """Run circuits with qbqpu. Return the latency (secs) of every completed circuit and the number of failures."""
+    import qbqpu
+
+    qbqpu.session = qbqpu.create_session(pool_size=concurrency)
+    qbqpu.batch_endpoint = "/api/v2/circuits/openqasm2/batch" if mode == "batch" else None
+    circuits = [circuit.split("\n") for circuit in circuits]
+    start = time.perf_counter()
+    if mode == "jobs":
+        def execute(circuit):
+            response = qbqpu.run_experiment(circuit, shots, url, polling_time=polling_time)
+            return None if response is None else time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(execute, circuits))
+    else:
+        responses = qbqpu.run_experiments(circuits, shots, url, polling_time=polling_time, max_workers=concurrency)
+        end = time.perf_counter() - start
+        results = [None if response is None else end for response in responses]
+    latencies = [latency for latency in results if latency is not None]
+    return latencies, len(results) - len(latencies)
+
+
+def fetch_stats(url: str):
+    """Request counters of the server, if it provides them (see MockQcstack.stats)."""
+    try:
+        response = requests.get(url + "/stats", timeout=5)
+        return response.json() if response.status_code == 200 else None
+    except requests.exceptions.RequestException:
+        return None
+
+
+def report(num_circuits: int, wall_time: float, latencies: list, failures: int, stats):
+    print(f"circuits:    {num_circuits} ({failures} failed)")
+    print(f"wall time:   {wall_time:.3f} s")
+    print(f"throughput:  {len(latencies) / wall_time:.2f} circuits/s")
+    if latencies:
+        p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+        print(f"latency:     p50 {p50:.3f} s, p90 {p90:.3f} s, p99 {p99:.3f} s, max {max(latencies):.3f} s")
+    if stats:
+        status_requests = sum(count for key, count in stats.items() if key.startswith("GET /api/v2/circuits/"))
+        print(f"status requests: {status_requests} ({status_requests / max(num_circuits, 1):.1f} per circuit)")
+        for key in sorted(stats):
+            print(f"  {key}: {stats[key]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test qbbackend.py or qbqpu.py against a qcstack server.")
+    parser.add_argument("--url", default=None, help="qcstack URL. By default, a local mock server is started.")
+    parser.add_argument("--client", choices=("qbbackend", "qbqpu"), default="qbbackend")
+    parser.add_argument("--mode", choices=("jobs", "batch"), default="batch",
+                        help="'jobs': one blocking job per client thread, 'batch': submit all circuits up front")
+    parser.add_argument("--circuits", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8, help="client threads / max_workers")
+    parser.add_argument("--shots", type=int, default=1024)
+    parser.add_argument("--qubits", type=int, default=4)
+    parser.add_argument("--polling-time", type=float, default=None,
+                        help="constant polling interval (secs). By default, the client's PollingPolicy is used.")
+    parser.add_argument("--verbose", action="store_true", help="show the output of the client")
+    mock = parser.add_argument_group("local mock server (without --url)")
+    mock.add_argument("--latency", type=float, default=0.1)
+    mock.add_argument("--jitter", type=float, default=0.0)
+    mock.add_argument("--workers", type=int, default=4)
+    mock.add_argument("--simulator", choices=sorted(SIMULATORS), default="random")
+    mock.add_argument("--retry-after", type=float, default=None)
+    mock.add_argument("--error-rate", type=float, default=0.0)
+    mock.add_argument("--failure-rate", type=float, default=0.0)
+    mock.add_argument("--request-delay", type=float, default=0.0)
+    mock.add_argument("--no-batch", action="store_true")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        server = MockQcstack(port=0, latency=args.latency, jitter=args.jitter, workers=args.workers,
+                             simulator=args.simulator, retry_after=args.retry_after, error_rate=args.error_rate,
+                             failure_rate=args.failure_rate, request_delay=args.request_delay,
+                             batch=not args.no_batch).start()
+        url = server.url
+
+    circuits = [ghz_qasm(args.qubits)] * args.circuits
+    run = run_qbbackend if args.client == "qbbackend" else run_qbqpu
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        start = time.perf_counter()
+        with output:
+            latencies, failures = run(url, circuits, args.shots, args.concurrency, args.mode, args.polling_time)
+        wall_time = time.perf_counter() - start
+        report(args.circuits, wall_time, latencies, failures, fetch_stats(url))
+    finally:
+        if server is not None:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+#Local stand-in for the qcstack circuit API, for testing and load testing qbbackend.py and qbqpu.py
+#without a QPU. It implements
+#   GET  /                                   reachability check
+#   POST /api/v2/circuits/openqasm2          {"circuit": [...lines], "shots": n} -> {"id": id}
+#   POST /api/v2/circuits/openqasm2/batch    {"circuits": [{"circuit": ..., "shots": ...}, ...]} -> {"ids": [...]}
+#   GET  /api/v2/circuits/{id}               425 while pending, then {"data": [[bit, ...], ...]}
+#   GET  /stats                              request and experiment counters of the server
+#Experiments queue for `workers` emulated QPUs and take `latency` (+/- `jitter`) secs each.
+
+_CIRCUIT_PATH = re.compile(r"^/api/v2/circuits/(\d+)$")
+_CREG = re.compile(r"^\s*creg\s+\w+\s*\[\s*(\d+)\s*\]\s*;")
+
+
+def simulate_qiskit(qasm: str, shots: int, rng: Optional[random.Random] = None) -> list:
+    """Sample a circuit with qiskit's BasicSimulator, seeded from rng. Return one row of bits per shot, in qiskit bitstring order."""
+    from qiskit import QuantumCircuit
+    from qiskit.providers.basic_provider import BasicSimulator
+
+    circuit = QuantumCircuit.from_qasm_str(qasm)
+    if circuit.num_clbits == 0:
+        return [[] for _ in range(shots)]
+    seed = None if rng is None else rng.getrandbits(32)
+    memory = BasicSimulator().run(circuit, shots=shots, memory=True, seed_simulator=seed).result().get_memory()
+    return [[int(bit) for bit in shot.replace(" ", "")] for shot in memory]
+
+
+def simulate_random(qasm: str, shots: int, rng: Optional[random.Random] = None) -> list:
+    """Return uniformly random bits (drawn from rng) for every classical bit of a circuit, without simulating it."""
+    rng = rng or random.Random()
+    num_bits = sum(int(match.group(1)) for match in map(_CREG.match, qasm.split("\n")) if match)
+    return [[rng.getrandbits(1) for _ in range(num_bits)] for _ in range(shots)]
+
+
+SIMULATORS = {"qiskit": simulate_qiskit, "random": simulate_random}
+
+
+class MockQcstack:
+    """
+    A local qcstack mock server with configurable latency, polling behaviour and error injection.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8888, latency: float = 0.5, jitter: float = 0.0,
+                 workers: int = 1, simulator: str = "qiskit", retry_after: Optional[float] = None,
+                 error_rate: float = 0.0, failure_rate: float = 0.0, request_delay: float = 0.0,
+                 batch: bool = True, seed: Optional[int] = None):
+        """
+        host, port: address to listen on (port 0 picks a free port, see url).
+        latency, jitter: secs an experiment occupies an emulated QPU, randomised by +/- jitter (relative).
+        workers: number of experiments executed concurrently.
+        simulator: "qiskit" (BasicSimulator) or "random" (random bits, no qiskit required).
+        retry_after: if set, 425 responses carry a Retry-After header of this many secs.
+        error_rate: probability of answering any API request with a transient HTTP 503.
+        failure_rate: probability of an experiment failing, reported as HTTP 500 by its status requests.
+        request_delay: secs added to the handling of every request, emulating network latency.
+        batch: whether the batch endpoint is available (otherwise it answers 404).
+        seed: seed of the random latencies, errors and simulated shots.
+        """
+        if simulator not in SIMULATORS:
+            raise ValueError(f"Unknown simulator '{simulator}'. Expected one of {sorted(SIMULATORS)}.")
+        self.latency = latency
+        self.jitter = jitter
+        self.simulate = SIMULATORS[simulator]
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self.failure_rate = failure_rate
+        self.request_delay = request_delay
+        self.batch = batch
+        # Private generator, so that seeding does not affect the global random module of the process
+        self._random = random.Random(seed)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._experiments = {}
+        self._lock = threading.Lock()
+        self._stats = Counter()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockQcstack":
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """Serve requests in the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self):
+        """Stop serving and discard queued experiments."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def stats(self) -> dict:
+        """Counters of requests by endpoint and status code, and of experiments by state."""
+        with self._lock:
+            stats = dict(self._stats)
+            states = Counter("failed" if experiment["failed"] else
+                             "completed" if experiment["future"].done() else "pending"
+                             for experiment in self._experiments.values())
+        stats.update({f"experiments_{state}": count for state, count in states.items()})
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats.clear()
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _submit(self, circuit, shots: int) -> int:
+        """Queue an experiment and return its ID."""
+        qasm = "\n".join(circuit) if isinstance(circuit, list) else str(circuit)
+        latency = self.latency * self._random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+        failed = self._random.random() < self.failure_rate
+
+        def execute():
+            time.sleep(latency)
+            return None if failed else self.simulate(qasm, int(shots), self._random)
+
+        with self._lock:
+            experiment_id = len(self._experiments)
+            self._experiments[experiment_id] = {"future": self._executor.submit(execute), "failed": failed}
+        return experiment_id
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, endpoint: str, status: int, body: dict, headers: dict = None):
+                mock._count(f"{endpoint} {status}")
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _inject_error(self, endpoint: str) -> bool:
+                if mock.request_delay:
+                    time.sleep(mock.request_delay)
+                if mock._random.random() < mock.error_rate:
+                    self._send(endpoint, 503, {"detail": "Injected transient error"})
+                    return True
+                return False
+
+            def _read_json(self):
+                length = int(self.headers.get("Content-Length", 0))
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_GET(self):
+                if self.path == "/":
+                    return self._send("GET /", 200, {"status": "ok"})
+                if self.path == "/stats":
+                    return self._send("GET /stats", 200, mock.stats())
+                match = _CIRCUIT_PATH.match(self.path)
+                if match is None:
+                    return self._send("GET other", 404, {"detail": "Not found"})
+                endpoint = "GET /api/v2/circuits/{id}"
+                if self._inject_error(endpoint):
+                    return
+                with mock._lock:
+                    experiment = mock._experiments.get(int(match.group(1)))
+                if experiment is None:
+                    return self._send(endpoint, 404, {"detail": "Unknown circuit ID"})
+                if not experiment["future"].done():
+                    headers = {} if mock.retry_after is None else {"Retry-After": format(mock.retry_after, "g")}
+                    return self._send(endpoint, 425, {"detail": "Circuit execution not finished"}, headers)
+                if experiment["failed"]:
+                    return self._send(endpoint, 500, {"detail": "Injected circuit execution failure"})
+                try:
+                    data = experiment["future"].result()
+                except Exception as exc:
+                    return self._send(endpoint, 500, {"detail": f"Simulation failed: {exc}"})
+                self._send(endpoint, 200, {"data": data})
+
+            def do_POST(self):
+                if self.path == "/api/v2/circuits/openqasm2":
+                    endpoint = "POST /api/v2/circuits/openqasm2"
+                    body = self._read_json()
+                    if self._inject_error(endpoint):
+                        return
+                    if "circuit" not in body or "shots" not in body:
+                        return self._send(endpoint, 422, {"detail": "Expected 'circuit' and 'shots'"})
+                    return self._send(endpoint, 200, {"id": mock._submit(body["circuit"], body["shots"])})
+                if self.path == "/api/v2/circuits/openqasm2/batch":
+                    endpoint = "POST /api/v2/circuits/openqasm2/batch"
+                    body = self._read_json()
+                    if not mock.batch:
+                        return self._send(endpoint, 404, {"detail": "Not found"})
+                    if self._inject_error(endpoint):
+                        return
+                    ids = [mock._submit(item["circuit"], item["shots"]) for item in body.get("circuits", [])]
+                    return self._send(endpoint, 200, {"ids": ids})
+                self._read_json()
+                self._send("POST other", 404, {"detail": "Not found"})
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local qcstack mock server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8888)
+    parser.add_argument("--latency", type=float, default=0.5, help="secs per experiment")
+    parser.add_argument("--jitter", type=float, default=0.0, help="relative randomisation of the latency")
+    parser.add_argument("--workers", type=int, default=1, help="experiments executed concurrently")
+    parser.add_argument("--simulator", choices=sorted(SIMULATORS), default="qiskit")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After secs of 425 responses")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of transient HTTP 503s")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability of failed experiments")
+    parser.add_argument("--request-delay", type=float, default=0.0, help="secs added to every request")
+    parser.add_argument("--no-batch", action="store_true", help="disable the batch endpoint")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockQcstack(args.host, args.port, args.latency, args.jitter, args.workers, args.simulator,
+                         args.retry_after, args.error_rate, args.failure_rate, args.request_delay,
+                         not args.no_batch, args.seed)
+    print(f"qcstack mock listening at {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import json
 import requests
 import time
+import random
 import os
 import ast
 import ssl
@@ -8,32 +9,155 @@ import certifi
 import urllib
 import urllib3
 from urllib.request import urlopen
+from urllib3.util.retry import Retry
+from requests.adapters import HTTPAdapter
 import subprocess
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 
 # qcstack uses self-signed certs, so do not verify secure connection by default.
 verify_ssl=False
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+#timeout (in secs) of every HTTP request sent to qcstack
+timeout=30
+
+#create an HTTP session that keeps up to pool_size connections to qcstack alive and retries
+#transient errors up to retries times with exponential backoff. Status requests are retried on
+#gateway errors, while experiments are only resent if the connection could not be established.
+def create_session(pool_size:int = 10, retries:int = 3, backoff_factor:float = 0.5):
+    retry = Retry(total=retries, backoff_factor=backoff_factor,
+                  status_forcelist=(502, 503, 504), allowed_methods=frozenset({"GET"}),
+                  raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+#path of a qcstack endpoint accepting many experiments in one request, if any (see send_experiments)
+batch_endpoint=None
+batch_supported=None
+
+#HTTP session shared by all requests to qcstack. Replace it to change the connection pool or
+#retry policy, e.g. qbqpu.session = qbqpu.create_session(pool_size=32)
+session=create_session()
+
+#delay between status requests of an experiment: exponential backoff from initial_delay by factor
+#per request, capped at max_delay, with a random jitter of +/- jitter (relative). A Retry-After
+#header sent along with an HTTP 425 response takes precedence. Any object providing
+#delay(attempt, response) can be used as a polling policy. This is the canonical implementation,
+#vqpu-qiskit/qbbackend.py keeps an equivalent copy (tests/vqpu/polling_policy_test.py tests both).
+class PollingPolicy:
+    def __init__(self, initial_delay:float = 0.1, factor:float = 2.0, max_delay:float = 10.0, jitter:float = 0.1):
+        self.initial_delay = initial_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    #poll every polling_time secs
+    @classmethod
+    def constant(cls, polling_time:float):
+        return cls(initial_delay=polling_time, factor=1.0, max_delay=polling_time, jitter=0.0)
+
+    #secs to wait after the attempt-th (starting at 1) unsuccessful status request
+    def delay(self, attempt:int, response=None):
+        retry_after = get_retry_after(response)
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.initial_delay * self.factor ** (attempt - 1), self.max_delay)
+        return delay * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+#parse the Retry-After header (delay in secs or HTTP date) of a response, if any
+def get_retry_after(response):
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
 #check if circuit execution is finished and return response
 def get_experiment_status(id:int, qpu_url:str):
     url = qpu_url+"/api/v2/circuits/"+str(id)
     headers = {'accept': 'application/json'}
-    response = requests.get(url, headers=headers, verify=verify_ssl)
+    response = session.get(url, headers=headers, verify=verify_ssl, timeout=timeout)
     return response
 
 #given circuit (string) array and shot count, send an experiment to qcstack API and return response
 def send_experiment(circuit, shots, qpu_url:str):
     headers = {'Content-Type': 'application/json'}
     json_data = {'circuit': circuit,'shots': shots}
-    response = requests.post(qpu_url+"/api/v2/circuits/openqasm2", headers=headers, json=json_data, verify=verify_ssl)
+    response = session.post(qpu_url+"/api/v2/circuits/openqasm2", headers=headers, json=json_data, verify=verify_ssl, timeout=timeout)
     return response
     
+#given an array of circuits (string arrays) and shot count, send all experiments to qcstack API at once.
+#If batch_endpoint is set, they are packed into a single request of the form
+#{"circuits": [{"circuit": ..., "shots": ...}, ...]}, answered by {"ids": [...]}. If qcstack does not
+#support batches, or no batch_endpoint is set, experiments are sent individually over up to
+#max_workers concurrent requests. Return the experiment id of each circuit, or None if sending failed.
+def send_experiments(circuits, shots, qpu_url:str, max_workers:int = 8):
+    global batch_supported
+    if batch_endpoint and batch_supported is not False:
+        headers = {'Content-Type': 'application/json'}
+        json_data = {'circuits': [{'circuit': circuit, 'shots': shots} for circuit in circuits]}
+        response = session.post(qpu_url+batch_endpoint, headers=headers, json=json_data, verify=verify_ssl, timeout=timeout)
+        if response.status_code == 200:
+            batch_supported = True
+            return list(response.json()['ids'])
+        elif response.status_code in (404, 405, 501):
+            print("qcstack does not support batch submission at " + batch_endpoint + ", sending individually!")
+            batch_supported = False
+        else:
+            print("An error occured while sending experiments to qcstack!")
+            print(response)
+            print(response.text)
+            return [None] * len(circuits)
+
+    def send(circuit):
+        try:
+            response = send_experiment(circuit, shots, qpu_url)
+        except requests.exceptions.RequestException as exc:
+            print("An error occured while sending experiment to qcstack: " + str(exc))
+            return None
+        if response.status_code != 200:
+            print("An error occured while sending experiment to qcstack!")
+            print(response)
+            print(response.text)
+            return None
+        return response.json()['id']
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(send, circuits))
+
+#check the status of many experiments over up to max_workers concurrent requests. Return the response
+#for each experiment, or the exception raised if its request failed (e.g. a connection error or
+#timeout), so that a single failed request does not abort the others
+def get_experiments_status(ids, qpu_url:str, max_workers:int = 8):
+    def get(id):
+        try:
+            return get_experiment_status(id, qpu_url)
+        except requests.exceptions.RequestException as exc:
+            print("An error occured while requesting experiment status from qcstack: " + str(exc))
+            return exc
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(get, ids))
+
 #full pipeline to run an experiment including
 #(1) sending task to qcstack API
-#(2) obtaining experiment id and checking for solutions every polling_time secs for a maximum of max_requests times
+#(2) obtaining experiment id and checking for solutions for a maximum of max_requests times, waiting
+#    as set by polling_policy (adaptive backoff by default) or every polling_time secs if given
 #(3) on success, return final json data
-def run_experiment(circuit, shots:int, qpu_url:str, polling_time = 10, max_requests = 1000):
+def run_experiment(circuit, shots:int, qpu_url:str, polling_time = None, max_requests = 1000, polling_policy = None):
+    if polling_policy is None:
+        polling_policy = PollingPolicy() if polling_time is None else PollingPolicy.constant(polling_time)
     #(1) send experiment to qcstack API and get response 
     send_response = send_experiment(circuit, shots, qpu_url)
     if send_response.status_code != 200:
@@ -52,8 +176,9 @@ def run_experiment(circuit, shots:int, qpu_url:str, polling_time = 10, max_reque
             print("Execution terminated at request #" + str(request_idx))
             return response.json()
         elif response.status_code == 425: #polling to early 
-            print("Request " + str(request_idx) + "/" + str(max_requests) + ": too early, wait for " + str(polling_time) + " seconds!")
-            time.sleep(polling_time)
+            delay = polling_policy.delay(request_idx, response)
+            print("Request " + str(request_idx) + "/" + str(max_requests) + ": too early, wait for " + format(delay, ".2f") + " seconds!")
+            time.sleep(delay)
         else:
             print("Request " + str(request_idx) + "/" + str(max_requests) + ": an error occured!")
             print(response)
@@ -64,3 +189,51 @@ def get_bitstring_counts(response):
     f = lambda x: "".join(map(str,x))
     bitstrings = list(map( f, response["data"]))
     return dict(Counter(bitstrings))
+
+#full pipeline to run many experiments at once, see run_experiment. All experiments are sent up front
+#(see send_experiments) and their status is checked concurrently until all of them completed. Return
+#the final json data of each experiment, or None if it failed. Failed status requests are retried as
+#set by polling_policy; the error is raised once the status of an experiment could not be requested
+#max_status_errors times in a row.
+def run_experiments(circuits, shots:int, qpu_url:str, polling_time = None, max_requests = 1000, polling_policy = None, max_workers:int = 8, max_status_errors:int = 3):
+    if polling_policy is None:
+        polling_policy = PollingPolicy() if polling_time is None else PollingPolicy.constant(polling_time)
+    #(1) send experiments to qcstack API
+    experiment_ids = send_experiments(circuits, shots, qpu_url, max_workers)
+    print("Experiments were sent to qcstack API. IDs are " + str(experiment_ids))
+    results = [None] * len(circuits)
+    pending = [idx for idx, experiment_id in enumerate(experiment_ids) if experiment_id is not None]
+    #(2) check the status of all unfinished experiments until they completed
+    status_errors = Counter()
+    request_idx = 0
+    while pending and request_idx < max_requests:
+        request_idx += 1
+        responses = get_experiments_status([experiment_ids[idx] for idx in pending], qpu_url, max_workers)
+        still_pending = []
+        delay = None
+        for idx, response in zip(pending, responses):
+            if isinstance(response, requests.exceptions.RequestException): #status request failed
+                status_errors[idx] += 1
+                if status_errors[idx] >= max_status_errors:
+                    raise response
+                still_pending.append(idx)
+                response_delay = polling_policy.delay(request_idx)
+                delay = response_delay if delay is None else min(delay, response_delay)
+                continue
+            status_errors[idx] = 0
+            if response.status_code == 200: #experiment successfully completed
+                results[idx] = response.json()
+            elif response.status_code == 425: #polling to early
+                still_pending.append(idx)
+                response_delay = polling_policy.delay(request_idx, response)
+                delay = response_delay if delay is None else min(delay, response_delay)
+            else:
+                print("Request " + str(request_idx) + "/" + str(max_requests) + " for ID " + str(experiment_ids[idx]) + ": an error occured!")
+                print(response)
+                print(response.text)
+        pending = still_pending
+        if pending:
+            print("Request " + str(request_idx) + "/" + str(max_requests) + ": " + str(len(pending)) + " experiments pending, wait for " + format(delay, ".2f") + " seconds!")
+            time.sleep(delay)
+    print("Execution terminated at request #" + str(request_idx))
+    return results
@@ -1,73 +1,404 @@
+import io
+import re
 import time
+import sqlite3
+import hashlib
 import uuid
+import json
+import codecs
+import random
+import threading
 import urllib3
 import requests
-from typing import Optional
+import numpy as np
+from urllib3.util.retry import Retry
+from requests.adapters import HTTPAdapter
+from typing import Optional, List, Tuple
 from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+class PollingPolicy:
+    """
+    Delay between status requests of an experiment: exponential backoff from initial_delay by
+    factor per request, capped at max_delay, with a random jitter of +/- jitter (relative).
+    A Retry-After header sent along with an HTTP 425 response takes precedence.
+
+    Any object providing delay(attempt, response) can be used as a polling policy.
+
+    Equivalent copy of the canonical PollingPolicy of vqpu-qasm/qbqpu.py, as the two clients are
+    deployed independently. Changes must be applied to both (see tests/vqpu/polling_policy_test.py).
+    """
+
+    def __init__(self, initial_delay: float = 0.1, factor: float = 2.0, max_delay: float = 10.0,
+                 jitter: float = 0.1):
+        self.initial_delay = initial_delay
+        self.factor = factor
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    @classmethod
+    def constant(cls, polling_time: float):
+        """Poll every polling_time seconds."""
+        return cls(initial_delay=polling_time, factor=1.0, max_delay=polling_time, jitter=0.0)
+
+    def delay(self, attempt: int, response=None) -> float:
+        """Seconds to wait after the attempt-th (starting at 1) unsuccessful status request."""
+        retry_after = self._retry_after(response)
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.initial_delay * self.factor ** (attempt - 1), self.max_delay)
+        return delay * random.uniform(1.0 - self.jitter, 1.0 + self.jitter)
+
+    @staticmethod
+    def _retry_after(response) -> Optional[float]:
+        """Parse the Retry-After header (delay in seconds or HTTP date) of a response, if any."""
+        value = response.headers.get("Retry-After") if response is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+# One shot of the "data" array of a streamed response (a list of bits), optionally preceded by a
+# separating comma
+_SHOT_PATTERN = re.compile(r'\s*,?\s*\[([\d\s,]*)\]')
+
+def _stream_counts(response, chunk_size: int = 1 << 16) -> Tuple[dict, dict]:
+    """
+    Incrementally parse the JSON object of a streamed response, aggregating the shots of its
+    top-level "data" array into counts while they arrive. Memory use is bounded by the number of
+    distinct outcomes rather than the number of shots.
+
+    Returns the response without "data" and the Qiskit-style counts dictionary of its shots.
+    Raises ValueError if the response is truncated or malformed.
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")()
+    head = []          # JSON text before the "data" array
+    tail = []          # JSON text after the "data" array
+    buffer = ""        # unparsed text
+    phase = "head"     # "head", "data" or "tail"
+    depth, in_string, escaped, token, last_key = 0, False, False, None, None
+    shots = Counter()
+
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        buffer += decoder.decode(chunk)
+        while buffer:
+            if phase == "head":
+                # Scan for the top-level "data" key, tracking nesting and strings
+                for idx, char in enumerate(buffer):
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif char == "\\":
+                            escaped = True
+                        elif char == '"':
+                            in_string = False
+                            last_key = "".join(token) if depth == 1 else None
+                            token = None
+                        elif token is not None:
+                            token.append(char)
+                    elif char == '"':
+                        in_string, token = True, []
+                    elif char in "{[":
+                        if char == "[" and depth == 1 and last_key == "data":
+                            head.append(buffer[:idx])
+                            buffer, phase = buffer[idx + 1:], "data"
+                            break
+                        depth += 1
+                    elif char in "}]":
+                        depth -= 1
+                    elif char not in " \t\r\n:":
+                        last_key = None
+                else:
+                    head.append(buffer)
+                    buffer = ""
+            elif phase == "data":
+                # Count complete shots, keeping an incomplete one for the next chunk
+                position = 0
+                match = _SHOT_PATTERN.match(buffer, position)
+                while match:
+                    shots[match.group(1)] += 1
+                    position = match.end()
+                    match = _SHOT_PATTERN.match(buffer, position)
+                rest = buffer[position:].lstrip(" \t\r\n,")
+                if rest.startswith("]"):
+                    buffer, phase = rest[1:], "tail"
+                else:
+                    buffer = rest
+                    break
+            else:
+                tail.append(buffer)
+                buffer = ""
+
+    if phase == "data":
+        raise ValueError(f"Truncated or malformed \"data\" array in streamed response: {buffer[:100]!r}")
+    fields = json.loads("".join(head) + ("null" if phase != "head" else "") + "".join(tail))
+    fields.pop("data", None)
+    counts = Counter()
+    for shot, count in shots.items():
+        counts["".join(shot.split()).replace(",", "")] += count
+    return fields, dict(counts)
+
 
 class MyResult:
     def __init__(self, response: dict):
-        self.response = response
+        # Decode the per-shot data once into a packed bit matrix (one row per shot) and keep the
+        # remaining fields of the response as they are
+        self.response = {key: value for key, value in response.items() if key != "data"}
+        bits = np.asarray(response.get("data", []), dtype=np.uint8)
+        if bits.ndim != 2:
+            bits = bits.reshape(len(bits), 0)
+        self.shots, self.num_bits = bits.shape
+        self._packed = np.packbits(bits, axis=1)
+        self._counts = None
+
+    @classmethod
+    def from_counts(cls, response: dict, counts: dict):
+        """Create a result from aggregated counts, e.g. of a streamed response. Per-shot memory is not available."""
+        result = cls.__new__(cls)
+        result.response = {key: value for key, value in response.items() if key != "data"}
+        result.shots = sum(counts.values())
+        result.num_bits = len(next(iter(counts), ""))
+        result._packed = None
+        result._counts = dict(counts)
+        return result
+
+    def _to_bitstrings(self, packed) -> List[str]:
+        """Convert packed rows of bits into bitstrings."""
+        if self.num_bits == 0:
+            return [""] * len(packed)
+        bits = np.unpackbits(packed, axis=1, count=self.num_bits)
+        chars = np.ascontiguousarray(bits + ord("0"), dtype=np.uint8)
+        return [bitstring.decode() for bitstring in chars.view(f"S{self.num_bits}").ravel()]
 
     def get_counts(self) -> dict:
         """Convert bitstring array into Qiskit-style counts dictionary."""
-        f = lambda x: "".join(map(str, x))
-        bitstrings = list(map(f, self.response.get("data", [])))
-        return dict(Counter(bitstrings))
+        if self._counts is None:
+            if self.num_bits == 0:
+                self._counts = {"": self.shots} if self.shots else {}
+            elif self.num_bits <= 64:
+                # Count big-endian integer representations of the shots
+                num_bytes = self._packed.shape[1]
+                padded = np.zeros((self.shots, 8), dtype=np.uint8)
+                padded[:, :num_bytes] = self._packed
+                values, counts = np.unique(padded.view(">u8").ravel(), return_counts=True)
+                unique = values.astype(">u8").view(np.uint8).reshape(-1, 8)[:, :num_bytes]
+                self._counts = dict(zip(self._to_bitstrings(unique), counts.tolist()))
+            else:
+                unique, counts = np.unique(self._packed, axis=0, return_counts=True)
+                self._counts = dict(zip(self._to_bitstrings(unique), counts.tolist()))
+        return dict(self._counts)
+
+    def get_memory(self) -> List[str]:
+        """Bitstring of every shot, in the order returned by the QPU."""
+        if self._packed is None:
+            raise RuntimeError("Per-shot memory is not available for results aggregated while streaming.")
+        return self._to_bitstrings(self._packed)
+
+    def get_probabilities(self) -> dict:
+        """Convert bitstring array into a dictionary of bitstring probabilities."""
+        return {bitstring: count / self.shots for bitstring, count in self.get_counts().items()}
 
     def __getitem__(self, key):
+        if key == "data":
+            if self._packed is None:
+                raise KeyError("Per-shot data is not available for results aggregated while streaming.")
+            return np.unpackbits(self._packed, axis=1, count=self.num_bits).tolist()
         return self.response[key]
 
     def __repr__(self):
         return f"MyResult({self.get_counts()})"
 
 
+class ResultCache:
+    """
+    A persistent, content-addressed cache of QPU results stored in a SQLite database.
+
+    Results are keyed by a hash of the normalised OpenQASM2 circuit, the number of shots and the
+    QPU URL. Once the stored results exceed max_size_bytes, the least recently used are evicted.
+    Use ":memory:" as path for a cache that is not persisted.
+    """
+
+    def __init__(self, path: str = "qpu_result_cache.sqlite", max_size_bytes: int = 256 * 2**20):
+        self.path = path
+        self.max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def normalise_qasm(circuit) -> str:
+        """Remove comments, blank lines and redundant whitespace from a QASM string or list of lines."""
+        if isinstance(circuit, str):
+            circuit = circuit.splitlines()
+        lines = (" ".join(line.split("//", 1)[0].split()) for line in circuit)
+        return "\n".join(line for line in lines if line)
+
+    def key(self, circuit, shots: int, qpu_url: str) -> str:
+        """Hexadecimal SHA-256 key of a circuit executed with the given shots on the given QPU."""
+        content = json.dumps({"qasm": self.normalise_qasm(circuit), "shots": shots, "qpu_url": qpu_url},
+                             sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[MyResult]:
+        """Return the cached result for key, or None if it is not cached."""
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key))
+        with np.load(io.BytesIO(row[0]), allow_pickle=False) as data:
+            fields = json.loads(str(data["fields"]))
+            if "counts" in fields:
+                return MyResult.from_counts(fields["response"], fields["counts"])
+            result = MyResult.from_counts(fields["response"], {})
+            result.shots, result.num_bits = data["packed"].shape[0], fields["num_bits"]
+            result._packed = data["packed"]
+            result._counts = None
+            return result
+
+    def put(self, key: str, result: MyResult):
+        """Store a result, evicting the least recently used results if the cache grows too large."""
+        fields = {"response": result.response, "num_bits": result.num_bits}
+        packed = result._packed
+        if packed is None:
+            # Streamed results hold counts only
+            fields["counts"] = result._counts
+            packed = np.zeros((0, 0), dtype=np.uint8)
+        buffer = io.BytesIO()
+        np.savez(buffer, fields=np.array(json.dumps(fields)), packed=packed)
+        value = buffer.getvalue()
+        if len(value) > self.max_size_bytes:
+            return
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results (key, value, size, last_access) VALUES (?, ?, ?, ?)",
+                (key, value, len(value), time.time())
+            )
+            total = 0
+            evicted = []
+            for stored_key, size in self._connection.execute(
+                    "SELECT key, size FROM results ORDER BY last_access DESC"):
+                total += size
+                if total > self.max_size_bytes:
+                    evicted.append((stored_key,))
+            self._connection.executemany("DELETE FROM results WHERE key = ?", evicted)
+
+    def clear(self):
+        """Remove all cached results."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM results")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
 class MyJob:
-    def __init__(self, circuit, shots, qpu_url, send_fn, poll_fn, polling_time=10, max_requests=100000):
+    def __init__(self, circuit, shots, qpu_url, send_fn, poll_fn, polling_time=None, max_requests=100000,
+                 polling_policy=None, stream=False, result_cache=None):
         self.circuit = circuit
         self.shots = shots
         self.qpu_url = qpu_url
         self.send_experiment = send_fn
         self.get_experiment_status = poll_fn
-        self.polling_time = polling_time
+        if polling_policy is None:
+            polling_policy = PollingPolicy() if polling_time is None else PollingPolicy.constant(polling_time)
+        self.polling_policy = polling_policy
         self.max_requests = max_requests
+        self.stream = stream
         self._job_id = str(uuid.uuid4())
-        self._result_cache = None
+        self._experiment_id = None
+        self._last_response = None
+        # Decoded result of the job, once it completed or was found in the result cache
+        self._result = None
+        # Persistent ResultCache shared between jobs, if any
+        self.result_cache = result_cache
+        self._cache_key = None
+        if result_cache is not None:
+            self._cache_key = result_cache.key(circuit, shots, qpu_url)
+            self._result = result_cache.get(self._cache_key)
 
     def job_id(self):
         return self._job_id
 
     def status(self):
-        return "COMPLETED" if self._result_cache else "RUNNING"
+        return "COMPLETED" if self._result is not None else "RUNNING"
 
     def get_counts(self):
         """Shortcut: job.get_counts() instead of job.result().get_counts()."""
         return self.result().get_counts()
 
-    def result(self):
-        if self._result_cache:
-            return MyResult(self._result_cache)  # wrap in MyResult
-
-        print(f"Submitting experiment to: {self.qpu_url}")
-        send_response = self.send_experiment(self.circuit, self.shots, self.qpu_url)
-        if send_response.status_code != 200:
-            raise RuntimeError("Failed to send experiment: " + str(send_response.json()))
+    def submit(self):
+        """Send the experiment to the QPU (once) and return its experiment ID."""
+        if self._experiment_id is None:
+            print(f"Submitting experiment to: {self.qpu_url}")
+            send_response = self.send_experiment(self.circuit, self.shots, self.qpu_url)
+            if send_response.status_code != 200:
+                raise RuntimeError("Failed to send experiment: " + str(send_response.json()))
+
+            self._experiment_id = send_response.json().get("id")
+            print(f"Experiment submitted. ID: {self._experiment_id}")
+        return self._experiment_id
+
+    def poll(self):
+        """Request the experiment status once. Return the result if execution completed, otherwise None."""
+        if self._result is not None:
+            return self._result
+
+        if self.stream:
+            response = self.get_experiment_status(self.submit(), self.qpu_url, stream=True)
+        else:
+            response = self.get_experiment_status(self.submit(), self.qpu_url)
+        return self._handle_status(response)
+
+    def _handle_status(self, response):
+        """Process a status response of the experiment. Return the result if execution completed, otherwise None."""
+        self._last_response = response
+        if response.status_code == 200:
+            # decode once
+            if self.stream:
+                with response:
+                    self._result = MyResult.from_counts(*_stream_counts(response))
+            else:
+                self._result = MyResult(response.json())
+            if self.result_cache is not None:
+                self.result_cache.put(self._cache_key, self._result)
+            return self._result
+        elif response.status_code == 425:
+            return None
+        else:
+            raise RuntimeError("Unexpected error from QPU: " + str(response.json()))
 
-        experiment_id = send_response.json().get("id")
-        print(f"Experiment submitted. ID: {experiment_id}")
+    def result(self):
+        if self._result is not None:
+            return self._result
 
+        self.submit()
         for request_idx in range(1, self.max_requests + 1):
-            response = self.get_experiment_status(experiment_id, self.qpu_url)
-
-            if response.status_code == 200:
+            result = self.poll()
+            if result is not None:
                 print(f"Execution completed at request #{request_idx}")
-                self._result_cache = response.json()
-                return MyResult(self._result_cache)  # wrap here
-            elif response.status_code == 425:
-                print(f"Polling too early (#{request_idx}), waiting {self.polling_time}s...")
-                time.sleep(self.polling_time)
-            else:
-                raise RuntimeError("Unexpected error from QPU: " + str(response.json()))
+                return result
+            delay = self.polling_policy.delay(request_idx, self._last_response)
+            print(f"Polling too early (#{request_idx}), waiting {delay:.2f}s...")
+            time.sleep(delay)
 
         raise TimeoutError("Polling timeout exceeded")
 
@@ -76,7 +407,9 @@ class QuantumBackend:
     A class that wraps QB backend following Qiskit AerSimulator() structure.
     """
 
-    def __init__(self, qpu_url: str, basis_gates=None, verify_ssl=False):
+    def __init__(self, qpu_url: str, basis_gates=None, verify_ssl=False,
+                 pool_size: int = 10, timeout: float = 30, retries: int = 3, backoff_factor: float = 0.5,
+                 batch_endpoint: Optional[str] = None, result_cache: Optional[ResultCache] = None):
         
         if not qpu_url:
             raise ValueError("A valid qpu_url must be provided. Example: 'http://localhost:8888'")
@@ -84,6 +417,13 @@ class QuantumBackend:
         self.qpu_url = qpu_url
         self.verify_ssl = verify_ssl
         self.basis_gates = basis_gates or ['rx', 'ry', 'cz']
+        self.timeout = timeout
+        self.session = self._create_session(pool_size, retries, backoff_factor)
+        # Path of a QPU endpoint accepting many experiments in one request, if any
+        self.batch_endpoint = batch_endpoint
+        self._batch_supported = None
+        # Circuits found in the result cache are not sent to the QPU again
+        self.result_cache = result_cache
         
         # Check server status
         if not self._is_server_active():
@@ -93,10 +433,30 @@ class QuantumBackend:
         if not self.verify_ssl:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+    @staticmethod
+    def _create_session(pool_size: int, retries: int, backoff_factor: float) -> requests.Session:
+        """
+        Create an HTTP session that keeps up to pool_size connections to the QPU alive and retries
+        transient errors with exponential backoff. Status requests are retried on gateway errors,
+        while experiments are only resent if the connection could not be established.
+        """
+        retry = Retry(total=retries, backoff_factor=backoff_factor,
+                      status_forcelist=(502, 503, 504), allowed_methods=frozenset({"GET"}),
+                      raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def close(self):
+        """Close all pooled connections to the QPU server."""
+        self.session.close()
+
     def _is_server_active(self) -> bool:
         """Check if the QPU server is active and reachable."""
         try:
-            response = requests.get(self.qpu_url, timeout=3, verify=self.verify_ssl)
+            response = self.session.get(self.qpu_url, timeout=3, verify=self.verify_ssl)
             if response.status_code == 200:
                 return True
             else:
@@ -130,23 +490,82 @@ class QuantumBackend:
         circuit_qasm = dumps(circuit_transpiled)
         return circuit_qasm
 
-    # Check if circuit execution is finished and return response
-    def get_experiment_status(self, id:int, qpu_url:str):
+    # Check if circuit execution is finished and return response. With stream, the response body
+    # is only downloaded once it is consumed (e.g. by iter_content).
+    def get_experiment_status(self, id:int, qpu_url:str, stream:bool = False):
         url = qpu_url+"/api/v2/circuits/"+str(id)
         headers = {'accept': 'application/json'}
-        response = requests.get(url, headers=headers, verify=self.verify_ssl)
+        response = self.session.get(url, headers=headers, verify=self.verify_ssl, timeout=self.timeout,
+                                    stream=stream)
+        if stream and response.status_code != 200:
+            response.content  # read small status bodies so the connection returns to the pool
         return response
 
     # Given circuit (string) array and shot count, send an experiment to qcstack API and return response
     def send_experiment(self, circuit, shots, qpu_url:str):
         headers = {'Content-Type': 'application/json'}
         json_data = {'circuit': circuit,'shots': shots}
-        response = requests.post(qpu_url+"/api/v2/circuits/openqasm2", headers=headers, json=json_data, verify=self.verify_ssl)
+        response = self.session.post(qpu_url+"/api/v2/circuits/openqasm2", headers=headers, json=json_data,
+                                     verify=self.verify_ssl, timeout=self.timeout)
         return response
 
+    def send_experiments(self, circuits, shots, qpu_url: str, max_workers: int = 8) -> list:
+        """
+        Send many experiments (circuit string arrays) with the same shot count at once.
+
+        If batch_endpoint is set, all experiments are packed into a single request of the form
+        {"circuits": [{"circuit": ..., "shots": ...}, ...]}, answered by {"ids": [...]}. If the QPU
+        does not support batches, or no batch_endpoint is set, experiments are sent individually
+        over up to max_workers concurrent requests.
+
+        Returns the experiment ID of each circuit, or the exception raised while sending it.
+        """
+        if self.batch_endpoint and self._batch_supported is not False:
+            headers = {'Content-Type': 'application/json'}
+            json_data = {'circuits': [{'circuit': circuit, 'shots': shots} for circuit in circuits]}
+            response = self.session.post(qpu_url+self.batch_endpoint, headers=headers, json=json_data,
+                                         verify=self.verify_ssl, timeout=self.timeout)
+            if response.status_code == 200:
+                self._batch_supported = True
+                return list(response.json()["ids"])
+            elif response.status_code in (404, 405, 501):
+                print(f"QPU does not support batch submission at {self.batch_endpoint}, sending individually.")
+                self._batch_supported = False
+            else:
+                error = RuntimeError("Failed to send experiments: " + response.text)
+                return [error] * len(circuits)
+
+        def send(circuit):
+            try:
+                response = self.send_experiment(circuit, shots, qpu_url)
+                if response.status_code != 200:
+                    return RuntimeError("Failed to send experiment: " + response.text)
+                return response.json().get("id")
+            except Exception as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(send, circuits))
+
+    def get_experiments_status(self, ids, qpu_url: str, max_workers: int = 8, stream: bool = False) -> list:
+        """
+        Check the status of many experiments over up to max_workers concurrent requests.
+
+        Returns the response for each experiment ID, or the exception raised while requesting it.
+        """
+        def get(id):
+            try:
+                return self.get_experiment_status(id, qpu_url, stream=stream)
+            except Exception as exc:
+                return exc
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(get, ids))
+
 
     def run(self, circuit, shots: int,
-            polling_time: int = 10, max_requests: int = 100000) -> Optional[dict]:
+            polling_time: Optional[float] = None, max_requests: int = 100000,
+            polling_policy=None, stream: bool = False) -> Optional[dict]:
         
         # Set QPU server url
         qpu_url = self.qpu_url
@@ -170,6 +589,101 @@ class QuantumBackend:
             send_fn=self.send_experiment,
             poll_fn=self.get_experiment_status,
             polling_time=polling_time,
-            max_requests=max_requests
+            max_requests=max_requests,
+            polling_policy=polling_policy,
+            stream=stream,
+            result_cache=self.result_cache
         )
 
+    def run_batch(self, circuits, shots: int, polling_time: Optional[float] = None,
+                  max_requests: int = 100000, max_workers: int = 8, polling_policy=None,
+                  stream: bool = False, max_status_errors: int = 3) -> List[Future]:
+        """
+        Submit a batch of circuits up front and poll them concurrently in the background.
+
+        Returns one concurrent.futures.Future per circuit (in input order), each resolving to the
+        MyResult of its circuit. Use concurrent.futures.as_completed() to process results as soon
+        as they complete. As in qbqpu.run_experiments, a failed status request of an experiment is
+        retried, and its future fails after max_status_errors consecutive failures.
+        """
+        jobs = [self.run(circuit, shots, polling_time=polling_time, max_requests=max_requests,
+                         polling_policy=polling_policy, stream=stream)
+                for circuit in circuits]
+
+        futures = []
+        for job in jobs:
+            future = Future()
+            future.set_running_or_notify_cancel()
+            if job._result is not None:
+                # Found in the result cache
+                future.set_result(job._result)
+            futures.append(future)
+
+        submitted = [(job, future) for job, future in zip(jobs, futures) if not future.done()]
+        if not submitted:
+            return futures
+        print(f"Submitting {len(submitted)} experiments to: {self.qpu_url}")
+        experiment_ids = self.send_experiments([job.circuit for job, _ in submitted], shots, self.qpu_url,
+                                               max_workers)
+        if len(experiment_ids) != len(submitted):
+            raise RuntimeError(f"Expected {len(submitted)} experiment IDs from the QPU, received {len(experiment_ids)}")
+        for (job, future), experiment_id in zip(submitted, experiment_ids):
+            if isinstance(experiment_id, Exception):
+                future.set_exception(experiment_id)
+            else:
+                job._experiment_id = experiment_id
+
+        poller = threading.Thread(target=self._poll_batch,
+                                  args=(jobs, futures, max_requests, max_workers, stream, max_status_errors),
+                                  daemon=True)
+        poller.start()
+        return futures
+
+    def _poll_batch(self, jobs, futures, max_requests, max_workers, stream, max_status_errors):
+        # Runs in a daemon thread: any unexpected error is set on the unfinished futures instead of
+        # ending the thread silently and leaving them pending forever
+        try:
+            self._poll_pending(jobs, futures, max_requests, max_workers, stream, max_status_errors)
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+
+    def _poll_pending(self, jobs, futures, max_requests, max_workers, stream, max_status_errors):
+        # Poll all unfinished jobs concurrently, resolving futures as their jobs complete
+        pending = [(job, future) for job, future in zip(jobs, futures) if not future.done()]
+        status_errors = Counter()
+        for request_idx in range(1, max_requests + 1):
+            responses = self.get_experiments_status([job._experiment_id for job, _ in pending],
+                                                    self.qpu_url, max_workers, stream)
+            still_pending = []
+            for (job, future), response in zip(pending, responses):
+                if isinstance(response, requests.exceptions.RequestException):
+                    # Status request failed: retry until max_status_errors consecutive failures
+                    status_errors[job] += 1
+                    if status_errors[job] >= max_status_errors:
+                        future.set_exception(response)
+                    else:
+                        still_pending.append((job, future))
+                    continue
+                status_errors[job] = 0
+                try:
+                    if isinstance(response, Exception):
+                        raise response
+                    result = job._handle_status(response)
+                except Exception as exc:
+                    future.set_exception(exc)
+                    continue
+                if result is None:
+                    still_pending.append((job, future))
+                else:
+                    future.set_result(result)
+            pending = still_pending
+            if not pending:
+                return
+            # Wait until the earliest job is due to be polled again
+            time.sleep(min(job.polling_policy.delay(request_idx, job._last_response)
+                           for job, _ in pending))
+
+        for _, future in pending:
+            future.set_exception(TimeoutError("Polling timeout exceeded"))